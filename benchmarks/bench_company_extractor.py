@@ -0,0 +1,96 @@
+"""
+Micro-benchmark for company name extraction over saved job descriptions.
+
+Compares the old approach (five uncompiled regexes run one after another) with CompanyNameExtractor.
+Each saved description is also blown up into a "large" variant (the body repeated with the company
+sentence only at the very end, like long postings with pages of benefits/legal text), plus one
+adversarial input made of capitalized words that never completes a pattern.
+
+Usage:
+    python benchmarks/bench_company_extractor.py [--repeat 20] [--adversarial-phrases 300] [--json]
+"""
+import argparse
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "jobber"))
+
+from company_extractor import CompanyNameExtractor  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "descriptions"
+
+# The patterns JobPostScraper used before CompanyNameExtractor, kept here as the baseline
+LEGACY_PATTERNS = [
+    r"At\s+([A-Z][\w\s&\-]+?)(?:,|\s|$)",
+    r"Join the team at ([A-Z][\w&\-\s]+?)\b",
+    r"([A-Z][\w&\-\s]+?) is a (?:leading|fast-growing|well-known|top-tier|global|premier|renowned|innovative|dynamic|reputable|established|trusted)",
+    r"([A-Z][\w&\-\s]+?) is an equal opportunity employer",
+    r"([A-Z][\w&\-\s]+?) is looking for",
+]
+
+
+def legacy_extract(text: str) -> str:
+    for pattern in LEGACY_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            return match.group(1).strip()
+    return "n-a"
+
+
+def load_corpus(size_multiplier: int, adversarial_phrases: int) -> dict:
+    corpus = {}
+    for path in sorted(FIXTURES_DIR.glob("*.txt")):
+        text = path.read_text(encoding="utf-8").strip()
+        corpus[path.stem] = text
+        # Move the sentences naming the company to the end of a much longer body
+        sentences = text.split(". ")
+        body = ". ".join(s for s in sentences if " is a" not in s and " is an" not in s and "At " not in s and "Join the team" not in s)
+        tail = ". ".join(s for s in sentences if s not in body)
+        corpus[f"{path.stem}_large"] = (body + ". ") * size_multiplier + tail
+    # The legacy lazy groups go super-linear on this one, so it has its own (small) size knob
+    corpus["adversarial_capitalized_words"] = " ".join(["Senior Staff Platform Engineer"] * adversarial_phrases)
+    return corpus
+
+
+def bench(func, text: str, number: int, repeat: int = 3) -> float:
+    """:return: best per-call time in microseconds"""
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="How many times the body is repeated in the large variants")
+    parser.add_argument("--number", type=int, default=5, help="Calls per timing run")
+    parser.add_argument("--adversarial-phrases", type=int, default=300, help="Size of the adversarial input in 4-word phrases")
+    parser.add_argument("--json", action="store_true", help="Print machine readable results")
+    args = parser.parse_args()
+
+    extractor = CompanyNameExtractor()
+    results = []
+    for name, text in load_corpus(args.repeat, args.adversarial_phrases).items():
+        slow = name.startswith("adversarial")
+        results.append({
+            "description": name,
+            "chars": len(text),
+            "legacy_us": round(bench(legacy_extract, text, 1 if slow else args.number, 1 if slow else 3), 1),
+            "compiled_us": round(bench(extractor.extract, text, args.number), 1),
+            "legacy_result": legacy_extract(text),
+            "compiled_result": extractor.extract(text),
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'description':<42}{'chars':>9}{'legacy us':>13}{'compiled us':>13}{'speedup':>9}  result (legacy -> compiled)")
+    for r in results:
+        speedup = r["legacy_us"] / r["compiled_us"] if r["compiled_us"] else float("inf")
+        print(f"{r['description']:<42}{r['chars']:>9}{r['legacy_us']:>13}{r['compiled_us']:>13}{speedup:>8.1f}x  "
+              f"{r['legacy_result']!r} -> {r['compiled_result']!r}")
+
+
+if __name__ == "__main__":
+    main()
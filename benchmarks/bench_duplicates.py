@@ -0,0 +1,110 @@
+"""
+Lookup latency of the near-duplicate posting index (posting_similarity.PostingSimilarityIndex) as it grows.
+
+Synthetic job descriptions (random sentences over a job posting vocabulary, ~400 words each) are indexed into a
+temporary SQLite file, then the index is queried with reposts of indexed descriptions (boilerplate swapped, a few
+words edited) and with unseen descriptions. Reports p50/p95/max of the MinHash signature, of find() alone, and how
+many reposts were found / unseen descriptions wrongly matched.
+
+Usage:
+    python benchmarks/bench_duplicates.py [--postings 20000] [--queries 500] [--output results.json]
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "jobber"))
+
+from posting_similarity import PostingSimilarityIndex  # noqa: E402
+
+VOCABULARY = (
+    "we are looking for a senior backend frontend full stack software engineer data scientist platform team "
+    "python java go rust typescript react kubernetes aws gcp azure docker terraform sql postgres kafka spark "
+    "design build scale maintain services apis pipelines systems customers product users reliability performance "
+    "you will own ship mentor collaborate with cross functional partners experience years degree computer science "
+    "benefits equity salary remote hybrid office health dental vision parental leave learning budget inclusive"
+).split()
+BOILERPLATE = [
+    "We are an equal opportunity employer and value diversity at our company.",
+    "Apply now through our careers page, we review every application.",
+    "Posted via LinkedIn Jobs. Easy apply available.",
+    "This role is eligible for our referral program.",
+]
+
+
+def make_description(rng: random.Random, words: int = 400) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def repost(rng: random.Random, description: str, edits: int = 5) -> str:
+    """:return: the same posting with other boilerplate appended and a few words replaced"""
+    words = description.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    return " ".join(words) + " " + rng.choice(BOILERPLATE)
+
+
+def percentiles_ms(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95)] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=20000, help="Postings indexed before querying")
+    parser.add_argument("--queries", type=int, default=500, help="Reposts and unseen descriptions looked up (each)")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix="jobber-dedup-") as tmp:
+        index = PostingSimilarityIndex(Path(tmp) / "posting_similarity.sqlite3", threshold=args.threshold)
+        descriptions = []
+        start = time.perf_counter()
+        for i in range(args.postings):
+            descriptions.append(make_description(rng))
+            index.add(index.signature(descriptions[-1]), "inputs", f"dir-{i}", url=f"https://example.com/job/{i}")
+        index_seconds = time.perf_counter() - start
+
+        signature_times, find_times, found, false_matches = [], [], 0, 0
+        queries = [(repost(rng, descriptions[rng.randrange(len(descriptions))]), True) for _ in range(args.queries)]
+        queries += [(make_description(rng), False) for _ in range(args.queries)]
+        for text, is_repost in queries:
+            start = time.perf_counter()
+            signature = index.signature(text)
+            signature_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            match = index.find(signature, "inputs")
+            find_times.append(time.perf_counter() - start)
+            if is_repost:
+                found += match is not None
+            else:
+                false_matches += match is not None
+
+    text = json.dumps({
+        "postings": args.postings,
+        "threshold": args.threshold,
+        "index_postings_per_s": round(args.postings / index_seconds, 1),
+        "signature": percentiles_ms(signature_times),
+        "find": percentiles_ms(find_times),
+        "reposts_found": f"{found}/{args.queries}",
+        "unseen_matched": f"{false_matches}/{args.queries}",
+    }, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Offline end-to-end benchmark of the tailoring pipeline (scrape -> LLM -> render -> PDF).
+
+Everything runs locally: the saved postings in fixtures/postings (one per domain in job_app_selectors.json)
+are served by posting_server.PostingServer, Gemini is replaced by fake_gemini.FakeGemini with a configurable
+latency, and caches/outputs go to a temporary directory. Scenarios:
+
+    single      one url at a time through ResumeTailor.generate_tailored_resume_async, cold caches
+    batch       --batch-size urls through BatchRunner, cold caches
+    cache-hot   the same batch again, served from the posting and LLM response caches
+    duplicates  reposts of the batch under new urls: scraped again, then matched in the posting similarity index
+                and the earlier results reused (the other scenarios only index postings, they never reuse them)
+
+Results (throughput, latency percentiles, per-span p50/p95/max from the tracer and peak RSS) are printed as JSON.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--scenarios single,batch,cache-hot] [--batch-size 100] [--llm-latency 0.5]
+                                        [--no-stream] [--prerank-bullets 20] [--no-browser] [--output results.json]
+
+--no-browser skips the domains that need javascript and replaces the PDF step with a placeholder,
+for machines without chromium installed (the PDF numbers are then meaningless).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "jobber"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from application_history import ApplicationHistory  # noqa: E402
+from batch_runner import BatchRunner  # noqa: E402
+from browser_pool import BrowserPool  # noqa: E402
+from file_handler import FileHandler  # noqa: E402
+from llm_cache import LLMResponseCache  # noqa: E402
+from llm_client import LLMClient  # noqa: E402
+from posting_cache import PostingCache  # noqa: E402
+from posting_similarity import PostingSimilarityIndex  # noqa: E402
+from resume_tailor import ResumeTailor  # noqa: E402
+from selector_registry import SelectorRegistry  # noqa: E402
+from static_fetcher import StaticPostingFetcher  # noqa: E402
+from tracing import Tracer, _percentile  # noqa: E402
+from fake_gemini import FakeGemini  # noqa: E402
+from posting_server import PostingServer, fixture_domains, posting_url  # noqa: E402
+
+SCENARIOS = ("single", "batch", "cache-hot", "duplicates")
+PLACEHOLDER_PDF = b"%PDF-1.4\n% placeholder written by bench_pipeline.py --no-browser\n"
+
+
+class PlaceholderPdfRenderer:
+    """Used with --no-browser: skips chromium and returns a fixed pdf"""
+    async def render_async(self, html) -> bytes:
+        return PLACEHOLDER_PDF
+
+
+def peak_rss_mb() -> float | None:
+    """:return: peak resident memory of this python process in MB (chromium is not included), None if unknown"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentiles_ms(seconds: list[float]) -> dict:
+    if not seconds:
+        return {"p50": None, "p95": None, "max": None}
+    ordered = sorted(seconds)
+    return {"p50": round(_percentile(ordered, 50) * 1000, 1), "p95": round(_percentile(ordered, 95) * 1000, 1), "max": round(ordered[-1] * 1000, 1)}
+
+
+async def build_tailor(args, server: PostingServer, workdir: Path, fake_llm: FakeGemini) -> ResumeTailor:
+    """Sets up a ResumeTailor exactly like the CLI does, then points its network, LLM, caches and outputs at local stand-ins"""
+    f_handler = FileHandler()
+    resume = await f_handler.load_resume_data_async(args.resume)
+    template = await f_handler.load_resume_template_async("default_resume_template.html")
+    tailor = await ResumeTailor.set_scraper(resume, template)
+
+    tailor.f_handler = FileHandler(base_dir=workdir)
+    tailor.write_html = not args.no_html
+    tailor.llm_cache = LLMResponseCache(workdir / "llm_responses.sqlite3", max_entries=args.batch_size * 2)
+    tailor.context_cache = None  # server side context caching is Gemini specific, the fake has nothing to cache
+    tailor.llm_client = LLMClient({
+        "max_concurrency": args.llm_workers,
+        "requests_per_minute": 1_000_000,
+        "tokens_per_minute": 1_000_000_000,
+        "max_retries": 1,
+        "stream": not args.no_stream,
+        "prerank_bullets": args.prerank_bullets,
+    })
+    tailor.llm_client._client = fake_llm
+    tailor.history = ApplicationHistory(workdir / "applications.sqlite3")
+    tailor.similar_postings = PostingSimilarityIndex(workdir / "posting_similarity.sqlite3")
+    tailor.scraper.posting_cache = PostingCache(workdir / "postings.sqlite3")
+    tailor.scraper.static_fetcher = StaticPostingFetcher(proxy=server.proxy_url)
+    if args.no_browser:
+        tailor.pdf_renderer = PlaceholderPdfRenderer()
+    return tailor
+
+
+async def make_urls(count: int, first_id: int, no_browser: bool) -> list[str]:
+    """:return: count urls cycling through every fixture domain"""
+    registry = await SelectorRegistry.shared_async()
+    domains = fixture_domains()
+    if no_browser:
+        domains = [d for d in domains if not registry.get(registry.resolve(posting_url(d, 0))).get("needs_js")]
+    return [posting_url(domains[i % len(domains)], first_id + i) for i in range(count)]
+
+
+async def run_scenario(name: str, tailor: ResumeTailor, urls: list[str], args, server: PostingServer, fake_llm: FakeGemini) -> dict:
+    tracer = Tracer.shared()
+    tracer.reset()
+    requests_before, llm_calls_before, prompt_tokens_before = server.requests, fake_llm.calls, fake_llm.prompt_tokens
+    latencies, succeeded = [], 0
+    tailor.reuse_duplicates = name == "duplicates"  # the fixtures repeat one description per domain
+    start = time.perf_counter()
+    if name == "single":
+        for url in urls:
+            job_start = time.perf_counter()
+            succeeded += bool(await tailor.clone().generate_tailored_resume_async(url))
+            latencies.append(time.perf_counter() - job_start)
+    else:
+        runner = BatchRunner(tailor, args.scrape_workers, args.llm_workers, args.render_workers)
+        async for result in runner.run(urls):
+            succeeded += result.success
+            latencies.append(result.elapsed)
+    elapsed = time.perf_counter() - start
+    return {
+        "jobs": len(urls),
+        "succeeded": succeeded,
+        "elapsed_s": round(elapsed, 3),
+        "jobs_per_minute": round(len(urls) / elapsed * 60, 1) if elapsed else None,
+        "latency_ms": percentiles_ms(latencies),
+        "spans": tracer.summary(),
+        "postings_served": server.requests - requests_before,
+        "llm_calls": fake_llm.calls - llm_calls_before,
+        "llm_prompt_tokens": fake_llm.prompt_tokens - prompt_tokens_before,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def run(args) -> dict:
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))} (choose from {', '.join(SCENARIOS)})")
+
+    fake_llm = FakeGemini(latency=args.llm_latency, jitter=args.llm_jitter, seed=args.seed)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="jobber-bench-") as tmp, PostingServer() as server:
+        BrowserPool.shared_launch_options = {"proxy": {"server": server.proxy_url}}
+        tailor = await build_tailor(args, server, Path(tmp), fake_llm)
+        batch_urls = await make_urls(args.batch_size, first_id=100_000, no_browser=args.no_browser)
+        try:
+            for name in scenarios:
+                if name == "single":
+                    urls = await make_urls(args.single_runs, first_id=0, no_browser=args.no_browser)
+                elif name == "batch":
+                    urls = batch_urls
+                else:
+                    if "batch" not in results and "cache-hot" not in results:
+                        await run_scenario("batch", tailor, batch_urls, args, server, fake_llm)  # warm the caches first
+                    urls = batch_urls if name == "cache-hot" else await make_urls(args.batch_size, first_id=200_000, no_browser=args.no_browser)
+                results[name] = await run_scenario(name, tailor, urls, args, server, fake_llm)
+                logging.getLogger(__name__).warning(f"{name}: {results[name]['jobs_per_minute']} jobs/min")
+        finally:
+            await tailor.scraper.static_fetcher.close()
+            await BrowserPool.close_all()
+    return {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "scenarios": results,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma separated scenarios to run")
+    parser.add_argument("--single-runs", type=int, default=5, help="Urls tailored one at a time in the single scenario")
+    parser.add_argument("--batch-size", type=int, default=100, help="Urls in the batch and cache-hot scenarios")
+    parser.add_argument("--scrape-workers", type=int, default=4)
+    parser.add_argument("--llm-workers", type=int, default=2)
+    parser.add_argument("--render-workers", type=int, default=2)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds the fake Gemini takes per call")
+    parser.add_argument("--llm-jitter", type=float, default=0.1, help="+/- seconds of noise on the fake latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--resume", default="jackie_ling_data.json", help="Resume data file in resources/inputs/resume_data")
+    parser.add_argument("--no-html", action="store_true", help="Skip writing resume_wip.html")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for whole LLM responses instead of streaming them")
+    parser.add_argument("--prerank-bullets", type=int, default=20,
+                        help="Bullets pre-ranked locally and sent to the LLM, 0 sends all of them. Defaults to 20 since the fake has no "
+                             "context cache to lose (llm_config.json defaults to 0)")
+    parser.add_argument("--no-browser", action="store_true", help="Skip javascript-only domains and the real PDF step")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = asyncio.run(run(args))
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
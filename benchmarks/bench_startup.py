@@ -0,0 +1,137 @@
+"""
+Cold-start budget for the Jobber entry points, measured with `python -X importtime` in fresh interpreters.
+
+Every entry point is imported --runs times in a new process. The median cumulative import time of its module
+(from -X importtime) is compared against a budget, and the heavy dependencies (google-genai, Playwright, bs4...)
+it must not import are checked. `jobber_cli.py --help` is also timed end to end. Exits with status 1 when an entry
+point fails to import, is over budget or imports a forbidden module, so it can gate CI. Only an entry point missing
+one of the OPTIONAL_MODULES (OS hook packages such as keyboard) is skipped instead.
+
+    cli         jobber_cli: help, and handing urls to a running daemon
+    hotkey      hotkey_listener: the hotkey entry point (a daemon client)
+    client      daemon_client: what both of the above need to talk to the daemon
+    tailor      resume_tailor: in-process tailoring, heavy dependencies are only loaded on first use
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--budget cli=120] [--top 10] [--output results.json]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCE_DIR = ROOT / "src" / "jobber"
+
+HEAVY_MODULES = ("google.genai", "playwright", "httpx", "bs4", "aiofiles", "pyautogui")
+# name: (module, budget in ms of cumulative import time, modules it must not import)
+ENTRY_POINTS = {
+    "cli": ("jobber_cli", 120, HEAVY_MODULES),
+    "hotkey": ("hotkey_listener", 200, HEAVY_MODULES),
+    "client": ("daemon_client", 60, HEAVY_MODULES),
+    "tailor": ("resume_tailor", 400, ("google.genai", "playwright", "httpx", "bs4")),
+}
+# OS hook packages an entry point may legitimately lack on a CI runner, it is skipped instead of failed without them
+OPTIONAL_MODULES = ("keyboard", "pyperclip")
+HELP_BUDGET_MS = 300  # wall time of `jobber_cli.py --help`, interpreter startup included
+
+
+def _env() -> dict:
+    return {**os.environ, "PYTHONPATH": str(SOURCE_DIR), "PYTHONDONTWRITEBYTECODE": "1"}
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """:return: {module: (self us, cumulative us)} from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def import_once(module: str, forbidden: tuple[str, ...]) -> dict:
+    """
+    Imports module in a fresh interpreter
+
+    :return: its import times and which forbidden modules got loaded, or the "error" (and "missing" module) if the import failed
+    """
+    code = (
+        f"import sys, json; import {module}; "
+        f"print(json.dumps([m for m in {list(forbidden)!r} if m in sys.modules]))"
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=_env(), cwd=ROOT)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit {result.returncode}"
+        missing = re.fullmatch(r"ModuleNotFoundError: No module named '([\w.]+)'", error)
+        return {"error": error, "missing": missing.group(1).split(".")[0] if missing else None}
+    modules = parse_importtime(result.stderr)
+    return {"cumulative_us": modules[module][1], "modules": modules, "loaded": json.loads(result.stdout)}
+
+
+def measure_entry_point(name: str, runs: int, budget_ms: float, top: int) -> dict:
+    module, _, forbidden = ENTRY_POINTS[name]
+    samples = [import_once(module, forbidden) for _ in range(runs)]
+    if "error" in samples[0]:
+        if samples[0]["missing"] in OPTIONAL_MODULES:
+            return {"module": module, "skipped": samples[0]["error"]}
+        return {"module": module, "error": samples[0]["error"], "ok": False}
+    median_ms = statistics.median(sample["cumulative_us"] for sample in samples) / 1000
+    slowest = sorted(samples[-1]["modules"].items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return {
+        "module": module,
+        "import_ms": round(median_ms, 1),
+        "budget_ms": budget_ms,
+        "forbidden_loaded": samples[-1]["loaded"],
+        "ok": median_ms <= budget_ms and not samples[-1]["loaded"],
+        "slowest_self_ms": {mod: round(self_us / 1000, 1) for mod, (self_us, _) in slowest},
+    }
+
+
+def measure_help(runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(SOURCE_DIR / "jobber_cli.py"), "--help"], capture_output=True, env=_env(), cwd=ROOT, check=True)
+        samples.append(time.perf_counter() - start)
+    median_ms = statistics.median(samples) * 1000
+    return {"wall_ms": round(median_ms, 1), "budget_ms": HELP_BUDGET_MS, "ok": median_ms <= HELP_BUDGET_MS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point (the median is kept)")
+    parser.add_argument("--budget", action="append", default=[], metavar="NAME=MS", help="Override a budget, Example: tailor=500")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules listed per entry point")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    budgets = {name: budget for name, (_, budget, _) in ENTRY_POINTS.items()}
+    for override in args.budget:
+        name, _, ms = override.partition("=")
+        if name not in budgets:
+            raise SystemExit(f"Unknown entry point '{name}' (choose from {', '.join(budgets)})")
+        budgets[name] = float(ms)
+
+    results = {name: measure_entry_point(name, args.runs, budgets[name], args.top) for name in ENTRY_POINTS}
+    results["cli --help"] = measure_help(args.runs)
+    text = json.dumps({"python": sys.version.split()[0], "runs": args.runs, "entry_points": results}, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+
+    failed = [name for name, result in results.items() if result.get("ok") is False]
+    for name in failed:
+        reason = "fails to import" if "error" in results[name] else "is over its cold-start budget or imports a heavy dependency"
+        print(f"❌ {name} {reason}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Deterministic stand-in for the async Gemini client (genai.Client(...).aio) used by LLMClient.
+
+generate_content sleeps for a configurable (seeded, jittered) latency and answers with a tailored
+version of the resume payload found in the prompt: every role keeps its first bullets and the skills
+are trimmed, in the same JSON schema the real model is asked for. generate_content_stream returns the
+same answer in chunks, with the latency spread across them. No network, no API key.
+"""
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+
+PAYLOAD_MARKER = "Here is my experience and the job app:\n"
+
+
+class _FakeModels:
+    def __init__(self, backend: "FakeGemini"):
+        self.backend = backend
+
+    async def generate_content(self, model: str, contents, config=None):
+        return await self.backend.generate_content(model, contents, config)
+
+    async def generate_content_stream(self, model: str, contents, config=None):
+        return self.backend.generate_content_stream(model, contents, config)
+
+
+class FakeGemini:
+    """
+    :param latency: mean seconds per generate_content call
+    :param jitter: +/- seconds of uniform noise around latency
+    :param bullets_per_role: bullets kept in each role of the response
+    :param seed: seed for the jitter so runs are repeatable
+    :param chunk_chars: characters per chunk of a streamed response
+    """
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0, bullets_per_role: int = 3, seed: int = 0, chunk_chars: int = 200):
+        self.latency = latency
+        self.jitter = jitter
+        self.bullets_per_role = bullets_per_role
+        self._random = random.Random(seed)
+        self.chunk_chars = chunk_chars
+        self.models = _FakeModels(self)
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    def _tailor(self, contents: str) -> dict:
+        payload, _ = json.JSONDecoder().raw_decode(contents.split(PAYLOAD_MARKER, 1)[1])
+        return {
+            "work_experience": {
+                key: {"title": role["title"], "responsibilities": role["responsibilities"][:self.bullets_per_role]}
+                for key, role in payload["work_experience"].items()
+            },
+            "skills": {skill_type: skills[:5] for skill_type, skills in payload["skills"].items()},
+        }
+
+    def _usage(self, contents: str, text: str) -> SimpleNamespace:
+        prompt_tokens = len(contents) // 4
+        output_tokens = len(text) // 4
+        return SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            cached_content_token_count=0,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+
+    def _latency(self) -> float:
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    async def generate_content(self, model: str, contents, config=None):
+        self.calls += 1
+        self.prompt_tokens += len(contents) // 4
+        await asyncio.sleep(self._latency())
+        text = json.dumps(self._tailor(contents))
+        return SimpleNamespace(text=text, usage_metadata=self._usage(contents, text))
+
+    async def generate_content_stream(self, model: str, contents, config=None):
+        self.calls += 1
+        self.prompt_tokens += len(contents) // 4
+        text = json.dumps(self._tailor(contents))
+        pieces = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+        delay = self._latency() / len(pieces)
+        for i, piece in enumerate(pieces):
+            await asyncio.sleep(delay)
+            usage = self._usage(contents, text) if i == len(pieces) - 1 else None
+            yield SimpleNamespace(text=piece, usage_metadata=usage)
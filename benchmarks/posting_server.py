@@ -0,0 +1,94 @@
+"""
+Local HTTP server that serves the saved job postings in fixtures/postings.
+
+It runs as a plain HTTP forward proxy, so the benchmark can use real looking urls such as
+http://bench.greenhouse.io/job/7 (the scraper picks selectors from the hostname) while every request
+(httpx or chromium) is answered locally. The job number is written into the posting's description so
+each url has a distinct posting (and LLM cache key).
+"""
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+POSTINGS_DIR = Path(__file__).resolve().parent / "fixtures" / "postings"
+DEFAULT_FIXTURE = "default"
+REQUISITION_MARKER = "<!--requisition-->"
+
+
+@lru_cache(maxsize=None)
+def load_fixture(domain: str) -> str:
+    return (POSTINGS_DIR / f"{domain}.html").read_text(encoding="utf-8")
+
+
+def fixture_domains() -> list[str]:
+    """:return: every domain with a saved posting, "default" included"""
+    return sorted(path.stem for path in POSTINGS_DIR.glob("*.html"))
+
+
+def posting_url(domain: str, job_id: int) -> str:
+    """:return: url for job number job_id on a domain's fixture (served through the proxy)"""
+    host = "careers.bench-example.org" if domain == DEFAULT_FIXTURE else f"bench.{domain}"
+    return f"http://{host}/job/{job_id}"
+
+
+def _fixture_for_host(host: str) -> str:
+    matches = [domain for domain in fixture_domains() if host == domain or host.endswith("." + domain)]
+    return max(matches, key=len) if matches else DEFAULT_FIXTURE
+
+
+class _PostingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        host = parts.hostname or self.headers.get("Host", "").split(":")[0]
+        if not parts.path.startswith("/job/"):
+            self._send(404, b"not found", "text/plain")
+            return
+        self.server.requests += 1
+        job_id = parts.path.rsplit("/", 1)[-1]
+        html = load_fixture(_fixture_for_host(host)).replace(REQUISITION_MARKER, f"Requisition ID: R-{job_id}")
+        self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def do_CONNECT(self):
+        # Only plain http is served, https (analytics etc.) is refused
+        self._send(405, b"https is not proxied", "text/plain")
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PostingServer:
+    """Runs the fixture server on a background thread: `with PostingServer() as server: server.proxy_url`"""
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = ThreadingHTTPServer((host, port), _PostingHandler)
+        self._server.daemon_threads = True
+        self._server.requests = 0
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def proxy_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        """Postings served so far"""
+        return self._server.requests
+
+    def __enter__(self) -> "PostingServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from posting_cache import normalize_url
+from sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+# Statuses of runs that produced a resume, "duplicate" runs reused the outputs of an earlier near-duplicate posting
+SUCCESS_STATUSES = ("done", "duplicate")
+
+
+def content_hash(content: str | bytes | None) -> str | None:
+    """:return: sha256 hex digest of the content, None if there is none"""
+    if content is None:
+        return None
+    return hashlib.sha256(content.encode("utf-8") if isinstance(content, str) else content).hexdigest()
+
+
+def _to_epoch(value: datetime | str | float | None) -> float | None:
+    """Accepts a datetime, an ISO date/datetime string (Example: 2025-07-13) or epoch seconds"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+class ApplicationHistory:
+    """
+    SQLite index of every tailoring run: url, company, title, when it ran, where its outputs were written,
+    content hashes of the posting and pdf, and whether it succeeded.
+    Replaces scanning the timestamped output directories (and the single entry recent.json): recent runs and
+    searches by company, title and date range are answered from indexes without touching the filesystem.
+    """
+    FIELDS = ("id", "url", "company", "title", "created_at", "status", "error", "output_dir", "pdf_path", "html_path",
+              "description_sha256", "pdf_sha256")
+
+    def __init__(self, db_path: str | Path):
+        """
+        :param db_path: path to the sqlite file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with connect(self.db_path, wal=True) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS applications (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT,
+                    company TEXT COLLATE NOCASE,
+                    title TEXT COLLATE NOCASE,
+                    created_at REAL NOT NULL,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    output_dir TEXT,
+                    pdf_path TEXT,
+                    html_path TEXT,
+                    description_sha256 TEXT,
+                    pdf_sha256 TEXT
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS applications_created_at ON applications (created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS applications_company ON applications (company, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS applications_title ON applications (title, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS applications_url ON applications (url)")
+
+    def record(self, url: str | None, company: str | None, title: str | None, status: str, error: str | None = None,
+               output_dir: str | None = None, pdf_path: str | Path | None = None, html_path: str | Path | None = None,
+               description_sha256: str | None = None, pdf_sha256: str | None = None, created_at: float | None = None) -> int:
+        """
+        Adds a run to the index
+
+        :param url: job posting url (normalized internally), None for a copied job description
+        :param status: "done", "duplicate" (reused an earlier near-duplicate's outputs), "failed" or "cancelled"
+        :param output_dir: name of the run's directory in resources/outputs
+        :param created_at: epoch seconds, defaults to now
+        :return: id of the new entry
+        """
+        with connect(self.db_path) as conn:
+            cursor = conn.execute(
+                f"INSERT INTO applications ({', '.join(self.FIELDS[1:])}) VALUES ({', '.join('?' * (len(self.FIELDS) - 1))})",
+                (normalize_url(url) if url else None, company, title, created_at or time.time(), status, error, output_dir,
+                 str(pdf_path) if pdf_path else None, str(html_path) if html_path else None, description_sha256, pdf_sha256)
+            )
+            return cursor.lastrowid
+
+    def _select(self, where: list[str], params: list, limit: int) -> list[dict]:
+        query = f"SELECT {', '.join(self.FIELDS)} FROM applications"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        with connect(self.db_path) as conn:
+            rows = conn.execute(query, (*params, limit)).fetchall()
+        return [dict(zip(self.FIELDS, row)) for row in rows]
+
+    def recent(self, limit: int = 10, status: str | None = None) -> list[dict]:
+        """
+        :param limit: number of runs to return
+        :param status: only runs with this status (Example: "done")
+        :return: most recent runs first
+        """
+        return self._select(["status = ?"] if status else [], [status] if status else [], limit)
+
+    def search(self, company: str | None = None, title: str | None = None, since: datetime | str | float | None = None,
+               until: datetime | str | float | None = None, url: str | None = None, status: str | None = None,
+               limit: int = 100) -> list[dict]:
+        """
+        Finds runs matching every given filter, most recent first
+
+        :param company: case-insensitive company name prefix (Example: "goo" matches "Google")
+        :param title: case-insensitive substring of the job title (Example: "backend")
+        :param since: runs at or after this datetime / ISO date / epoch seconds
+        :param until: runs before this datetime / ISO date / epoch seconds
+        :param url: job posting url (normalized internally)
+        :param status: "done", "duplicate", "failed" or "cancelled"
+        :param limit: max runs returned
+        """
+        where, params = [], []
+        if company:
+            where.append("company LIKE ? ESCAPE '\\'")  # a prefix LIKE on a NOCASE column uses the company index
+            params.append(self._escape_like(company) + "%")
+        if title:
+            where.append("title LIKE ? ESCAPE '\\'")
+            params.append("%" + self._escape_like(title) + "%")
+        if since is not None:
+            where.append("created_at >= ?")
+            params.append(_to_epoch(since))
+        if until is not None:
+            where.append("created_at < ?")
+            params.append(_to_epoch(until))
+        if url:
+            where.append("url = ?")
+            params.append(normalize_url(url))
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        return self._select(where, params, limit)
+
+    @staticmethod
+    def _escape_like(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def latest_output_dir(self) -> str | None:
+        """:return: output directory of the most recent successful run, reused or not"""
+        runs = self._select([f"status IN ({', '.join('?' * len(SUCCESS_STATUSES))})"], list(SUCCESS_STATUSES), 1)
+        return runs[0]["output_dir"] if runs else None
+
+    def import_output_dirs(self, output_root: str | Path, parse_dir_name) -> int:
+        """
+        One-off backfill of runs made before the index existed, from their timestamped output directories.
+        Directories that are already indexed are skipped
+
+        :param output_root: resources/outputs
+        :param parse_dir_name: dir name -> (datetime, company slug, title slug), None if it isn't a run directory
+        :return: number of runs added
+        """
+        output_root = Path(output_root)
+        with connect(self.db_path) as conn:
+            known = {row[0] for row in conn.execute("SELECT output_dir FROM applications WHERE output_dir IS NOT NULL")}
+        added = 0
+        for directory in sorted(path for path in output_root.iterdir() if path.is_dir() and path.name not in known):
+            parsed = parse_dir_name(directory.name)
+            if parsed is None:
+                continue
+            created, company, title = parsed
+            pdfs = sorted(directory.glob("*.pdf"))
+            html = directory / "resume_wip.html"
+            self.record(
+                None, company, title, "done" if pdfs else "failed", output_dir=directory.name,
+                pdf_path=pdfs[0] if pdfs else None, html_path=html if html.exists() else None,
+                pdf_sha256=content_hash(pdfs[0].read_bytes()) if pdfs else None, created_at=created.timestamp(),
+            )
+            added += 1
+        return added
+
+    async def record_async(self, *args, **kwargs) -> int:
+        return await asyncio.to_thread(self.record, *args, **kwargs)
+
+    async def recent_async(self, limit: int = 10, status: str | None = None) -> list[dict]:
+        return await asyncio.to_thread(self.recent, limit, status)
+
+    async def search_async(self, **filters) -> list[dict]:
+        return await asyncio.to_thread(self.search, **filters)
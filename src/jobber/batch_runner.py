@@ -0,0 +1,122 @@
+import logging
+from dataclasses import dataclass, field
+from resume_tailor import ResumeTailor
+from pipeline import Pipeline, PipelineJob, Stage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of tailoring a resume for a single job url"""
+    url: str
+    success: bool
+    elapsed: float
+    output_dir: str | None = None
+    error: str | None = None
+    fit_iterations: int | None = None
+    stage: str | None = None  # last stage the job reached (where it failed or was cancelled if not successful)
+    duplicate_of: str | None = None  # url of the near-duplicate posting whose result was reused
+    cancelled: bool = False
+    stage_seconds: dict = field(default_factory=dict)
+
+
+class BatchRunner:
+    """
+    Tailors resumes for many job urls through a staged Pipeline: scrape -> llm -> render.
+    Each stage has its own worker pool (network bound scraping, quota bound LLM calls, browser bound rendering)
+    so one posting can be scraped while another waits on the LLM and a third is being printed.
+    Each url gets its own clone of the base ResumeTailor.
+    """
+    def __init__(self, r_tailor: ResumeTailor, scrape_workers: int = 4, llm_workers: int = 2, render_workers: int = 2,
+                 queue_size: int | None = None):
+        """
+        :param r_tailor: fully set up ResumeTailor (see ResumeTailor.set_scraper) used as the template for every job
+        :param scrape_workers: max job postings scraped at the same time
+        :param llm_workers: max LLM requests in flight at the same time
+        :param render_workers: max PDFs rendered at the same time
+        :param queue_size: max jobs waiting in front of each stage (see Pipeline)
+        """
+        self.r_tailor = r_tailor
+        self.force_refresh = False
+        self.pipeline = Pipeline([
+            Stage("scrape", self._scrape, scrape_workers),
+            Stage("llm", self._tailor, llm_workers),
+            Stage("render", self._render, render_workers),
+        ], queue_size=queue_size)
+
+    async def _scrape(self, job: PipelineJob) -> bool:
+        return await job.payload.scrape_stage_async(job.key, force_refresh=self.force_refresh)
+
+    async def _tailor(self, job: PipelineJob) -> bool:
+        return await job.payload.tailor_stage_async(job.payload.scraper.job_description)
+
+    async def _render(self, job: PipelineJob) -> bool:
+        tailor = job.payload
+        return await tailor.render_stage_async(tailor.scraper.company_name, tailor.scraper.job_title)
+
+    def cancel(self, url: str) -> bool:
+        """
+        Cancels a url that is still waiting or running
+
+        :return: True if it was cancelled
+        """
+        return self.pipeline.cancel(url)
+
+    @staticmethod
+    def _to_result(job: PipelineJob) -> BatchResult:
+        tailor = job.payload
+        return BatchResult(
+            url=job.key,
+            success=job.success,
+            elapsed=job.elapsed,
+            output_dir=tailor.most_recent_output_dir,
+            error="cancelled" if job.cancelled else job.error,
+            fit_iterations=tailor.most_recent_fit.iterations if tailor.most_recent_fit else None,
+            stage=job.stage,
+            duplicate_of=(tailor.duplicate_of["url"] or "copied description") if tailor.duplicate_of else None,
+            cancelled=job.cancelled,
+            stage_seconds=job.stage_seconds,
+        )
+
+    async def run(self, urls: list[str], force_refresh: bool = False):
+        """
+        Runs every url through the pipeline and yields each BatchResult as soon as it finishes
+
+        :param urls: job posting urls
+        :param force_refresh: re-scrape postings even if they are in the posting cache
+        """
+        self.force_refresh = force_refresh
+        async for job in self.pipeline.run([(url, self.r_tailor.clone()) for url in urls]):
+            result = self._to_result(job)
+            status = "done" if result.success else "cancelled" if result.cancelled else "failed"
+            await job.payload.record_application_async(url=job.key, job_description=job.payload.scraper.job_description,
+                                                       status=status, error=result.error)
+            yield result
+
+    @staticmethod
+    def summarize(results: list[BatchResult], elapsed: float) -> dict:
+        """
+        Builds an end-of-run summary
+
+        :param results: every BatchResult from the run
+        :param elapsed: wall clock time for the whole batch in seconds
+        :return: dict with counts, throughput, average seconds per stage and the failed urls
+        """
+        succeeded = [r for r in results if r.success]
+        failed = [r for r in results if not r.success]
+        stage_totals = {}
+        for r in results:
+            for stage, seconds in r.stage_seconds.items():
+                stage_totals.setdefault(stage, []).append(seconds)
+        return {
+            "total": len(results),
+            "succeeded": len(succeeded),
+            "failed": len(failed),
+            "cancelled": sum(r.cancelled for r in results),
+            "elapsed_seconds": round(elapsed, 2),
+            "jobs_per_minute": round(len(results) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            "avg_job_seconds": round(sum(r.elapsed for r in results) / len(results), 2) if results else 0.0,
+            "avg_stage_seconds": {stage: round(sum(times) / len(times), 2) for stage, times in stage_totals.items()},
+            "failures": {r.url: r.error for r in failed},
+        }
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+
+class PooledPage:
+    """
+    A browser context + page pair that gets leased out by the BrowserPool
+    """
+    def __init__(self, context: BrowserContext, page: Page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.crashed = False
+        page.on("crash", self._on_crash)
+
+    def _on_crash(self, *_):
+        self.crashed = True
+
+
+class BrowserPool:
+    """
+    Keeps one long-lived Chromium alive and leases out a bounded set of reusable contexts/pages.
+    Pages are recycled after max_uses leases or when they crash.
+    Use BrowserPool.shared() to get the process-wide pool instead of launching a browser per call.
+    """
+    _shared_pools = {}
+    shared_launch_options = {}  # extra chromium.launch() options for pools created by shared() (Example: a proxy)
+
+    def __init__(self, headless: bool = True, max_pages: int = 4, max_uses: int = 25, launch_options: dict | None = None):
+        """
+        :param headless: whether chromium runs headless (CDP Page.printToPDF only works headless)
+        :param max_pages: max number of pages that can be leased at the same time
+        :param max_uses: number of leases before a page and its context get recycled
+        :param launch_options: extra keyword arguments for chromium.launch()
+        """
+        self.headless = headless
+        self.max_pages = max_pages
+        self.max_uses = max_uses
+        self.launch_options = launch_options or {}
+
+        self._playwright = None
+        self._browser: Browser | None = None
+        self._launch_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_pages)
+        self._idle: list[PooledPage] = []
+
+        self.stats = {
+            "launches": 0,
+            "leases": 0,
+            "waits": 0,
+            "pages_created": 0,
+            "recycles": 0,
+            "crashes": 0,
+        }
+
+    @classmethod
+    def shared(cls, headless: bool = True) -> "BrowserPool":
+        """
+        Returns the process-wide pool for the given headless mode, creating it on first use
+
+        :param headless: whether the pooled browser runs headless
+        :return: shared BrowserPool instance
+        """
+        if headless not in cls._shared_pools:
+            cls._shared_pools[headless] = cls(headless=headless, launch_options=cls.shared_launch_options)
+        return cls._shared_pools[headless]
+
+    @classmethod
+    async def close_all(cls):
+        """Closes every shared pool. Call this once before the event loop shuts down"""
+        for pool in list(cls._shared_pools.values()):
+            await pool.close()
+        cls._shared_pools.clear()
+
+    async def _ensure_browser(self) -> Browser:
+        """Launches chromium if it isn't running yet (or relaunches it after a disconnect)"""
+        async with self._launch_lock:
+            if self._browser and self._browser.is_connected():
+                return self._browser
+            if self._browser:
+                logger.warning("Pooled browser disconnected, relaunching")
+                self._idle.clear()
+            if self._playwright is None:
+                from playwright.async_api import async_playwright  # imported on first launch, not with this module
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless, **self.launch_options)
+            self.stats["launches"] += 1
+            return self._browser
+
+    async def _new_pooled_page(self) -> PooledPage:
+        browser = await self._ensure_browser()
+        context = await browser.new_context()
+        page = await context.new_page()
+        self.stats["pages_created"] += 1
+        return PooledPage(context, page)
+
+    async def _retire(self, pooled: PooledPage):
+        self.stats["recycles"] += 1
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.debug(f"Failed to close pooled context cleanly: {e}")
+
+    def _is_reusable(self, pooled: PooledPage) -> bool:
+        return (
+            not pooled.crashed
+            and not pooled.page.is_closed()
+            and pooled.uses < self.max_uses
+            and self._browser is not None
+            and self._browser.is_connected()
+        )
+
+    @asynccontextmanager
+    async def lease(self):
+        """
+        Leases a page from the pool. The page goes back to the pool when the block exits,
+        or gets recycled if it crashed, hit max_uses, or the block raised.
+
+        Usage:
+            async with BrowserPool.shared().lease() as page:
+                await page.goto(url)
+        """
+        if self._semaphore.locked():
+            self.stats["waits"] += 1
+        await self._semaphore.acquire()
+        pooled = None
+        failed = False
+        try:
+            while self._idle and pooled is None:
+                candidate = self._idle.pop()
+                if self._is_reusable(candidate):
+                    pooled = candidate
+                else:
+                    await self._retire(candidate)
+            if pooled is None:
+                pooled = await self._new_pooled_page()
+            pooled.uses += 1
+            self.stats["leases"] += 1
+            yield pooled.page
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            if pooled is not None:
+                if pooled.crashed:
+                    self.stats["crashes"] += 1
+                if failed or not self._is_reusable(pooled):
+                    await self._retire(pooled)
+                else:
+                    self._idle.append(pooled)
+            self._semaphore.release()
+
+    def metrics(self) -> dict:
+        """
+        :return: snapshot of the pool counters plus current idle/in-use page counts
+        """
+        in_use = self.max_pages - self._semaphore._value
+        return {**self.stats, "idle": len(self._idle), "in_use": in_use}
+
+    async def close(self):
+        """Closes all pooled pages, the browser and playwright"""
+        logger.info(f"Closing browser pool, metrics: {self.metrics()}")
+        for pooled in self._idle:
+            try:
+                await pooled.context.close()
+            except Exception:
+                pass
+        self._idle.clear()
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception:
+                logger.warning("Failed to close browser cleanly")
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
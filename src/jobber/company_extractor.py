@@ -0,0 +1,88 @@
+import re
+
+# Phrases that sit right next to a company name, in priority order (the first is the most trustworthy).
+# "after" means the name follows the phrase, "before" means the name comes right before it.
+# Every phrase must start with a literal letter and is matched at a word boundary.
+COMPANY_ANCHORS = [
+    ("after", r"At\s+"),
+    ("after", r"Join the team at\s+"),
+    ("before", r"is a (?:leading|fast-growing|well-known|top-tier|global|premier|renowned|innovative|dynamic|reputable|established|trusted)\b"),
+    ("before", r"is an equal opportunity employer"),
+    ("before", r"is looking for"),
+]
+
+MAX_NAME_WORDS = 5
+# A company name following an anchor: a capitalized word and up to 4 more capitalized/numeric words (or "&").
+# Bounded with no nested quantifiers, so it can't backtrack badly.
+TRAILING_NAME = re.compile(rf"[A-Z][\w&\-]*(?:[ \t]+[A-Z0-9&][\w&\-]*){{0,{MAX_NAME_WORDS - 1}}}")
+NAME_WORD = re.compile(r"[A-Z0-9&][\w&\-]*")
+
+
+class CompanyNameExtractor:
+    """
+    Finds the company name in a job description with a single pass of one precompiled regex.
+    The regex only looks for the anchor phrases, and the name is then read from the words next to each anchor,
+    so the cost stays linear in the description length. Candidates are ranked by anchor priority, then position.
+    """
+    def __init__(self, anchors: list[tuple[str, str]] = COMPANY_ANCHORS):
+        """
+        :param anchors: (direction, regex) pairs in priority order, direction is "after" or "before"
+        """
+        self.directions = [direction for direction, _ in anchors]
+        # Leading with a character class of the anchors' first letters lets the regex engine skip most positions
+        # with one set lookup, then the lookbehinds dispatch to the anchors starting with that letter
+        first_letters = "".join(sorted({pattern[0] for _, pattern in anchors}))
+        alternatives = "|".join(f"(?<={pattern[0]})(?P<p{i}>{pattern[1:]})" for i, (_, pattern) in enumerate(anchors))
+        self._regex = re.compile(rf"[{first_letters}](?<=\b[{first_letters}])(?:{alternatives})")
+
+    def _name_after(self, text: str, pos: int) -> str | None:
+        match = TRAILING_NAME.match(text, pos)
+        return match.group(0) if match else None
+
+    def _name_before(self, text: str, pos: int) -> str | None:
+        # Walk back over up to MAX_NAME_WORDS capitalized words directly in front of the anchor
+        words = text[max(0, pos - 40 * MAX_NAME_WORDS):pos].split()
+        name = []
+        for word in reversed(words[-MAX_NAME_WORDS:]):
+            if not NAME_WORD.fullmatch(word):
+                break
+            name.append(word)
+        while name and not name[-1][0].isupper():  # the first word must start with a capital letter
+            name.pop()
+        return " ".join(reversed(name)) or None
+
+    def candidates(self, text: str) -> list[tuple[int, int, str]]:
+        """
+        :param text: job description
+        :return: (priority, position, name) for every candidate found, best first
+        """
+        found = []
+        for match in self._regex.finditer(text):
+            priority = int(match.lastgroup[1:])
+            name = self._name_at(text, match, priority)
+            if name:
+                found.append((priority, match.start(), name))
+        found.sort()
+        return found
+
+    def _name_at(self, text: str, match: re.Match, priority: int) -> str | None:
+        if self.directions[priority] == "after":
+            return self._name_after(text, match.end())
+        return self._name_before(text, match.start())
+
+    def extract(self, text: str) -> str:
+        """
+        :param text: job description
+        :return: best ranked company name, or "n-a" if none found
+        """
+        best = None
+        for match in self._regex.finditer(text):
+            priority = int(match.lastgroup[1:])
+            if best is not None and priority >= best[0]:
+                continue
+            name = self._name_at(text, match, priority)
+            if name:
+                best = (priority, name)
+                if priority == 0:
+                    break
+        return best[1] if best else "n-a"
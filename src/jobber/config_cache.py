@@ -0,0 +1,88 @@
+import copy
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable
+import aiofiles
+
+logger = logging.getLogger(__name__)
+
+
+def copy_json(value: Any) -> Any:
+    """Copies parsed JSON (dicts, lists and scalars) several times faster than copy.deepcopy"""
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
+
+
+def copy_soup(soup):
+    """Copies a parsed BeautifulSoup document"""
+    return copy.copy(soup)
+
+
+def file_stamp(path: str | Path) -> tuple[int, int] | None:
+    """:return: (mtime in ns, size) identifying the file's current version, None if it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ConfigCache:
+    """
+    Process-wide cache of parsed config and asset files (selectors, scrape profiles, hotkeys, resume data, templates...),
+    keyed by path. Every read checks the file's mtime and size with a single stat, so an edited file is re-read on its
+    next use without a restart, while an unchanged one is never read or parsed twice.
+    Callers get their own copy of the parsed value by default, so mutating it (Example: tailoring the resume) can't leak
+    into the cache. Read-only callers can pass copy_value=None to share the cached object.
+    """
+    _shared = None
+
+    def __init__(self):
+        self._entries = {}  # path -> (stamp, parsed value)
+        self.stats = {"hits": 0, "misses": 0, "reloads": 0}
+
+    @classmethod
+    def shared(cls) -> "ConfigCache":
+        """Returns the process-wide cache"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def stamp(self, path: str | Path) -> tuple[int, int] | None:
+        """:return: current version of a file, compare it with an older stamp to see whether something derived from it is stale"""
+        return file_stamp(path)
+
+    async def get_async(self, path: str | Path, parse: Callable[[str], Any], copy_value: Callable[[Any], Any] | None = copy_json) -> Any:
+        """
+        :param path: file to load
+        :param parse: turns the file's text into the cached value (Example: json.loads)
+        :param copy_value: makes the copy handed to the caller, None to hand out the cached value itself (never modify it)
+        :return: copy of the parsed file
+        :raises OSError: if the file can't be read
+        :raises: whatever parse raises for invalid content
+        """
+        key = str(Path(path).resolve())
+        stamp = file_stamp(key)
+        entry = self._entries.get(key)
+        if entry is not None and stamp is not None and entry[0] == stamp:
+            self.stats["hits"] += 1
+            return copy_value(entry[1]) if copy_value else entry[1]
+        self.stats["reloads" if entry is not None else "misses"] += 1
+        async with aiofiles.open(key, "r", encoding="utf-8") as f:
+            value = parse(await f.read())
+        if entry is not None:
+            logger.info(f"{Path(key).name} changed on disk, reloaded it")
+        self._entries[key] = (stamp, value)
+        return copy_value(value) if copy_value else value
+
+    def invalidate(self, path: str | Path = None):
+        """Drops one file (or everything) from the cache"""
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(str(Path(path).resolve()), None)
+
@@ -0,0 +1,327 @@
+import argparse
+import asyncio
+import hmac
+import json
+import logging
+import time
+from http import HTTPStatus
+from resume_tailor import ResumeTailor
+from file_handler import FileHandler
+from browser_pool import BrowserPool
+from config_cache import ConfigCache
+from job_queue import JobQueue, QueuedJob
+from daemon_client import DEFAULT_DAEMON_CONFIG, TOKEN_HEADER, load_daemon_token
+from stage_limits import StageLimits
+from tracing import Tracer, JsonLinesSink, span
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTooLarge(ValueError):
+    """The request body is over JobberDaemon.MAX_BODY_BYTES"""
+
+
+class JobberDaemon:
+    """
+    Long-running process that keeps everything expensive warm between requests: the imports, resume data, compiled
+    template, selector registry, posting/LLM caches, LLM client and a launched browser.
+    Tailoring requests arrive as JSON over a local HTTP endpoint (see DaemonClient) and run through a JobQueue,
+    each job on its own ResumeTailor clone, so a request only costs the scrape, the LLM call and the render.
+    Edits to the resume data, template, selectors and scrape profiles are picked up by the next job without a restart.
+    Every request must be JSON, addressed to a loopback Host, without an Origin header and carry the per-install token
+    from configs/daemon_token, so web pages open in a browser (CSRF, DNS rebinding) can't queue jobs or shut it down.
+
+    Endpoints:
+        GET  /status               queued, running and finished jobs plus LLM/browser metrics
+        POST /tailor               {"url", "force_refresh", "fit_page", "write_html", "wait", "reuse_duplicates"}
+        POST /tailor-description   {"job_description", "fit_page", "write_html", "wait", "reuse_duplicates"}
+        POST /save-pdf             re-renders the most recent output's (edited) html into its pdf (from the application history after a restart)
+        POST /shutdown
+    """
+    MAX_BODY_BYTES = 1 << 20  # every endpoint takes a small JSON object
+    MAX_HEADERS = 100
+    READ_TIMEOUT_SECONDS = 10.0  # to send the whole request, so a client can't hold a connection open
+
+    def __init__(self, r_tailor: ResumeTailor, host: str, port: int, token: str, workers: int = 2, max_queued: int = 20):
+        """
+        :param r_tailor: fully set up tailor, cloned for every job
+        :param host: interface to listen on, keep it local
+        :param port: port to listen on
+        :param token: secret every request must send in the X-Jobber-Token header (see load_daemon_token)
+        :param workers: jobs tailored at the same time (scrapes, LLM calls and renders across them are capped by r_tailor.limits)
+        :param max_queued: jobs allowed to wait, further requests are rejected
+        """
+        self.r_tailor = r_tailor
+        self.host = host
+        self.port = port
+        self.token = token
+        self.jobs = JobQueue(maxsize=max_queued, workers=workers, on_status=self._log_job_status)
+        self.most_recent_output_dir = None
+        self.input_files = None  # (resume data path, template path) checked for edits before every job, see create()
+        self._input_stamps = None
+        self.started = time.time()
+        self._stopped = None
+        self._listening = asyncio.Event()
+        self._routes = {
+            ("GET", "/status"): self._handle_status,
+            ("POST", "/tailor"): self._handle_tailor,
+            ("POST", "/tailor-description"): self._handle_tailor_description,
+            ("POST", "/save-pdf"): self._handle_save_pdf,
+            ("POST", "/shutdown"): self._handle_shutdown,
+        }
+
+    @classmethod
+    async def create(cls, host: str = None, port: int = None, resume_file: str = "jackie_ling_data.json",
+                     template_file: str = "default_resume_template.html") -> "JobberDaemon":
+        """
+        Loads the configs, resume and template, sets up the tailor and warms up the LLM client and browser
+
+        :param host: overrides configs/daemon_config.json
+        :param port: overrides configs/daemon_config.json
+        """
+        f_handler = FileHandler()
+        config = {**DEFAULT_DAEMON_CONFIG, **(await f_handler.load_daemon_config_async() or {})}
+        resume = await f_handler.load_resume_data_async(resume_file)
+        template = await f_handler.load_resume_template_async(template_file)
+        r_tailor = await ResumeTailor.set_scraper(resume, template)
+        r_tailor.limits = StageLimits(config["max_scrapes"], config["max_llm_calls"], config["max_renders"])  # shared by every clone
+        instance = cls(r_tailor, host or config["host"], port or config["port"], load_daemon_token(create=True),
+                       config["workers"], config["max_queued"])
+        instance.input_files = (f_handler.resume_data_path(resume_file), f_handler.resume_template_path(template_file))
+        instance._input_stamps = instance._current_input_stamps()
+        await instance.warm_up_async()
+        return instance
+
+    async def warm_up_async(self):
+        """Creates the Gemini client and launches the pdf browser with one idle page, so the first request doesn't pay for them"""
+        with span("daemon.warm_up"):
+            try:
+                self.r_tailor.llm_client.client
+            except Exception as e:
+                logger.warning(f"Could not create the LLM client yet: {e}")
+            try:
+                async with BrowserPool.shared(headless=True).lease():
+                    pass
+            except Exception as e:
+                logger.warning(f"Could not launch the pdf browser yet: {e}")
+
+    def _current_input_stamps(self) -> tuple:
+        return tuple(ConfigCache.shared().stamp(path) for path in self.input_files)
+
+    async def _refresh_inputs_async(self):
+        """Rebuilds the base tailor if the resume data or template changed on disk and refreshes the scraper configs"""
+        if self.input_files is None:
+            return
+        stamps = self._current_input_stamps()
+        if stamps != self._input_stamps:
+            f_handler = self.r_tailor.f_handler
+            resume = await f_handler.load_resume_data_async(self.input_files[0].name)
+            template = await f_handler.load_resume_template_async(self.input_files[1].name)
+            if resume and template.contents:
+                template_changed = stamps[1] != self._input_stamps[1]
+                self.r_tailor = self.r_tailor.clone(resume=resume, parsed_template=template if template_changed else None)
+                logger.info("Resume data or template changed on disk, reloaded them")
+            self._input_stamps = stamps
+        await self.r_tailor.scraper.refresh_configs_async()
+
+    def _log_job_status(self, job: QueuedJob):
+        if job.finished is None:
+            logger.info(f"[{job.id}] {job.name}: {job.status}")
+        else:
+            logger.info(f"[{job.id}] {job.name}: {job.status} in {job.finished - job.started:.1f}s" + (f" ({job.error})" if job.error else ""))
+
+    async def _tailor_async(self, url: str = None, job_description: str = None, force_refresh: bool = False,
+                            fit_page: bool = False, write_html: bool = True, reuse_duplicates: bool = True) -> dict | bool:
+        await self._refresh_inputs_async()
+        tailor = self.r_tailor.clone()
+        tailor.fit_to_page = fit_page
+        tailor.write_html = write_html
+        tailor.reuse_duplicates = reuse_duplicates
+        if url:
+            tailored = await tailor.generate_tailored_resume_async(url, force_refresh=force_refresh)
+        else:
+            tailored = await tailor.alternative_generate_tailored_resume_async(job_description)
+        if not tailored:
+            return False
+        self.most_recent_output_dir = tailor.most_recent_output_dir
+        return {
+            "output_dir": str(tailor.f_handler.output_dir / tailor.most_recent_output_dir),
+            "pdf_name": tailor.resume_pdf_file_name,
+            "fit_iterations": tailor.most_recent_fit.iterations if tailor.most_recent_fit else None,
+            "duplicate_of": (tailor.duplicate_of["url"] or "copied description") if tailor.duplicate_of else None,
+        }
+
+    async def _save_pdf_async(self, dir_name: str) -> dict | bool:
+        saved = await self.r_tailor.f_handler.generate_pdf_async(dir_name=dir_name, output_name=self.r_tailor.resume_pdf_file_name)
+        return saved and {"output_dir": str(self.r_tailor.f_handler.output_dir / dir_name), "pdf_name": self.r_tailor.resume_pdf_file_name}
+
+    async def _job_response(self, job: QueuedJob | None, wait: bool) -> tuple[int, dict]:
+        if job is None:
+            return HTTPStatus.CONFLICT, {"error": "An identical job is already queued or the queue is full"}
+        if wait:
+            await job.wait()
+        answer = job.to_dict()
+        if isinstance(job.result, dict):
+            answer["result"] = job.result
+        return HTTPStatus.OK, answer
+
+    async def _handle_status(self, payload: dict) -> tuple[int, dict]:
+        return HTTPStatus.OK, {
+            "uptime_s": round(time.time() - self.started, 1),
+            "most_recent_output_dir": self.most_recent_output_dir,
+            "jobs": self.jobs.status(),
+            "llm": self.r_tailor.llm_client.metrics(),
+            "browser": BrowserPool.shared(headless=True).metrics(),
+            "spans": Tracer.shared().summary(),
+        }
+
+    async def _handle_tailor(self, payload: dict) -> tuple[int, dict]:
+        url = payload.get("url")
+        if not url:
+            return HTTPStatus.BAD_REQUEST, {"error": "'url' is required"}
+        job = self.jobs.submit(f"Tailor {url}", lambda: self._tailor_async(
+            url=url,
+            force_refresh=payload.get("force_refresh", False),
+            fit_page=payload.get("fit_page", False),
+            write_html=payload.get("write_html", True),
+            reuse_duplicates=payload.get("reuse_duplicates", True),
+        ), key=("tailor", url))
+        return await self._job_response(job, payload.get("wait", True))
+
+    async def _handle_tailor_description(self, payload: dict) -> tuple[int, dict]:
+        job_description = payload.get("job_description")
+        if not job_description:
+            return HTTPStatus.BAD_REQUEST, {"error": "'job_description' is required"}
+        job = self.jobs.submit("Tailor copied job description", lambda: self._tailor_async(
+            job_description=job_description,
+            fit_page=payload.get("fit_page", False),
+            write_html=payload.get("write_html", True),
+            reuse_duplicates=payload.get("reuse_duplicates", True),
+        ), key=("description", job_description))
+        return await self._job_response(job, payload.get("wait", True))
+
+    async def _handle_save_pdf(self, payload: dict) -> tuple[int, dict]:
+        dir_name = self.most_recent_output_dir or await self.r_tailor.f_handler.load_recent_output_dir_async()
+        if dir_name is None:
+            return HTTPStatus.CONFLICT, {"error": "No resume has been tailored yet"}
+        job = self.jobs.submit("Save PDF", lambda: self._save_pdf_async(dir_name), key=("save_pdf", dir_name))
+        return await self._job_response(job, payload.get("wait", True))
+
+    async def _handle_shutdown(self, payload: dict) -> tuple[int, dict]:
+        asyncio.get_running_loop().call_later(0.1, self._stopped.set)  # lets this answer go out first
+        return HTTPStatus.OK, {"stopping": True}
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple[str, str, dict, bytes]:
+        """
+        Reads the request line, headers (lowercased names) and raw body of an HTTP/1.1 request
+
+        :raises RequestTooLarge: if the announced body is over MAX_BODY_BYTES (it is never read)
+        :raises ValueError: if the request is malformed or has more than MAX_HEADERS headers
+        """
+        request_line = (await reader.readline()).decode("latin-1")
+        method, path, _ = request_line.split(" ", 2)
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            if len(headers) >= self.MAX_HEADERS:
+                raise ValueError(f"more than {self.MAX_HEADERS} headers")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length < 0:
+            raise ValueError(f"negative Content-Length {length}")
+        if length > self.MAX_BODY_BYTES:
+            raise RequestTooLarge(f"Request body of {length} bytes is over the {self.MAX_BODY_BYTES} byte limit")
+        body = await reader.readexactly(length)
+        return method.upper(), path.split("?", 1)[0], headers, body
+
+    def _check_headers(self, headers: dict) -> tuple[int, dict] | None:
+        """
+        :param headers: request headers from _read_request
+        :return: (status, error answer) if the request must be refused, None if it may go through
+        """
+        if "origin" in headers:
+            return HTTPStatus.FORBIDDEN, {"error": "Requests from web pages are not accepted"}
+        allowed_hosts = {f"{host}:{self.port}" for host in ("127.0.0.1", "localhost", "[::1]", self.host)}
+        if headers.get("host", "").lower() not in allowed_hosts:
+            return HTTPStatus.FORBIDDEN, {"error": "Requests must be addressed to this machine's loopback address"}
+        if headers.get("content-type", "").split(";", 1)[0].strip().lower() != "application/json":
+            return HTTPStatus.UNSUPPORTED_MEDIA_TYPE, {"error": "Content-Type must be application/json"}
+        if not hmac.compare_digest(headers.get(TOKEN_HEADER.lower(), "").encode("utf-8"), self.token.encode("utf-8")):
+            return HTTPStatus.UNAUTHORIZED, {"error": f"Missing or wrong {TOKEN_HEADER}, see configs/daemon_token"}
+        return None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, headers, body = await asyncio.wait_for(self._read_request(reader), self.READ_TIMEOUT_SECONDS)
+            handler = self._routes.get((method, path))
+            if refused := self._check_headers(headers):
+                status, answer = refused
+            elif handler is None:
+                status, answer = HTTPStatus.NOT_FOUND, {"error": f"No endpoint {method} {path}"}
+            else:
+                status, answer = await handler(json.loads(body) if body else {})
+        except RequestTooLarge as e:
+            status, answer = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": str(e)}
+        except asyncio.TimeoutError:
+            status, answer = HTTPStatus.REQUEST_TIMEOUT, {"error": f"Request not received within {self.READ_TIMEOUT_SECONDS}s"}
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, answer = HTTPStatus.BAD_REQUEST, {"error": f"Malformed request: {e}"}
+        except Exception as e:
+            logger.exception("Unexpected error while handling a daemon request")
+            status, answer = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+        body = json.dumps(answer, default=str).encode("utf-8")
+        status = HTTPStatus(status)
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+        )
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass  # the client gave up waiting, the job itself still finishes
+
+    async def wait_listening_async(self):
+        """Waits until serve_async() accepts connections"""
+        await self._listening.wait()
+
+    async def serve_async(self):
+        """Answers requests until /shutdown is called or the task is cancelled, then closes the browsers"""
+        self._stopped = asyncio.Event()
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]  # the port picked by the OS when port 0 was asked for
+        self._listening.set()
+        print(f"🟢 Jobber daemon listening on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await self._stopped.wait()
+        finally:
+            await self.jobs.close(wait=False)
+            await self.r_tailor.scraper.static_fetcher.close()
+            await BrowserPool.close_all()
+            print("🔴 Jobber daemon stopped")
+            print(Tracer.shared().format_summary())
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Keep Jobber warm and tailor resumes on request (see DaemonClient)")
+    parser.add_argument("--host", help="Interface to listen on (default from configs/daemon_config.json)")
+    parser.add_argument("--port", type=int, help="Port to listen on (default from configs/daemon_config.json)")
+    parser.add_argument("--trace", metavar="FILE", help="Append a JSON line per timed span (scrape, llm_call, pdf...) to FILE")
+    args = parser.parse_args()
+
+    tracer = Tracer.shared()
+    if args.trace:
+        tracer.add_sink(JsonLinesSink(args.trace))
+    try:
+        daemon = await JobberDaemon.create(args.host, args.port)
+        await daemon.serve_async()
+    finally:
+        tracer.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,163 @@
+import http.client
+import json
+import logging
+import os
+import secrets
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / 'configs' / 'daemon_config.json'
+DEFAULT_DAEMON_CONFIG = {
+    "host": "127.0.0.1", "port": 8765, "workers": 2, "max_queued": 20,
+    "max_scrapes": 4, "max_llm_calls": 2, "max_renders": 2,  # stage limits shared by every job's tailor clone
+}
+TOKEN_PATH = CONFIG_PATH.with_name('daemon_token')  # per-install secret every request has to carry, see load_daemon_token
+TOKEN_HEADER = "X-Jobber-Token"
+
+
+def load_daemon_config() -> dict:
+    """:return: configs/daemon_config.json on top of DEFAULT_DAEMON_CONFIG"""
+    try:
+        return {**DEFAULT_DAEMON_CONFIG, **json.loads(CONFIG_PATH.read_text(encoding="utf-8"))}
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Could not read {CONFIG_PATH} ({e}), using the default daemon address")
+        return dict(DEFAULT_DAEMON_CONFIG)
+
+
+def load_daemon_token(create: bool = False) -> str | None:
+    """
+    Reads the secret shared by the daemon and its clients, so a web page can't drive the daemon through the browser
+
+    :param create: generate it (readable by the current user only) if this install doesn't have one yet
+    :return: the token, None if there is none and create is False
+    """
+    try:
+        return TOKEN_PATH.read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        if not create:
+            return None
+    token = secrets.token_urlsafe(32)
+    try:
+        fd = os.open(TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:  # another process created it first
+        return load_daemon_token()
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+class DaemonError(Exception):
+    """The daemon answered with an error"""
+
+
+class DaemonClient:
+    """
+    Thin client for the Jobber daemon (see daemon.py), sending requests to its local HTTP endpoint.
+    Only uses the standard library, so the CLI and hotkey listener start instantly and leave google-genai, Playwright,
+    bs4, the configs, the compiled template and warm browsers to the daemon process.
+    Calls block, use asyncio.to_thread from async code.
+    """
+    def __init__(self, host: str | None = None, port: int | None = None, timeout: float = 900, token: str | None = None):
+        """
+        :param host: daemon host, defaults to configs/daemon_config.json
+        :param port: daemon port, defaults to configs/daemon_config.json
+        :param timeout: seconds to wait for an answer (a tailoring request waits for the whole job)
+        :param token: daemon token, defaults to configs/daemon_token (read once the daemon created it)
+        """
+        config = load_daemon_config()
+        self.host = host or config["host"]
+        self.port = port or config["port"]
+        self.timeout = timeout
+        self.token = token
+
+    def request(self, method: str, path: str, payload: dict | None = None, timeout: float | None = None) -> dict:
+        """
+        :param method: GET or POST
+        :param path: endpoint (Example: /tailor)
+        :param payload: JSON body
+        :param timeout: overrides self.timeout
+        :return: decoded JSON answer
+        :raises ConnectionError: if no daemon is listening
+        :raises DaemonError: if the daemon answered with an error status
+        """
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=timeout or self.timeout)
+        try:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            self.token = self.token or load_daemon_token()
+            headers = {"Content-Type": "application/json"}
+            if self.token:
+                headers[TOKEN_HEADER] = self.token
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            answer = json.loads(response.read() or b"{}")
+        finally:
+            connection.close()
+        if response.status >= 400:
+            raise DaemonError(answer.get("error", f"HTTP {response.status}"))
+        return answer
+
+    def is_running(self) -> bool:
+        try:
+            self.request("GET", "/status", timeout=1)
+            return True
+        except (OSError, DaemonError, json.JSONDecodeError):
+            return False
+
+    def start(self, wait_seconds: float = 60) -> bool:
+        """
+        Starts a daemon in the background if none is running and waits until it is ready
+
+        :param wait_seconds: how long to wait for it to warm up
+        :return: True once a daemon is answering
+        """
+        if self.is_running():
+            return True
+        daemon_script = Path(__file__).resolve().parent / "daemon.py"
+        options = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if sys.platform == "win32" else {"start_new_session": True}
+        subprocess.Popen(
+            [sys.executable, str(daemon_script), "--host", self.host, "--port", str(self.port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **options
+        )
+        deadline = time.monotonic() + wait_seconds
+        while time.monotonic() < deadline:
+            if self.is_running():
+                return True
+            time.sleep(0.25)
+        return False
+
+    def status(self) -> dict:
+        """:return: queued/running/finished jobs and LLM/browser metrics"""
+        return self.request("GET", "/status")
+
+    def tailor(self, url: str, force_refresh: bool = False, fit_page: bool = False, write_html: bool = True, wait: bool = True,
+               reuse_duplicates: bool = True) -> dict:
+        """
+        Queues a tailoring job for a job posting url
+
+        :param wait: wait for the job to finish, otherwise return as soon as it is queued
+        :param reuse_duplicates: reuse the result of an earlier near-duplicate posting instead of tailoring again
+        :return: job dict with its status, and result (output_dir...) once finished
+        """
+        return self.request("POST", "/tailor", {
+            "url": url, "force_refresh": force_refresh, "fit_page": fit_page, "write_html": write_html, "wait": wait,
+            "reuse_duplicates": reuse_duplicates,
+        })
+
+    def tailor_description(self, job_description: str, fit_page: bool = False, write_html: bool = True, wait: bool = True,
+                           reuse_duplicates: bool = True) -> dict:
+        """Queues a tailoring job for a job description that was copied instead of scraped"""
+        return self.request("POST", "/tailor-description", {
+            "job_description": job_description, "fit_page": fit_page, "write_html": write_html, "wait": wait,
+            "reuse_duplicates": reuse_duplicates,
+        })
+
+    def save_pdf(self, wait: bool = True) -> dict:
+        """Re-renders the pdf of the most recent output directory from its (possibly hand edited) html"""
+        return self.request("POST", "/save-pdf", {"wait": wait})
+
+    def shutdown(self) -> dict:
+        return self.request("POST", "/shutdown", {})
@@ -1,14 +1,24 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
 import json
 import logging
-import base64
 import re
 from pathlib import Path
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from typing import TYPE_CHECKING
 import aiofiles
+from application_history import ApplicationHistory
+from browser_pool import BrowserPool
+from config_cache import ConfigCache, copy_json, copy_soup
+from pdf_renderer import print_to_pdf_async
+from tracing import span
 from datetime import datetime
 import os
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,18 +34,21 @@ class FileHandler:
             self.base_dir = Path(__file__).resolve().parent.parent.parent
         self.output_dir = self.base_dir / 'resources' / 'outputs'
         self.input_dir = self.base_dir / 'resources' / 'inputs'
+        self.cache_dir = self.base_dir / 'resources' / 'cache'
+        self.config_dir = self.base_dir / 'configs'
+        self.history_db = self.output_dir / 'applications.sqlite3'  # index of every run, see ApplicationHistory
 
-    async def load_json_async(self, file_path: str) -> dict:
+    async def load_json_async(self, file_path: str, copy: bool = True) -> dict:
         """
         Helper function for loading in json files
+        Goes through the process-wide ConfigCache, so a file is only read again after it changed on disk
 
         :param file_path: String that contains the path of the json file
+        :param copy: False to get the shared cached dict, only for callers that never modify it
         :return: Dictionary parsed from the JSON file
         """ 
         try:
-            async with aiofiles.open(file_path, 'r') as f:
-                content = await f.read()
-                return json.loads(content)
+            return await ConfigCache.shared().get_async(file_path, json.loads, copy_json if copy else None)
         except FileNotFoundError:
             logger.error(f"File not found: {file_path}")
         except Exception as e:
@@ -44,35 +57,58 @@ class FileHandler:
         
     async def load_job_app_selectors_async(self) -> dict:
         """Loads selectors for job app webscraper"""
-        return await self.load_json_async(str(self.base_dir / 'configs' / 'job_app_selectors.json'))
+        return await self.load_json_async(str(self.config_dir / 'job_app_selectors.json'), copy=False)
+    
+    async def load_scrape_profiles_async(self) -> dict:
+        """Loads per domain browser scraping profiles (headless, navigation wait, resource blocklists)"""
+        return await self.load_json_async(str(self.config_dir / 'scrape_profiles.json'), copy=False)
     
+    def resume_data_path(self, file_name: str) -> Path:
+        return self.input_dir / 'resume_data' / file_name
+
+    def resume_template_path(self, file_name: str) -> Path:
+        return self.input_dir / 'templates' / file_name
+
     async def load_resume_data_async(self, file_name: str) -> dict:
         """Loads resume data that is stored in a json"""
-        return await self.load_json_async(str(self.base_dir / 'resources' / 'inputs' / 'resume_data' / file_name))
+        return await self.load_json_async(str(self.resume_data_path(file_name)))
     
     async def load_hotkey_config_async(self) -> dict:
         """Loads hotkey mappings from config"""
-        return await self.load_json_async(str(self.base_dir / 'configs' / 'hotkeys_config.json'))
+        return await self.load_json_async(str(self.config_dir / 'hotkeys_config.json'))
+
+    async def load_llm_config_async(self) -> dict:
+        """Loads LLM client settings (model, concurrency and rate limits, retries)"""
+        return await self.load_json_async(str(self.config_dir / 'llm_config.json'))
+
+    async def load_duplicate_config_async(self) -> dict:
+        """Loads near-duplicate posting detection settings (enabled, similarity threshold)"""
+        return await self.load_json_async(str(self.config_dir / 'duplicate_config.json'))
+
+    async def load_daemon_config_async(self) -> dict:
+        """Loads the daemon's address and job queue settings"""
+        return await self.load_json_async(str(self.config_dir / 'daemon_config.json'))
 
     async def load_resume_template_async(self, file_name: str) -> BeautifulSoup:
         """ 
         Loads a resume template from an HTML file
+        The parsed template is cached (see ConfigCache), every call gets its own copy of it
         :param file_name: Name of the HTML file to load
         :return: BeautifulSoup object containing the parsed HTML
         """
+        from bs4 import BeautifulSoup  # only needed for templates, the PDF-only paths never parse html
         try:
-            template_path = str(self.base_dir / 'resources' / 'inputs' / 'templates' / file_name)
-            async with aiofiles.open(template_path, "r", encoding="utf-8") as f:
-                content = await f.read()
-                return BeautifulSoup(content, "html.parser")
+            return await ConfigCache.shared().get_async(
+                self.resume_template_path(file_name), lambda content: BeautifulSoup(content, "html.parser"), copy_soup
+            )
         except Exception as e:
             logger.error("Could not load template: %s", e)
             return BeautifulSoup("", "html.parser")
     
-    async def save_html_async(self, parsed_html: BeautifulSoup, output_path: str = None) -> bool:
+    async def save_html_async(self, parsed_html: BeautifulSoup | str, output_path: str = None) -> bool:
         """
-        Saves a BeautifulSoup object as an HTML file
-        :param parsed_html: BeautifulSoup object to save
+        Saves a BeautifulSoup object or an already rendered html string as an HTML file
+        :param parsed_html: BeautifulSoup object (written prettified) or html string (written as is) to save
         :param output_path: Optional path to save the HTML file. If None, uses a
         default path in the output directory.
         :return: True if the file was saved successfully, False otherwise
@@ -81,7 +117,7 @@ class FileHandler:
             output_path = str(self.output_dir / "resume_wip.html")
         try:
             async with aiofiles.open(output_path, "w", encoding="utf-8") as f:
-                await f.write(parsed_html.prettify())
+                await f.write(parsed_html if isinstance(parsed_html, str) else parsed_html.prettify())
             return True
         except Exception as e:
             logger.error("Unable to write file: %s", e)
@@ -96,62 +132,48 @@ class FileHandler:
         :return: True if the PDF was generated successfully, False otherwise
         """
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context()
-                page = await context.new_page()
-
-                await page.goto(str(self.output_dir / dir_name / input_name))
-
-                # Connect to Chrome DevTools Protocol
-                client = await context.new_cdp_session(page)
-
-                # Trigger PDF generation
-                pdf_data = await client.send("Page.printToPDF", {
-                    "preferCSSPageSize": False,
-                    'marginLeft': 0,
-                    'marginRight': 0,
-                    'marginTop': 0,
-                    'marginBottom': 0 # Adjust >0 to add margins and prevent text overflow on pdf (If resume is a page long then ignore this)
-                })
-                output_path = str(self.output_dir / dir_name / output_name)
-                async with aiofiles.open(output_path, "wb") as f:
-                    await f.write(base64.b64decode(pdf_data["data"]))
-                await browser.close()
-                return True
+            with span("pdf", source="file"):
+                async with BrowserPool.shared(headless=True).lease() as page:
+                    await page.goto((self.output_dir / dir_name / input_name).as_uri())
+                    pdf_bytes = await print_to_pdf_async(page)
         except Exception as e:
             logger.error("Error generating PDF: %s", e)
             return False
-        
-    async def print_length_async(self):
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
-            page = await browser.new_page()
-
-            await page.goto(str(self.base_dir / 'output.html'))
-
-            scroll_height = await page.evaluate("document.documentElement.scrollHeight")
-            print(f"Page ScrollHeight: {scroll_height}px")
+        return await self.save_pdf_async(pdf_bytes, dir_name, output_name)
 
-            await browser.close()
-
-    
-    
+    async def save_pdf_async(self, pdf_bytes: bytes, dir_name: str, output_name: str = "Resume.pdf") -> bool:
+        """
+        Writes pdf bytes into an output directory
+        :param pdf_bytes: pdf file contents
+        :param dir_name: Directory name where the pdf will be stored (Only the name, not the full path)
+        :param output_name: Name of the output PDF file
+        :return: True if the PDF was saved successfully, False otherwise
+        """
+        output_dir = self.output_dir / dir_name
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(str(output_dir / output_name), "wb") as f:
+                await f.write(pdf_bytes)
+            return True
+        except Exception as e:
+            logger.error("Unable to write PDF: %s", e)
+            return False
+        
     def get_google_sheet_credentials(self):
         """
         Loads Google Sheets API credentials from a JSON file.
         :return: Credentials object
         """
-        return str(self.base_dir / 'configs' / 'credentials.json')
+        return str(self.config_dir / 'credentials.json')
     
 
     # [Output Directory Management]
-    async def load_recent_output_dir_async(self) -> str:
+    async def load_recent_output_dir_async(self) -> str | None:
         """
-        Loads the most recent output directory from a JSON file
-        :return: The most recent output directory name as a string
+        Looks up the most recent successful run in the application history (never scans the output directories)
+        :return: The most recent output directory name as a string, None if nothing has been tailored yet
         """
-        return await self.load_json_async(str(self.base_dir / 'configs' / 'recent.json'))
+        return await asyncio.to_thread(lambda: ApplicationHistory(self.history_db).latest_output_dir())
     
     def _sanitize_file_and_directory_name(self, name: str) -> str:
         """
@@ -163,18 +185,33 @@ class FileHandler:
         name = name.replace('\n', ' ').replace('\r', ' ')
         return re.sub(r'[<>:"/\\|?*]', '', name)
     
+    @staticmethod
     def _parse_timestamp(dir_name: str) -> datetime:
         """
-        Extract datetime from dir name with format: yyyy-mmm-dd_hh-mm_name
+        Extract datetime from dir name with format: yyyy-mm-dd_hh-mm-ss_name (see _get_timestamp),
+        or yyyy-mm-dd_hh-mm_name for directories created before seconds were added
         :param dir_name: Directory name to parse
         :return: Parsed datetime object or datetime.min if parsing fails
         """
-        try:
-            base = dir_name.split("_")[0:2]  # ['yyyy-mmm-dd', 'hh-mm']
-            timestamp_str = "_".join(base)
-            return datetime.strptime(timestamp_str, "%Y-%b-%d_%H-%M")
-        except Exception:
-            return datetime.min  # fallback if parsing fails
+        timestamp_str = "_".join(dir_name.split("_")[0:2])  # 'yyyy-mm-dd_hh-mm-ss'
+        for timestamp_format in ("%Y-%m-%d_%H-%M-%S", "%Y-%m-%d_%H-%M"):
+            try:
+                return datetime.strptime(timestamp_str, timestamp_format)
+            except ValueError:
+                continue
+        return datetime.min  # fallback if parsing fails
+
+    def parse_output_dir_name(self, dir_name: str) -> tuple[datetime, str, str] | None:
+        """
+        Reverses get_output_dir_name
+        :param dir_name: Directory name to parse (Example: "2025-07-13_04-34-09_company-name_job-title")
+        :return: (timestamp, company slug, job title slug), None if it isn't an output directory name
+        """
+        timestamp = self._parse_timestamp(dir_name)
+        parts = dir_name.split("_", 3)
+        if timestamp == datetime.min or len(parts) < 4:
+            return None
+        return timestamp, parts[2], parts[3]
         
     def _slugify(self, text: str) -> str:
         """
@@ -189,28 +226,62 @@ class FileHandler:
     
     def _get_timestamp(self) -> str:
         """
-        Returns the current timestamp in the format YYYY-MM-DD_HH-MM 
-        Example: 2025-07-13_04-34
+        Returns the current timestamp in the format YYYY-MM-DD_HH-MM-SS
+        Example: 2025-07-13_04-34-09
         """
-        return datetime.now().strftime("%Y-%m-%d_%H-%M")
+        return datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     
     def get_output_dir_name(self, company_name: str = "n-a", job_title: str = "n-a") -> str:
         """
         Create a new directory name with the format timestamp_companyname_title
         :param company_name: Name of the company
         :param job_title: Job title for the position
-        :return: Formatted directory name (e.g., "2025-07-13_04-34_company-name_job-title")
+        :return: Formatted directory name (e.g., "2025-07-13_04-34-09_company-name_job-title")
         """ 
         formatted_company_name = self._sanitize_file_and_directory_name(company_name)
         formatted_company_name = self._slugify(formatted_company_name)
         formatted_job_title =    self._sanitize_file_and_directory_name(job_title)
         formatted_job_title =    self._slugify(formatted_job_title)
         return f"{self._get_timestamp()}_{formatted_company_name}_{formatted_job_title}"
+
+    def create_output_dir(self, company_name: str = "n-a", job_title: str = "n-a") -> str:
+        """
+        Creates a new, empty output directory named by get_output_dir_name. Concurrent jobs for the same company and
+        title in the same second (common when both fell back to "n-a") get a counter suffix instead of sharing a directory
+        :param company_name: Name of the company
+        :param job_title: Job title for the position
+        :return: Name of the created directory (e.g., "2025-07-13_04-34-09_n-a_n-a-2")
+        """
+        base_name = self.get_output_dir_name(company_name, job_title)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for attempt in itertools.count(1):
+            dir_name = base_name if attempt == 1 else f"{base_name}-{attempt}"
+            try:
+                (self.output_dir / dir_name).mkdir(exist_ok=False)
+                return dir_name
+            except FileExistsError:
+                continue
     
-    async def write_resume_to_html_async(self, parsed_template: BeautifulSoup, dir_name: str) -> bool :
+    async def write_json_async(self, data: dict, dir_name: str, file_name: str) -> bool:
+        """
+        Writes a dict as indented json into an output directory
+        :param dir_name: Directory name where the file will be saved (Only the name, not the full path)
+        :return: True if the file was saved successfully, False otherwise
+        """
+        output_dir = self.output_dir / dir_name
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(str(output_dir / file_name), "w", encoding="utf-8") as f:
+                await f.write(json.dumps(data, indent=2, ensure_ascii=False))
+            return True
+        except Exception as e:
+            logger.error("Unable to write %s: %s", file_name, e)
+            return False
+
+    async def write_resume_to_html_async(self, parsed_template: BeautifulSoup | str, dir_name: str) -> bool :
         """
-        Converts BeautifulSoup object into an html file and places its own directory based on the job posting and timestamp
-        :param parsed_template: BeautifulSoup object containing the parsed HTML template
+        Writes the resume html into its own directory based on the job posting and timestamp
+        :param parsed_template: rendered resume html string (or a BeautifulSoup object)
         :param dir_name: Directory name where the HTML file will be saved
         :return: True if the HTML file was saved successfully, False otherwise
         """ 
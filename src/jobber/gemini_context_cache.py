@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from google.genai import types
+    from google.genai.client import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeContextCache:
+    """
+    Manages Gemini explicit context caches holding the static part of the tailoring prompt
+    (instructions + resume payload), so each request only has to send the job description.
+    Caches are keyed by a hash of the model, instructions and resume content, reused across processes
+    through their display name, and have their TTL extended before they expire.
+    """
+    DISPLAY_NAME_PREFIX = "jobber-resume-"
+
+    def __init__(self, model: str, ttl_seconds: int = 3600, refresh_margin_seconds: int = 300):
+        """
+        :param model: Gemini model the cache is created for (caches are model specific)
+        :param ttl_seconds: lifetime of a server side cache
+        :param refresh_margin_seconds: extend the TTL once less than this much lifetime is left
+        """
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self._caches = {}  # content key -> CachedContent
+        self._unsupported = set()  # content keys the API refused to cache (e.g. below the minimum token count)
+
+    def _content_key(self, instructions: str, resume_payload: dict) -> str:
+        canonical = json.dumps([self.model, instructions, resume_payload], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+    def _is_fresh(self, cached: types.CachedContent) -> bool:
+        if cached.expire_time is None:
+            return False
+        return cached.expire_time - datetime.now(timezone.utc) > self.refresh_margin
+
+    @staticmethod
+    def _is_rejected(error: Exception) -> bool:
+        """:return: whether the API refused this content for good (400 INVALID_ARGUMENT, e.g. too few tokens to cache)"""
+        return getattr(error, "code", None) == 400 and getattr(error, "status", None) in (None, "INVALID_ARGUMENT")
+
+    async def _find_existing_async(self, client: AsyncClient, display_name: str) -> types.CachedContent | None:
+        """Looks for a cache created by an earlier process for the same resume content"""
+        async for cached in await client.caches.list():
+            if cached.display_name == display_name and cached.model and cached.model.endswith(self.model):
+                return cached
+        return None
+
+    async def _create_async(self, client: AsyncClient, display_name: str, instructions: str, resume_payload: dict) -> types.CachedContent:
+        from google.genai import types
+        return await client.caches.create(
+            model=self.model,
+            config=types.CreateCachedContentConfig(
+                display_name=display_name,
+                system_instruction=instructions,
+                contents=[types.Content(role="user", parts=[types.Part(text="Here is my experience:\n" + json.dumps(resume_payload))])],
+                ttl=f"{self.ttl_seconds}s",
+            ),
+        )
+
+    async def get_cache_name_async(self, client: AsyncClient, instructions: str, resume_payload: dict) -> str | None:
+        """
+        Returns the name of a live server side cache for this instructions + resume combination,
+        creating or refreshing it when needed
+
+        :param client: async Gemini client
+        :param instructions: static tailoring instructions (sent as the system instruction)
+        :param resume_payload: resume experience/skills payload
+        :return: cached content name to pass as GenerateContentConfig.cached_content, or None if caching isn't possible
+        """
+        from google.genai import errors  # already loaded along with the client
+        key = self._content_key(instructions, resume_payload)
+        if key in self._unsupported:
+            return None
+        display_name = self.DISPLAY_NAME_PREFIX + key
+        try:
+            cached = self._caches.get(key) or await self._find_existing_async(client, display_name)
+            if cached and not self._is_fresh(cached):
+                cached = await self._refresh_async(client, cached)
+            if cached is None:
+                cached = await self._create_async(client, display_name, instructions, resume_payload)
+                token_count = cached.usage_metadata.total_token_count if cached.usage_metadata else "?"
+                logger.info(f"Created Gemini context cache {cached.name} ({token_count} tokens)")
+        except errors.ClientError as e:
+            if not self._is_rejected(e):
+                # Rate limits and other transient client errors only skip the cache for this call
+                logger.warning(f"Could not set up Gemini context cache, sending the full prompt instead: {e}")
+                self._caches.pop(key, None)
+                return None
+            # The resume is below the model's minimum cacheable token count, so don't keep retrying
+            logger.warning(f"Gemini context caching unavailable, sending the full prompt instead: {e}")
+            self._unsupported.add(key)
+            return None
+        except Exception as e:
+            logger.warning(f"Could not set up Gemini context cache, sending the full prompt instead: {e}")
+            self._caches.pop(key, None)
+            return None
+        self._caches[key] = cached
+        return cached.name
+
+    async def _refresh_async(self, client: AsyncClient, cached: types.CachedContent) -> types.CachedContent | None:
+        """
+        Extends the TTL of a cache that is about to expire
+
+        :return: the refreshed cache, or None if it already expired and has to be recreated
+        """
+        from google.genai import errors, types
+        logger.info(f"Refreshing Gemini context cache {cached.name} before it expires")
+        try:
+            return await client.caches.update(
+                name=cached.name,
+                config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s"),
+            )
+        except errors.ClientError as e:
+            logger.info(f"Could not refresh Gemini context cache {cached.name}, recreating it: {e}")
+            return None
@@ -1,61 +1,119 @@
 import keyboard
 import pyperclip
 import asyncio
+import json
 import time
-import pygetwindow as gw
-import pyautogui
 
-import threading
-from resume_tailor import ResumeTailor
-from file_handler import FileHandler
+from daemon_client import CONFIG_PATH, DaemonClient, DaemonError
+from job_queue import JobQueue, QueuedJob
+
+STATUS_ICONS = {"queued": "📥", "running": "⏳", "done": "✅", "failed": "❌"}
 
-"TODO: Add a delay inbetween hotkey presses to prevent accidental double-triggering"
 
 class HotkeyListener:
-    def __init__(self):
+    """
+    Listens for global hotkeys without polling. The keyboard hook thread only posts (hotkey, time) events to the
+    event loop through a thread-safe call, the loop then debounces repeated presses and runs the handlers.
+    Tailoring jobs go through a bounded JobQueue with a single worker, so rapid presses never block the hook thread
+    and run in the order they were pressed.
+    The listener is a thin client: the jobs are sent to the Jobber daemon (started on demand), which keeps the resume,
+    template, LLM client and browsers warm, so a hotkey press only waits for the scrape, LLM call and render.
+    """
+    def __init__(self, debounce_seconds: float = 0.5, max_queued: int = 5):
+        """
+        :param debounce_seconds: presses of the same hotkey within this window of the last accepted one are ignored
+        :param max_queued: jobs allowed to wait behind the running one, further presses are dropped
+        """
         self.hotkeys = {}  # Filled in after loading config
-        self.rt = None
-        self.running = True
-        self.loop = asyncio.get_event_loop()
-        self.f_handler = FileHandler()
+        self.client = DaemonClient()
+        self.daemon_ready = False
+        self.debounce_seconds = debounce_seconds
+        self.jobs = JobQueue(maxsize=max_queued, workers=1, on_status=self._print_job_status)
+        self.loop = None
+        self.events = None  # asyncio.Queue of (hotkey, press time), None means stop
+        self._last_press = {}
 
         self.prev_clipboard_content = None
 
     @classmethod
-    async def create(cls):
-        instance = cls()
-        jackie_resume = await instance.f_handler.load_resume_data_async("jackie_ling_data.json")
-        resume_template = await instance.f_handler.load_resume_template_async("default_template.html")
-        instance.rt = await ResumeTailor.set_scraper(jackie_resume, resume_template)
+    async def create(cls, debounce_seconds: float = 0.5, max_queued: int = 5):
+        instance = cls(debounce_seconds, max_queued)
+        print("Connecting to the Jobber daemon...")
+        instance.daemon_ready = await asyncio.to_thread(instance.client.start)
+        if not instance.daemon_ready:
+            print(f"⚠️ Jobber daemon is not answering on {instance.client.host}:{instance.client.port}, start it with: python src/jobber/daemon.py")
 
-        hotkey_map = await instance.f_handler.load_hotkey_config_async()
+        hotkey_map = json.loads((CONFIG_PATH.parent / 'hotkeys_config.json').read_text(encoding="utf-8"))
         instance.hotkeys = {
             combo: getattr(instance, method_name, instance.unsupported_hotkey_handler)
             for combo, method_name in hotkey_map.items()
         }
         return instance
 
+    def _post_event(self, event):
+        """Runs on the keyboard hook thread, so it only hands the event over to the loop"""
+        self.loop.call_soon_threadsafe(self.events.put_nowait, event)
+
+    def _on_press(self, combo: str):
+        self._post_event((combo, time.monotonic()))
+
+    def _is_debounced(self, combo: str, pressed_at: float) -> bool:
+        """:return: True if the press came too soon after the last accepted press of the same hotkey"""
+        last = self._last_press.get(combo)
+        if last is not None and pressed_at - last < self.debounce_seconds:
+            return True
+        self._last_press[combo] = pressed_at
+        return False
+
     async def listen(self):
+        self.loop = asyncio.get_running_loop()
+        self.events = asyncio.Queue()
         print("🎧 Hotkeys active:")
         for combo in self.hotkeys:
             print(f"  - {combo}")
-            keyboard.add_hotkey(combo, self.hotkeys[combo])
+            keyboard.add_hotkey(combo, self._on_press, args=(combo,))
         keyboard.add_hotkey('esc', self.stop)
 
-        while self.running:
-            await asyncio.sleep(0.1)
+        try:
+            while (event := await self.events.get()) is not None:
+                combo, pressed_at = event
+                if self._is_debounced(combo, pressed_at):
+                    continue
+                await self.hotkeys[combo]()
+        finally:
+            keyboard.unhook_all_hotkeys()
+            if self.jobs.running or self.jobs.waiting:
+                print("Waiting for queued jobs to finish...")
+            await self.jobs.close()
 
     def stop(self):
+        """Stops the listener, safe to call from any thread"""
         print("Stopping listener.")
-        self.running = False
-        keyboard.unhook_all_hotkeys()
+        if self.loop is not None:
+            self._post_event(None)
+
+    def _print_job_status(self, job: QueuedJob):
+        message = f"{STATUS_ICONS[job.status]} [{job.id}] {job.name}: {job.status}"
+        if job.status == "queued":
+            message += f" ({len(self.jobs.waiting) + len(self.jobs.running) - 1} ahead)"
+        elif job.finished is not None:
+            message += f" in {job.finished - job.started:.1f}s" + (f" ({job.error})" if job.error else "")
+        print(message)
 
-    def getClipboardContent(self):
+    def _submit(self, name: str, factory, key=None):
+        if self.jobs.submit(name, factory, key) is None:
+            print(f"⚠️ Skipped '{name}': already queued or the queue is full")
+
+    async def get_clipboard_content_async(self) -> str | None:
+        """
+        Copies the current selection and returns it
+        :return: clipboard content, None if it has not changed since the last call
+        """
         keyboard.release('ctrl')
         keyboard.release('alt')
         keyboard.send('ctrl+c')
-        time.sleep(0.1)  # Slight delay to let clipboard catch up
-        clipboard_content = pyperclip.paste()
+        await asyncio.sleep(0.1)  # Slight delay to let clipboard catch up
+        clipboard_content = await asyncio.to_thread(pyperclip.paste)
         if self.prev_clipboard_content != clipboard_content:
             self.prev_clipboard_content = clipboard_content
             return clipboard_content
@@ -63,42 +121,63 @@ class HotkeyListener:
             print("Clipboard content has not changed, skipping...")
             return None
 
-    def on_tailor_resume_hotkey(self):
-        clipboard_content = self.getClipboardContent()
-        if(clipboard_content is None):
+    async def _send_async(self, request, *args) -> bool:
+        """
+        Runs a blocking DaemonClient call off the loop and prints where the result was saved
+        :return: True if the daemon finished the job successfully
+        """
+        try:
+            answer = await asyncio.to_thread(request, *args)
+        except (OSError, DaemonError) as e:
+            print(f"❌ Jobber daemon request failed: {e}")
+            return False
+        if answer["status"] != "done":
+            print(f"❌ Jobber daemon job failed: {answer['error'] or 'see the daemon log'}")
+            return False
+        print(f"📄 Saved {answer['result']['pdf_name']} to {answer['result']['output_dir']}")
+        return True
+
+    async def on_tailor_resume_hotkey(self):
+        clipboard_content = await self.get_clipboard_content_async()
+        if clipboard_content is None:
+            return
+        if not self.daemon_ready:
+            print("Jobber daemon not running.")
             return
         print("Tailoring resume for: ", clipboard_content)
-        if self.rt:
-            asyncio.run_coroutine_threadsafe(
-                self.rt.generate_tailored_resume_async(clipboard_content),
-                self.loop
-            )
-        else:
-            print("ResumeTailor not initialized.")
-    def on_alternative_tailor_resume_hotkey(self):
-       
-        clipboard_content = self.getClipboardContent()
-        
-        print("Tailoring resume for: ", pyperclip.paste())
-        if self.rt:
-            asyncio.run_coroutine_threadsafe(
-                self.rt.alternative_generate_tailored_resume_async(clipboard_content),
-                self.loop
-            )
-        else:
-            print("ResumeTailor not initialized.")
-    def on_save_pdf_hotkey(self):
-        print("Saving PDF...")
-        if self.rt:
-            asyncio.run_coroutine_threadsafe(
-                self.f_handler.generate_pdf_async(dir_name=self.rt.most_recent_output_dir,
-                                                    output_name=self.rt.resume_pdf_file_name),
-                self.loop
-            )
-        else:
-            print("Unable to save pdf: ResumeTailor not initialized.")
+        self._submit(f"Tailor {clipboard_content}", lambda: self._send_async(self.client.tailor, clipboard_content),
+                     key=("tailor", clipboard_content))
 
-        
+    async def on_alternative_tailor_resume_hotkey(self):
+        clipboard_content = await self.get_clipboard_content_async()
+        if clipboard_content is None:
+            return
+        if not self.daemon_ready:
+            print("Jobber daemon not running.")
+            return
+        print("Tailoring resume for: ", clipboard_content[:80])
+        self._submit("Tailor copied job description", lambda: self._send_async(self.client.tailor_description, clipboard_content),
+                     key=("alternative", clipboard_content))
+
+    async def on_save_pdf_hotkey(self):
+        if not self.daemon_ready:
+            print("Unable to save pdf: Jobber daemon not running.")
+            return
+        # Jobs run in order, so a save queued behind a tailoring job saves that job's resume
+        self._submit("Save PDF", lambda: self._send_async(self.client.save_pdf), key="save_pdf")
 
-    def unsupported_hotkey_handler(self):
+    async def unsupported_hotkey_handler(self):
         print("⚠️ This hotkey is mapped to an undefined handler.")
+
+
+async def main():
+    listener = await HotkeyListener.create()
+    try:
+        await listener.listen()
+    except KeyboardInterrupt:
+        print("👋 Interrupted by user.")
+        listener.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,35 +1,78 @@
+from __future__ import annotations
+
 import asyncio
-import re
 import logging
-from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from timing import log
+from tracing import span
 from file_handler import FileHandler
+from browser_pool import BrowserPool
+from posting_cache import PostingCache
+from static_fetcher import StaticPostingFetcher
+from resource_blocker import ResourceBlocker
+from selector_registry import SelectorRegistry
+from company_extractor import CompanyNameExtractor
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 # api_key = os.getenv("GEMINI_API_KEY")
 logger = logging.getLogger(__name__)
 
 "TODO: Account for iframes in job postings"
 
-patterns = [
-        r"At\s+([A-Z][\w\s&\-]+?)(?:,|\s|$)",
-        r"Join the team at ([A-Z][\w&\-\s]+?)\b",
-        r"([A-Z][\w&\-\s]+?) is a (?:leading|fast-growing|well-known|top-tier|global|premier|renowned|innovative|dynamic|reputable|established|trusted)",
-        r"([A-Z][\w&\-\s]+?) is an equal opportunity employer",
-        r"([A-Z][\w&\-\s]+?) is looking for",
-    ]
+
+@lru_cache(maxsize=None)
+def company_name_extractor() -> CompanyNameExtractor:
+    """Shared extractor, built on first use so importing this module stays cheap"""
+    return CompanyNameExtractor()
+
+
+# Evaluated once per frame: tries every candidate selector for every field in priority order
+# and returns the first non-empty match per field, so all fields cost a single round trip
+EXTRACT_FIELDS_SCRIPT = """
+(fields) => {
+    const results = {};
+    for (const [field, selectors] of Object.entries(fields)) {
+        results[field] = null;
+        for (const selector of selectors) {
+            let el = null;
+            try {
+                el = document.querySelector(selector);
+            } catch (e) {
+                continue;  // invalid selector
+            }
+            const text = el && el.textContent ? el.textContent.trim() : "";
+            if (text) {
+                results[field] = {selector: selector, text: text};
+                break;
+            }
+        }
+    }
+    return results;
+}
+"""
+
+# Fields the scrape can't succeed without. Extraction keeps polling until these match (or it times out)
+REQUIRED_FIELDS = ("job_desc",)
 
 class JobPostScraper:
     """
     Used to scrapes job postings from various job sites using Playwright
     """
+    # Which path (cache / static / browser) served each domain and how long it took, shared across instances
+    fetch_path_stats = defaultdict(lambda: defaultdict(lambda: {"count": 0, "seconds": 0.0}))
+
     def __init__(self):
         self.job_title = "n-a"
         self.job_location = "n-a"
         self.job_salary = "n-a"
         self.job_description = "n-a"
         self.company_name = "n-a"
+        self.last_resource_stats = None  # blocked/loaded request counts from the last browser scrape
         
     @classmethod
     async def fetch_configs(cls):
@@ -38,82 +81,91 @@ class JobPostScraper:
         """
         instance = cls()
         instance.f_handler = FileHandler()
-        instance.job_app_selector_dict = await instance.f_handler.load_job_app_selectors_async() # loads json containing a repository of site element selectors
+        instance.selector_registry = await SelectorRegistry.shared_async() # validated repository of site element selectors, loaded once per process
+        instance.posting_cache = PostingCache(instance.f_handler.cache_dir / "postings.sqlite3")
+        instance.static_fetcher = StaticPostingFetcher()
+        instance.scrape_profiles = await instance.f_handler.load_scrape_profiles_async() or {}
         return instance
-    
-    async def _extract_job_data(self, page: Page, selector_list: list) -> str:
-        contexts = [page]
-        frame_elements = await page.locator("iframe").all()
 
-        for frame_el in frame_elements:
-            try:
-                content_frame = await frame_el.content_frame()
-                if content_frame:
-                    contexts.append(content_frame)
-            except Exception as e:
-                logger.debug(f"⚠️ Could not get content frame: {e}")
+    async def refresh_configs_async(self):
+        """
+        Picks up edits to job_app_selectors.json and scrape_profiles.json, only costs two stats when nothing changed.
+        Clones made afterwards share the refreshed configs
+        """
+        self.selector_registry = await SelectorRegistry.shared_async()
+        self.scrape_profiles = await self.f_handler.load_scrape_profiles_async() or {}
+
+    def clone(self) -> "JobPostScraper":
+        """
+        Creates a new scraper that shares the loaded selector configs but has its own job fields,
+        so multiple postings can be scraped concurrently
+        """
+        instance = JobPostScraper()
+        instance.f_handler = self.f_handler
+        instance.selector_registry = self.selector_registry
+        instance.posting_cache = self.posting_cache
+        instance.static_fetcher = self.static_fetcher
+        instance.scrape_profiles = self.scrape_profiles
+        return instance
+    
+    async def _extract_all_job_data(self, page: Page, selector_dict: dict, timeout: float = 5.0, poll_interval: float = 0.25) -> dict:
+        """
+        Extracts every field at once by evaluating EXTRACT_FIELDS_SCRIPT in the main page and each iframe.
+        Main page matches win over iframe matches. Only polls (up to timeout) while a required field has no match yet.
+
+        :param page: playwright page
+        :param selector_dict: {field: [selectors in priority order]} for the posting's domain
+        :param timeout: max seconds to wait for the required fields to show up
+        :param poll_interval: seconds between re-evaluations while waiting
+        :return: {field: text} with "n-a" for fields that never matched
+        """
+        fields = {
+            field: [selector for selector in selectors if selector.strip()]
+            for field, selectors in selector_dict.items()
+            if isinstance(selectors, list)
+        }
+        fields = {field: selectors for field, selectors in fields.items() if selectors}
+        found = {}
+        deadline = asyncio.get_running_loop().time() + timeout
+        with span("selector_match", source="browser", frames=len(page.frames)) as match_span:
+            polls = await self._poll_job_data(page, fields, found, deadline, poll_interval)
+            match_span.tag(polls=polls, matched=len(found))
+
+        for field in fields:
+            if field not in found:
+                logger.warning(f"No selectors yielded results for {field} (including iframes)")
+        return {field: found.get(field, "n-a") for field in selector_dict}
+
+    async def _poll_job_data(self, page: Page, fields: dict, found: dict, deadline: float, poll_interval: float) -> int:
+        """
+        Fills found with {field: text} until every required field has matched or the deadline passes
 
-        async def try_selectors_in_context(context):
-            for selector in selector_list:
+        :return: number of times the selectors were evaluated
+        """
+        polls = 0
+        while True:
+            polls += 1
+            pending = {field: selectors for field, selectors in fields.items() if field not in found}
+            for frame in page.frames:
+                if not pending:
+                    break
                 try:
-                    el = context.locator(selector).first
-                    await el.wait_for(timeout=3000)
-                    text = await el.text_content()
-                    if text and text.strip():
-                        text = text.replace('\n', ' ').replace('\r', '')
-                        logger.debug(f"Selector: {selector} matched in {'iframe' if context != page else 'main page'} → {self._limit_string_with_ellipsis(text)}")
-                        return text.strip()
+                    results = await frame.evaluate(EXTRACT_FIELDS_SCRIPT, pending)
                 except Exception as e:
-                    logger.debug(f"Selector failed in {'iframe' if context != page else 'main page'}: {selector} → {e}")
-            return None
+                    logger.debug(f"Could not evaluate selectors in frame {frame.url}: {e}")
+                    continue
+                for field, match in results.items():
+                    if match and field not in found:
+                        text = match["text"].replace('\n', ' ').replace('\r', '').strip()
+                        logger.debug(f"Selector: {match['selector']} matched {field} in {'main page' if frame == page.main_frame else 'iframe'} → {self._limit_string_with_ellipsis(text)}")
+                        found[field] = text
+                        pending.pop(field, None)
+
+            missing_required = [field for field in REQUIRED_FIELDS if field in fields and field not in found]
+            if not missing_required or asyncio.get_running_loop().time() >= deadline:
+                return polls
+            await asyncio.sleep(poll_interval)
 
-        results = await asyncio.gather(*[try_selectors_in_context(ctx) for ctx in contexts])
-        for result in results:
-            if result:
-                return result
-
-        logger.warning("No selectors yielded results (including iframes)")
-        return "n-a"
-
-    # async def _extract_job_data(self, page: Page, selector_list: list) -> str:
-    #     """
-    #     Tries selectors on the main page and then inside any iframe, returning first valid text match.
-
-    #     :param page: playwright page
-    #     :param selector_list: list of possible selectors for an element
-    #     :return: innerHTML in the form of a string
-    #     """
-    #     contexts = [page]
-
-    #     # Try adding iframe content frames if any
-    #     frame_elements = await page.locator("iframe").all()
-    #     for frame_el in frame_elements:
-    #         try:
-    #             content_frame = await frame_el.content_frame()
-    #             if content_frame:
-    #                 contexts.append(content_frame)
-    #         except Exception as e:
-    #             logger.debug(f"⚠️ Could not get content frame: {e}")
-
-    #     for context in contexts:
-    #         for selector in selector_list:
-    #             try:
-    #                 html = await context.content()
-    #                 logger.debug(f"🔍 DOM snapshot for selector '{selector}': {html[:300]}...")
-
-    #                 el = context.locator(selector).first
-    #                 await el.wait_for(timeout=3000)
-    #                 text = await el.text_content()
-    #                 if text and text.strip():
-    #                     text = text.replace('\n', ' ').replace('\r', '')
-    #                     logger.debug(f"Selector: {selector} matched in {'iframe' if context != page else 'main page'} → {self._limit_string_with_ellipsis(text)}")
-    #                     return text.strip()
-    #             except Exception as e:
-    #                 logger.debug(f"Selector failed in {'iframe' if context != page else 'main page'}: {selector} → {e}")
-
-    #     logger.warning(f"No selectors yielded results (including iframes)")
-    #     return "n-a"
-    
     def _limit_string_with_ellipsis(self, s: str, max_length: int = 20) -> str:
         return s if len(s) <= max_length else s[:max_length - 3] + "..."
     
@@ -124,10 +176,7 @@ class JobPostScraper:
         :param url: site url
         :return: domain and extension (Example: "myworkdayjobs.com")
         """ 
-        for domain in self.job_app_selector_dict:
-            if domain in url:
-                return domain
-        return "default"
+        return self.selector_registry.resolve(url)
     
     def _extract_company_name(self, text: str) -> str:
         """
@@ -136,61 +185,153 @@ class JobPostScraper:
         :param text: job description
         :return: company's name
         """ 
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(1).strip()
-        return "n-a"
+        return company_name_extractor().extract(text)
     
-    async def scrape_job_posting_async(self, url: str, max_retries: int = 3, delay: float = 2.0) -> bool:
+    def _load_posting(self, posting: dict):
+        self.job_title          = posting["job_title"]
+        self.job_location       = posting["job_location"]
+        self.job_description    = posting["job_description"]
+        self.company_name       = posting["company_name"]
+
+    def _dump_posting(self) -> dict:
+        return {
+            "job_title": self.job_title,
+            "job_location": self.job_location,
+            "job_description": self.job_description,
+            "company_name": self.company_name,
+        }
+
+    async def scrape_job_posting_async(self, url: str, max_retries: int = 3, delay: float = 2.0, force_refresh: bool = False) -> bool:
         """
         Grabs job information from url and save it into class instance variables 
+        Postings scraped within the cache TTL are served from the posting cache without touching the network
 
         :param url: sef explanatory
         :max_retries: # of retries to open url
         :delay: delay in seconds bewteen retries
+        :force_refresh: ignore the posting cache and scrape the url again
         :return: True if successful
         """ 
-        for attempt in range(1, max_retries + 1):
-            browser = None
-            try:
-                async with async_playwright() as p:
-                    browser = await p.chromium.launch(headless=False)
-                    page = await browser.new_page()
-                    await page.goto(url, timeout=10000)
+        domain_key = self._get_domain_key(url)
+        with span("scrape", domain=domain_key, force_refresh=force_refresh) as scrape_span:
+            path = await self._scrape_job_posting_async(url, domain_key, max_retries, delay, force_refresh)
+            scrape_span.tag(path=path, cache_hit=path == "cache")
+        return path is not None
 
-                    selector_list = self.job_app_selector_dict.get(self._get_domain_key(url))
+    async def _scrape_job_posting_async(self, url: str, domain_key: str, max_retries: int, delay: float, force_refresh: bool) -> str | None:
+        """
+        :return: which path served the posting ("cache", "static" or "browser"), or None if scraping failed
+        """
+        start = time.perf_counter()
+        if not force_refresh:
+            cached = await self.posting_cache.get_async(url)
+            if cached:
+                logger.info(f"Posting cache hit for {url}")
+                self._load_posting(cached)
+                self._record_fetch_path(domain_key, "cache", start)
+                return "cache"
+
+        selector_list = self.selector_registry.get(domain_key)
+        if not selector_list:
+            logger.error(f"No selector list found")
+            return None
 
-                    if not selector_list:
-                        logger.error(f"No selector list found")
-                        return False
+        if not selector_list.get("needs_js"):
+            job_data = await self.static_fetcher.fetch_async(url, self.selector_registry.get_compiled(domain_key))
+            # Anything missing from the initial HTML may still be rendered by scripts, so only a complete match is kept
+            missing = self._missing_fields(job_data, selector_list) if job_data else ["page"]
+            if not missing and self._apply_job_data(job_data):
+                logger.info(f"Scraped {url} from static HTML, no browser needed")
+                self._record_fetch_path(domain_key, "static", start)
+                await self.posting_cache.put_async(url, self._dump_posting())
+                return "static"
+            logger.debug(f"Static HTML for {url} was missing {', '.join(missing)}, falling back to the browser")
+
+        profile = self._get_scrape_profile(domain_key)
+        if await self._scrape_with_browser_async(url, selector_list, profile, max_retries, delay):
+            self._record_fetch_path(domain_key, "browser", start)
+            await self.posting_cache.put_async(url, self._dump_posting())
+            return "browser"
+        return None
+
+    def _apply_job_data(self, job_data: dict) -> bool:
+        """
+        Saves extracted fields into the instance variables
 
-                    job_title_task = self._extract_job_data(page, selector_list["job_title"])
-                    location_task  = self._extract_job_data(page, selector_list["job_loc"])
-                    desc_task      = self._extract_job_data(page, selector_list["job_desc"])
+        :param job_data: {field: text} from one of the extractors
+        :return: False (leaving the description untouched) if no job description was found
+        """
+        if job_data.get("job_desc", "n-a") == "n-a":
+            return False
+        self.job_title          = job_data.get("job_title", "n-a")
+        self.job_location       = job_data.get("job_loc", "n-a")
+        self.job_description    = job_data["job_desc"]
+        # Domains like linkedin.com have a selector for the company name, which beats guessing from the description
+        selected_company = job_data.get("company_name", "n-a")
+        self.company_name       = selected_company if selected_company != "n-a" else self._extract_company_name(self.job_description)
+        return True
+
+    @staticmethod
+    def _missing_fields(job_data: dict, selector_dict: dict) -> list[str]:
+        """
+        :param job_data: {field: text} from one of the extractors
+        :param selector_dict: {field: [selectors]} for the posting's domain
+        :return: fields that have selectors configured but did not match
+        """
+        return [
+            field for field, selectors in selector_dict.items()
+            if isinstance(selectors, list) and selectors and job_data.get(field, "n-a") == "n-a"
+        ]
 
-                    job_title, job_location, job_description = await asyncio.gather(
-                        job_title_task, location_task, desc_task
-                    )
+    def _record_fetch_path(self, domain_key: str, path: str, start: float):
+        stats = self.fetch_path_stats[domain_key][path]
+        stats["count"] += 1
+        stats["seconds"] += time.perf_counter() - start
 
-                    self.job_title          = job_title
-                    self.job_location       = job_location
-                    if job_description == "n-a":
-                        return False
-                    self.job_description    = job_description
-                    self.company_name       = self._extract_company_name(self.job_description)
-                    return True
+    @classmethod
+    def fetch_path_summary(cls) -> dict:
+        """
+        :return: {domain: {path: {"count", "seconds"}}} showing how often the cache, static HTML or the browser served each domain
+        """
+        return {domain: {path: dict(stats) for path, stats in paths.items()} for domain, paths in cls.fetch_path_stats.items()}
+
+    def _get_scrape_profile(self, domain_key: str) -> dict:
+        """
+        :param domain_key: key from _get_domain_key
+        :return: the default scrape profile with the domain's overrides applied
+        """
+        profile = {"headless": True, "wait_until": "domcontentloaded", "goto_timeout_ms": 10000}
+        profile.update(self.scrape_profiles.get("default", {}))
+        profile.update(self.scrape_profiles.get(domain_key, {}))
+        return profile
+
+    async def _scrape_with_browser_async(self, url: str, selector_list: dict, profile: dict, max_retries: int, delay: float) -> bool:
+        """
+        Scrapes the posting on a pooled page. Requests listed in the scrape profile's blocklists are aborted and
+        navigation only waits for DOMContentLoaded, _extract_all_job_data then waits for the description selector itself.
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        pool = BrowserPool.shared(headless=profile["headless"])
+        for attempt in range(1, max_retries + 1):
+            try:
+                with span("scrape.browser", attempt=attempt, headless=profile["headless"]) as attempt_span:
+                    async with pool.lease() as page:
+                        blocker = ResourceBlocker(profile)
+                        await blocker.install_async(page)
+                        try:
+                            await page.goto(url, wait_until=profile["wait_until"], timeout=profile["goto_timeout_ms"])
+                            job_data = await self._extract_all_job_data(page, selector_list)
+                        finally:
+                            await blocker.remove_async(page)
+                            self.last_resource_stats = blocker.stats
+                            attempt_span.tag(blocked_requests=blocker.stats["blocked_requests"])
+                            logger.info(f"Resources for {url}: {blocker.stats}")
+                        return self._apply_job_data(job_data)
 
             except PlaywrightTimeoutError:
                 logger.warning(f"Timeout while navigating to {url} on attempt {attempt}")
             except Exception as e:
                 logger.exception(f"Unexpected error while scraping {url} on attempt {attempt}: {e}")
-            finally:
-                if browser:
-                    try:
-                        await browser.close()
-                    except Exception:
-                        logger.warning("Failed to close browser cleanly")
 
             await asyncio.sleep(delay)
 
@@ -0,0 +1,159 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+_job_ids = itertools.count(1)
+
+
+@dataclass(eq=False)
+class QueuedJob:
+    """A unit of work submitted to a JobQueue and its status"""
+    name: str
+    factory: Callable[[], Awaitable[Any]] = field(repr=False)
+    key: Hashable = None
+    id: int = field(default_factory=lambda: next(_job_ids))
+    status: str = "queued"  # queued, running, done, failed
+    result: Any = None
+    error: str | None = None
+    submitted: float = field(default_factory=time.perf_counter)
+    started: float | None = None
+    finished: float | None = None
+    _done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    async def wait(self) -> "QueuedJob":
+        """Waits until the job has run"""
+        await self._done.wait()
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "error": self.error,
+            "waited_s": round((self.started or time.perf_counter()) - self.submitted, 3),
+            "ran_s": round(self.finished - self.started, 3) if self.finished else None,
+        }
+
+
+class JobQueue:
+    """
+    Bounded queue of jobs run by a fixed number of workers (1 by default, so jobs that share a ResumeTailor run one at a time).
+    submit() never blocks: when the queue is full, or a job with the same key is already waiting, the job is rejected instead.
+    Every status change is reported to on_status, so callers can show progress.
+    """
+    def __init__(self, maxsize: int = 5, workers: int = 1, on_status: Callable[[QueuedJob], None] = None, history: int = 50):
+        """
+        :param maxsize: max jobs waiting to run (the running ones not included)
+        :param workers: jobs run concurrently
+        :param on_status: called with the job whenever it is queued, starts running or finishes
+        :param history: finished jobs kept for status()
+        """
+        if workers < 1:
+            raise ValueError(f"JobQueue needs at least 1 worker, got {workers}")
+        self.maxsize = maxsize
+        self.workers = workers
+        self.on_status = on_status
+        self.waiting = deque()
+        self.running = []
+        self.finished = deque(maxlen=history)
+        self._available = None  # counts the waiting jobs, created with the workers since it needs the running loop
+        self._tasks = []
+
+    def _notify(self, job: QueuedJob):
+        if self.on_status is None:
+            return
+        try:
+            self.on_status(job)
+        except Exception as e:
+            logger.warning(f"Job status callback failed: {e}")
+
+    def _start_workers(self):
+        if not self._tasks:
+            self._available = asyncio.Semaphore(0)
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def submit(self, name: str, factory: Callable[[], Awaitable[Any]], key: Hashable = None) -> QueuedJob | None:
+        """
+        Queues a job, must be called from the event loop
+
+        :param name: description shown in status updates
+        :param factory: returns the coroutine to run, called only once the job starts
+        (so it sees the state left by earlier jobs, Example: the most recent output dir)
+        :param key: jobs with a key already waiting or running are rejected as duplicates
+        :return: the queued job, or None if it was rejected
+        """
+        if key is not None and any(job.key == key for job in itertools.chain(self.waiting, self.running)):
+            logger.info(f"'{name}' is already queued, skipping")
+            return None
+        if len(self.waiting) >= self.maxsize:
+            logger.warning(f"Job queue is full ({self.maxsize} waiting), dropping '{name}'")
+            return None
+        self._start_workers()
+        job = QueuedJob(name, factory, key)
+        self.waiting.append(job)
+        self._notify(job)
+        self._available.release()
+        return job
+
+    async def _worker(self):
+        while True:
+            await self._available.acquire()
+            await self._run(self.waiting.popleft())
+
+    async def _run(self, job: QueuedJob):
+        job.status = "running"
+        job.started = time.perf_counter()
+        self.running.append(job)
+        self._notify(job)
+        try:
+            job.result = await job.factory()
+            job.status = "failed" if job.result is False else "done"
+        except asyncio.CancelledError:
+            job.status, job.error = "failed", "cancelled"
+            raise
+        except Exception as e:
+            logger.exception(f"Job '{job.name}' failed")
+            job.status, job.error = "failed", f"{type(e).__name__}: {e}"
+        finally:
+            job.finished = time.perf_counter()
+            self.running.remove(job)
+            self.finished.append(job)
+            job._done.set()
+            self._notify(job)
+
+    def status(self) -> dict:
+        """:return: running, waiting and recently finished jobs as dicts"""
+        return {
+            "running": [job.to_dict() for job in self.running],
+            "waiting": [job.to_dict() for job in self.waiting],
+            "finished": [job.to_dict() for job in reversed(self.finished)],
+        }
+
+    async def join(self):
+        """Waits until every submitted job has run"""
+        while self.waiting or self.running:
+            await (self.running or self.waiting)[0].wait()
+
+    async def close(self, wait: bool = True):
+        """
+        Stops the workers
+
+        :param wait: let the submitted jobs finish first, otherwise they are cancelled
+        """
+        if wait:
+            await self.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self.waiting:
+            job.status, job.error = "failed", "cancelled"
+            job._done.set()
+        self.waiting.clear()
@@ -1,39 +1,205 @@
 import argparse
+import logging
+import sys
+import time
 from pathlib import Path
 from datetime import datetime
-from job_post_scraper import JobPostScraper
-from resume_tailor import ResumeTailor
-from file_handler import FileHandler
+from daemon_client import DaemonClient, DaemonError, load_daemon_config
 import asyncio
 
 class JobberCLI:
     def __init__(self):
         self.parser = argparse.ArgumentParser(
-            description="Tailor a resume based on a job posting URL"
+            description="Tailor a resume based on one or more job posting URLs"
         )
         self._add_arguments()
 
     async def setup(self):
+        # Imported here so that handing the urls to a running daemon doesn't pay for google-genai, Playwright and bs4
+        from resume_tailor import ResumeTailor
+        from file_handler import FileHandler
         self.f_handler = FileHandler()
-        resume_data = self.f_handler.load_resume_data("jackie_ling_data.json")
-        resume_template = self.f_handler.load_resume_template("default_template.html")
-        self.r_tailor = ResumeTailor(resume_data, resume_template)
+        resume_data = await self.f_handler.load_resume_data_async("jackie_ling_data.json")
+        resume_template = await self.f_handler.load_resume_template_async("default_resume_template.html")
+        self.r_tailor = await ResumeTailor.set_scraper(resume_data, resume_template)
 
 
     def _add_arguments(self):
-        self.parser.add_argument("url", help="Job post url")
+        self.parser.add_argument("urls", nargs="*", help="Job post url(s)")
         self.parser.add_argument("--output-dir", help="Output directory")
-        
+        self.parser.add_argument("-f", "--file", help="File with one job post url per line ('-' reads from stdin)")
+        self.parser.add_argument("--refresh", action="store_true", help="Re-scrape postings even if they are cached")
+        self.parser.add_argument("--max-scrapes", type=int, default=4, help="Max job postings scraped at the same time in batch mode")
+        self.parser.add_argument("--max-llm-calls", type=int, default=2, help="Max LLM requests in flight at the same time in batch mode")
+        self.parser.add_argument("--max-renders", type=int, default=2, help="Max PDFs rendered at the same time in batch mode")
+        self.parser.add_argument("--no-html", action="store_true", help="Only save the PDF, skip writing resume_wip.html")
+        self.parser.add_argument("--fit-page", action="store_true", help="Shrink/trim each resume until it fits on one page")
+        self.parser.add_argument("--no-reuse", action="store_true", help="Tailor postings again even if a near-duplicate was already tailored")
+        self.parser.add_argument("--trace", metavar="FILE", help="Append a JSON line per timed span (scrape, llm_call, pdf...) to FILE")
+        self.parser.add_argument("--no-daemon", action="store_true", help="Tailor in this process even if a Jobber daemon is running")
+        self.parser.add_argument("--start-daemon", action="store_true", help="Start a background Jobber daemon if none is running and send the urls to it")
+        history = self.parser.add_argument_group("application history", "List earlier runs instead of tailoring")
+        history.add_argument("--history", nargs="?", type=int, const=10, metavar="N", help="Show the N most recent matching runs (default 10)")
+        history.add_argument("--company", help="Only runs for companies starting with this (case-insensitive)")
+        history.add_argument("--title", help="Only runs whose job title contains this (case-insensitive)")
+        history.add_argument("--since", help="Only runs on or after this date, Example: 2025-07-01")
+        history.add_argument("--until", help="Only runs before this date")
+        history.add_argument("--import-outputs", action="store_true", help="Index output directories created before the history existed")
+
+    def _read_urls(self, args) -> list[str]:
+        """
+        Collects urls from the positional arguments and the --file option (or stdin).
+        Blank lines and lines starting with '#' are ignored, duplicates are dropped.
+        """
+        lines = list(args.urls)
+        if args.file == "-":
+            lines.extend(sys.stdin.read().splitlines())
+        elif args.file:
+            lines.extend(Path(args.file).read_text(encoding="utf-8").splitlines())
+
+        urls = []
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#") and line not in urls:
+                urls.append(line)
+        return urls
+
+    async def run_batch(self, urls: list[str], args) -> dict:
+        """
+        Tailors every url concurrently, printing each result as it finishes and a summary at the end
+
+        :return: summary dict (see BatchRunner.summarize)
+        """
+        from batch_runner import BatchRunner
+        from job_post_scraper import JobPostScraper
+        runner = BatchRunner(self.r_tailor, args.max_scrapes, args.max_llm_calls, args.max_renders)
+        results = []
+        start = time.perf_counter()
+        async for result in runner.run(urls, force_refresh=args.refresh):
+            results.append(result)
+            status = "✅" if result.success else "❌"
+            detail = result.output_dir if result.success else f"{result.stage}: {result.error}"
+            if result.fit_iterations is not None:
+                detail += f" (fit in {result.fit_iterations} iterations)"
+            if result.duplicate_of:
+                detail += f" (reused, near-duplicate of {result.duplicate_of})"
+            print(f"[{len(results)}/{len(urls)}] {status} {result.url} ({result.elapsed:.1f}s) {detail}")
+
+        summary = BatchRunner.summarize(results, time.perf_counter() - start)
+        print(f"Done: {summary['succeeded']}/{summary['total']} succeeded in {summary['elapsed_seconds']}s "
+              f"({summary['jobs_per_minute']} jobs/min, avg {summary['avg_job_seconds']}s per job)")
+        print("  Avg seconds per stage: " + ", ".join(f"{stage} {seconds}s" for stage, seconds in summary["avg_stage_seconds"].items()))
+        for url, error in summary["failures"].items():
+            print(f"  ❌ {url}: {error}")
+        for domain, paths in JobPostScraper.fetch_path_summary().items():
+            served = ", ".join(f"{path}: {stats['count']} ({stats['seconds']:.1f}s)" for path, stats in paths.items())
+            print(f"  {domain} served by {served}")
+        return summary
+
+    async def run_with_daemon(self, client: DaemonClient, urls: list[str], args) -> int:
+        """
+        Sends every url to a running daemon, which already has everything loaded, and prints each result as it finishes
+
+        :return: number of urls that were tailored successfully
+        """
+        if args.trace:
+            print("⚠️ --trace is ignored when a daemon tailors the resumes, start the daemon with --trace instead")
+        in_flight = asyncio.Semaphore(max(1, load_daemon_config()["max_queued"]))  # stay within the daemon's queue
+
+        async def send(url: str) -> tuple[str, dict | None, str | None]:
+            async with in_flight:
+                try:
+                    return url, await asyncio.to_thread(
+                        client.tailor, url, force_refresh=args.refresh, fit_page=args.fit_page, write_html=not args.no_html,
+                        reuse_duplicates=not args.no_reuse
+                    ), None
+                except (OSError, DaemonError) as e:
+                    return url, None, str(e)
+
+        succeeded = 0
+        start = time.perf_counter()
+        for done, finished in enumerate(asyncio.as_completed([send(url) for url in urls]), start=1):
+            url, answer, error = await finished
+            success = answer is not None and answer["status"] == "done"
+            succeeded += success
+            if success:
+                detail = answer["result"]["output_dir"]
+                if answer["result"].get("fit_iterations") is not None:
+                    detail += f" (fit in {answer['result']['fit_iterations']} iterations)"
+                if answer["result"].get("duplicate_of"):
+                    detail += f" (reused, near-duplicate of {answer['result']['duplicate_of']})"
+            else:
+                detail = error or answer["error"] or "failed"
+            ran = f" ({answer['ran_s']:.1f}s)" if answer and answer["ran_s"] is not None else ""
+            print(f"[{done}/{len(urls)}] {'✅' if success else '❌'} {url}{ran} {detail}")
+        print(f"Done: {succeeded}/{len(urls)} succeeded in {time.perf_counter() - start:.1f}s (daemon at {client.host}:{client.port})")
+        return succeeded
+
+    def show_history(self, args):
+        """Prints matching runs from the application history, most recent first"""
+        from application_history import ApplicationHistory, SUCCESS_STATUSES
+        from file_handler import FileHandler
+        f_handler = FileHandler()
+        history = ApplicationHistory(f_handler.history_db)
+        if args.import_outputs:
+            added = history.import_output_dirs(f_handler.output_dir, f_handler.parse_output_dir_name)
+            print(f"📥 Indexed {added} earlier output directories")
+        try:
+            runs = history.search(company=args.company, title=args.title, since=args.since, until=args.until, limit=args.history or 10)
+        except ValueError as e:
+            self.parser.error(f"Invalid date: {e}")
+        for run in runs:
+            when = datetime.fromtimestamp(run["created_at"]).strftime("%Y-%m-%d %H:%M")
+            status = "✅" if run["status"] in SUCCESS_STATUSES else "❌"
+            print(f"{when} {status} {run['company'] or 'n-a'} | {run['title'] or 'n-a'} | {run['output_dir'] or run['error'] or '-'} | {run['url'] or 'copied description'}")
+        if not runs:
+            print("No matching runs")
 
     async def run(self):
         args = self.parser.parse_args()
+        if args.history is not None or args.import_outputs or any((args.company, args.title, args.since, args.until)):
+            self.show_history(args)
+            return
+        urls = self._read_urls(args)
+        if not urls:
+            self.parser.error("No job post urls given")
+        if not args.no_daemon:
+            client = DaemonClient()
+            if args.start_daemon:
+                print("Starting Jobber daemon...")
+                if not await asyncio.to_thread(client.start):
+                    print("⚠️ The daemon did not come up, tailoring in this process instead")
+            if await asyncio.to_thread(client.is_running):
+                await self.run_with_daemon(client, urls, args)
+                return
+
+        from browser_pool import BrowserPool
+        from tracing import Tracer, JsonLinesSink
+        tracer = Tracer.shared()
+        if args.trace:
+            tracer.add_sink(JsonLinesSink(args.trace))
+        from stage_limits import StageLimits
         await self.setup()
-        await self.r_tailor.generate_tailored_resume_async(args.url)
+        self.r_tailor.limits = StageLimits(args.max_scrapes, args.max_llm_calls, args.max_renders)
+        self.r_tailor.write_html = not args.no_html
+        self.r_tailor.fit_to_page = args.fit_page
+        self.r_tailor.reuse_duplicates = not args.no_reuse
+        try:
+            if len(urls) == 1:
+                await self.r_tailor.generate_tailored_resume_async(urls[0], force_refresh=args.refresh)
+            else:
+                await self.run_batch(urls, args)
+        finally:
+            await self.r_tailor.scraper.static_fetcher.close()
+            await BrowserPool.close_all()
+            tracer.close()
+            print(tracer.format_summary())
+
 
 
-        
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(JobberCLI().run())
-    # JobberCLI().run()
\ No newline at end of file
+    # JobberCLI().run()
@@ -0,0 +1,221 @@
+import json
+import re
+import time
+from typing import Any, Callable
+
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.S)
+_SCALAR = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_SCALAR_TOKEN = re.compile(r"[^\s,\]}]*")
+_WHITESPACE = " \t\r\n"
+_FENCE = "```"
+
+
+class MalformedJSONError(ValueError):
+    """The streamed text can no longer turn into the expected JSON, so there is no point reading the rest"""
+
+
+class _Frame:
+    __slots__ = ("kind", "start", "path", "key", "index", "expect")
+
+    def __init__(self, kind: str, start: int, path: tuple):
+        self.kind = kind  # "{" or "["
+        self.start = start
+        self.path = path
+        self.key = None
+        self.index = 0
+        self.expect = "key_or_close" if kind == "{" else "value_or_close"
+
+
+class IncrementalJSONParser:
+    """
+    Parses a JSON document that arrives in chunks. Whenever an object or array whose path matches `watch`
+    is complete it is decoded and handed to on_value right away, without waiting for the rest of the text.
+    Structural errors raise MalformedJSONError as soon as they arrive. A ```json fence around the document is tolerated.
+    """
+    def __init__(self, on_value: Callable[[tuple, Any], None] = None, watch: Callable[[tuple], bool] = None):
+        """
+        :param on_value: called with (path, value) for every watched container once it closes,
+        path holds object keys and array indices (Example: ("work_experience", "experience_1"))
+        :param watch: decides which container paths are reported, defaults to none
+        """
+        self.on_value = on_value
+        self.watch = watch or (lambda path: False)
+        self.reset()
+
+    def reset(self):
+        """Forgets everything fed so far (Example: before a retry)"""
+        self.text = ""
+        self.pos = 0
+        self.stack = []
+        self.root_span = None
+
+    @property
+    def done(self) -> bool:
+        return self.root_span is not None
+
+    def feed(self, chunk: str):
+        """
+        :param chunk: next piece of the document
+        :raises MalformedJSONError: if the text so far can't be the start of a JSON document
+        """
+        self.text += chunk
+        while self.pos < len(self.text) and not self.done:
+            if not self._step():
+                return  # needs more text
+
+    def finish(self) -> Any:
+        """
+        :return: the fully decoded document
+        :raises MalformedJSONError: if the document is incomplete or invalid
+        """
+        if not self.done:
+            raise MalformedJSONError("Response ended before the JSON document was complete")
+        start, end = self.root_span
+        try:
+            return json.loads(self.text[start:end])
+        except json.JSONDecodeError as e:
+            raise MalformedJSONError(f"Invalid JSON: {e}") from e
+
+    def _fail(self, message: str):
+        raise MalformedJSONError(f"{message} at character {self.pos}: {self.text[self.pos:self.pos + 20]!r}")
+
+    def _step(self) -> bool:
+        """Consumes one token, :return: False if the token is not complete yet"""
+        text, pos = self.text, self.pos
+        if text[pos] in _WHITESPACE:
+            self.pos += 1
+            return True
+        if not self.stack:
+            return self._start_document()
+
+        frame, char = self.stack[-1], text[pos]
+        if frame.expect == "colon":
+            if char != ":":
+                self._fail("Expected ':'")
+            frame.expect = "value"
+            self.pos += 1
+            return True
+        if frame.expect == "comma_or_close":
+            if char == ",":
+                frame.expect = "key" if frame.kind == "{" else "value"
+                frame.index += frame.kind == "["
+                self.pos += 1
+                return True
+            return self._close(frame, char)
+        if frame.expect in ("key", "key_or_close"):
+            if char == "}" and frame.expect == "key_or_close":
+                return self._close(frame, char)
+            if char != '"':
+                self._fail("Expected an object key")
+            match = _STRING.match(text, pos)
+            if match is None:
+                return False
+            frame.key = json.loads(match.group(0))
+            frame.expect = "colon"
+            self.pos = match.end()
+            return True
+        # expecting a value
+        if char == "]" and frame.expect == "value_or_close":
+            return self._close(frame, char)
+        return self._value(frame, char)
+
+    def _start_document(self) -> bool:
+        text, pos = self.text, self.pos
+        if text.startswith(_FENCE, pos):
+            newline = text.find("\n", pos)
+            if newline == -1:
+                return False
+            self.pos = newline + 1
+            return True
+        if _FENCE.startswith(text[pos:]):
+            return False
+        if text[pos] not in "{[":
+            self._fail("Response does not start with a JSON object")
+        self.stack.append(_Frame(text[pos], pos, ()))
+        self.pos += 1
+        return True
+
+    def _value(self, frame: _Frame, char: str) -> bool:
+        text, pos = self.text, self.pos
+        path = frame.path + ((frame.key,) if frame.kind == "{" else (frame.index,))
+        if char in "{[":
+            frame.expect = "comma_or_close"
+            self.stack.append(_Frame(char, pos, path))
+            self.pos += 1
+            return True
+        if char == '"':
+            match = _STRING.match(text, pos)
+            if match is None:
+                return False
+            self.pos = match.end()
+        else:
+            # Numbers and literals are only complete once a delimiter follows them
+            token = _SCALAR_TOKEN.match(text, pos)
+            if token.end() == len(text):
+                return False
+            if not _SCALAR.fullmatch(token.group(0)):
+                self._fail("Invalid value")
+            self.pos = token.end()
+        frame.expect = "comma_or_close"
+        return True
+
+    def _close(self, frame: _Frame, char: str) -> bool:
+        if char != ("}" if frame.kind == "{" else "]"):
+            self._fail(f"Expected ',' or '{'}' if frame.kind == '{' else ']'}'")
+        self.stack.pop()
+        self.pos += 1
+        if self.watch(frame.path) and self.on_value is not None:
+            try:
+                value = json.loads(self.text[frame.start:self.pos])
+            except json.JSONDecodeError as e:
+                raise MalformedJSONError(f"Invalid JSON in {'/'.join(map(str, frame.path))}: {e}") from e
+            self.on_value(frame.path, value)
+        if not self.stack:
+            self.root_span = (frame.start, self.pos)
+        return True
+
+
+class TailoredResumeStreamParser:
+    """
+    Streams the tailoring response through an IncrementalJSONParser and validates every work experience entry
+    the moment it is complete, so malformed output is caught (and can be retried) long before the response ends.
+    """
+    def __init__(self):
+        self._parser = IncrementalJSONParser(self._on_value, watch=lambda path: path[:1] == ("work_experience",) and len(path) <= 2)
+        self.reset()
+
+    def reset(self):
+        """Starts over for a new attempt"""
+        self._parser.reset()
+        self.entries = {}
+        self.started = time.perf_counter()
+        self.first_entry_seconds = None
+
+    def _on_value(self, path: tuple, value: Any):
+        if len(path) == 1:
+            if not isinstance(value, dict):
+                raise MalformedJSONError("'work_experience' is not an object")
+            return
+        key = path[1]
+        if not isinstance(value, dict) or not isinstance(value.get("title"), str):
+            raise MalformedJSONError(f"Work experience entry '{key}' has no title")
+        bullets = value.get("responsibilities")
+        if not isinstance(bullets, list) or not bullets or not all(isinstance(b, str) and b.strip() for b in bullets):
+            raise MalformedJSONError(f"Work experience entry '{key}' has no valid responsibilities")
+        if self.first_entry_seconds is None:
+            self.first_entry_seconds = time.perf_counter() - self.started
+        self.entries[key] = value
+
+    def feed(self, chunk: str):
+        """:raises MalformedJSONError: as soon as the response can't be a valid tailoring result"""
+        self._parser.feed(chunk)
+
+    def finish(self) -> dict:
+        """
+        :return: the decoded response
+        :raises MalformedJSONError: if it is incomplete or has no work experience
+        """
+        result = self._parser.finish()
+        if not isinstance(result, dict) or not self.entries:
+            raise MalformedJSONError("Response has no work experience entries")
+        return result
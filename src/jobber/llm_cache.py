@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(**inputs) -> str:
+    """
+    Builds a content address for an LLM request from everything that affects its output
+
+    :param inputs: JSON serializable request inputs (prompt version, model, payload, job description, etc.)
+    :return: sha256 hex digest of the canonical JSON encoding of the inputs
+    """
+    canonical = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Persistent, size bounded LRU cache of parsed LLM responses keyed by make_cache_key().
+    Re-running the same tailoring request (re-renders, template experiments, PDF retries) costs no model call.
+    """
+    def __init__(self, db_path: str | Path, max_entries: int = 500):
+        """
+        :param db_path: path to the sqlite file (created if missing)
+        :param max_entries: least recently used responses are evicted past this many entries
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with connect(self.db_path, wal=True) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+
+    def get(self, key: str) -> dict | None:
+        """
+        :param key: cache key from make_cache_key()
+        :return: cached response, or None on a miss
+        """
+        with connect(self.db_path) as conn:
+            row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.stats["hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, response: dict):
+        """
+        Stores a parsed response and evicts the least recently used entries past max_entries
+
+        :param key: cache key from make_cache_key()
+        :param response: parsed LLM response
+        """
+        now = time.time()
+        with connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), now, now)
+            )
+            evicted = conn.execute(
+                """DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            ).rowcount
+        if evicted:
+            self.stats["evictions"] += evicted
+            logger.debug(f"Evicted {evicted} LLM responses from cache")
+
+    def __len__(self) -> int:
+        with connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def metrics(self) -> dict:
+        """
+        :return: hit/miss/eviction counters for this process, the hit rate and the current entry count
+        """
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": len(self),
+        }
+
+    async def get_async(self, key: str) -> dict | None:
+        return await asyncio.to_thread(self.get, key)
+
+    async def put_async(self, key: str, response: dict):
+        await asyncio.to_thread(self.put, key, response)
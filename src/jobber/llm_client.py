@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import TYPE_CHECKING
+from file_handler import FileHandler
+from json_stream import MalformedJSONError
+from tracing import span
+
+if TYPE_CHECKING:
+    from google.genai import client, types
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_CONFIG = {
+    "model": "gemini-2.5-flash",
+    "max_concurrency": 4,
+    "requests_per_minute": 10,
+    "tokens_per_minute": 250000,
+    "timeout_seconds": 120,
+    "max_retries": 5,
+    "base_delay": 2.0,
+    "max_delay": 60.0,
+    "stream": True,
+    # Local BM25 pre-ranking of the resume (see ResumeRelevanceIndex), only these candidates are sent to the LLM.
+    # Off by default: a shortlist differs for every posting, so it bypasses the Gemini context cache holding the
+    # full resume. Turn it on (e.g. 20) when the resume is too small to be cached or the cache is unavailable
+    "prerank_bullets": 0,  # 0 sends every bullet and skill
+    "prerank_min_per_role": 3,
+    "prerank_skills_per_category": 8,
+}
+
+
+class TokenBucket:
+    """
+    Async token bucket that refills continuously up to a per minute budget.
+    Used for both requests-per-minute (1 token per request) and tokens-per-minute limits.
+    """
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.refill_per_second = per_minute / 60
+        self.updated = time.monotonic()
+        self.waits = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1):
+        """
+        Waits until the bucket holds `amount` tokens and takes them. Waiters are served in order.
+
+        :param amount: tokens to take (clamped to the bucket capacity so oversized requests can still go through)
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            if self.tokens < amount:
+                self.waits += 1
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.refill_per_second)
+                self._refill()
+            self.tokens -= amount
+
+    def adjust(self, amount: float):
+        """
+        Takes (or with a negative amount, returns) tokens without waiting, e.g. to correct an estimate once the
+        real usage is known. The balance may go negative, which delays the next acquire().
+        """
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class LLMClient:
+    """
+    Process-wide async Gemini client.
+    Calls go through the non-blocking `client.aio` API, are capped at max_concurrency in flight,
+    throttled by requests-per-minute and tokens-per-minute buckets, and retried with exponential
+    backoff + jitter on 429s, 5xx errors and timeouts.
+    """
+    _shared = None
+
+    def __init__(self, config: dict | None = None):
+        """
+        :param config: settings overriding DEFAULT_LLM_CONFIG (see configs/llm_config.json)
+        """
+        self.config = {**DEFAULT_LLM_CONFIG, **(config or {})}
+        self.model = self.config["model"]
+        self._client = None
+        self._semaphore = asyncio.Semaphore(self.config["max_concurrency"])
+        self.request_bucket = TokenBucket(self.config["requests_per_minute"])
+        self.token_bucket = TokenBucket(self.config["tokens_per_minute"])
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "timeouts": 0, "server_errors": 0, "malformed": 0}
+
+    @classmethod
+    async def shared_async(cls) -> "LLMClient":
+        """
+        Returns the process-wide client, creating it from configs/llm_config.json on first use
+        """
+        if cls._shared is None:
+            config = await FileHandler().load_llm_config_async()
+            if cls._shared is None:
+                cls._shared = cls(config)
+        return cls._shared
+
+    @property
+    def client(self) -> client.AsyncClient:
+        """
+        The underlying async Gemini client, created on first use so a missing API key only fails actual calls
+        (google-genai takes most of a second to import, so it is only imported here)
+        """
+        if self._client is None:
+            from google import genai
+            from google.genai import types
+            self._client = genai.Client(
+                http_options=types.HttpOptions(timeout=int(self.config["timeout_seconds"] * 1000))
+            ).aio
+        return self._client
+
+    def _estimate_tokens(self, contents) -> int:
+        """Rough prompt size estimate (~4 characters per token) used before the real usage is known"""
+        return max(1, len(str(contents)) // 4)
+
+    def _backoff_delay(self, attempt: int, base_delay: float) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.config["max_delay"], base_delay * 2 ** (attempt - 1)))
+
+    def _is_retryable(self, e: Exception) -> bool:
+        from google.genai import errors
+        from httpx import TimeoutException
+        if isinstance(e, (TimeoutException, asyncio.TimeoutError)):
+            self.stats["timeouts"] += 1
+            return True
+        if isinstance(e, errors.ClientError) and e.code == 429:
+            self.stats["rate_limited"] += 1
+            return True
+        if isinstance(e, errors.ServerError):
+            self.stats["server_errors"] += 1
+            return True
+        return False
+
+    async def generate_content_async(self, contents, config: types.GenerateContentConfig | None = None,
+                                     max_retries: int | None = None, base_delay: float | None = None) -> types.GenerateContentResponse:
+        """
+        Sends a generate_content request without blocking the event loop
+
+        :param contents: prompt contents
+        :param config: optional generation config (e.g. cached_content)
+        :param max_retries: attempts before giving up (defaults to the configured max_retries)
+        :param base_delay: first backoff delay in seconds (defaults to the configured base_delay)
+        :return: model response
+        :raises: the last error once retries are exhausted, or any non-retryable error immediately
+        """
+        max_retries = max_retries or self.config["max_retries"]
+        base_delay = base_delay or self.config["base_delay"]
+        estimated_tokens = self._estimate_tokens(contents)
+
+        for attempt in range(1, max_retries + 1):
+            await self.request_bucket.acquire()
+            await self.token_bucket.acquire(estimated_tokens)
+            try:
+                with span("llm_call", model=self.model, attempt=attempt) as call_span:
+                    async with self._semaphore:
+                        self.stats["requests"] += 1
+                        response = await self.client.models.generate_content(
+                            model=self.model,
+                            contents=contents,
+                            config=config
+                        )
+                    usage = response.usage_metadata
+                    if usage and usage.total_token_count:
+                        self.token_bucket.adjust(usage.total_token_count - estimated_tokens)
+                        call_span.tag(total_tokens=usage.total_token_count, cached_tokens=usage.cached_content_token_count or 0)
+                return response
+            except Exception as e:
+                if not self._is_retryable(e) or attempt == max_retries:
+                    raise
+                delay = self._backoff_delay(attempt, base_delay)
+                self.stats["retries"] += 1
+                logger.warning(f"LLM request failed on attempt {attempt} ({e}), retrying in {delay:.1f} seconds...")
+                await asyncio.sleep(delay)
+
+    async def stream_content_async(self, contents, parser, config: types.GenerateContentConfig | None = None,
+                                   max_retries: int | None = None, base_delay: float | None = None):
+        """
+        Streams a generate_content response into an incremental parser as it arrives.
+        If the parser raises MalformedJSONError the stream is abandoned and the request is retried right away,
+        without backoff, since the model answered fine and only the output was bad.
+
+        :param contents: prompt contents
+        :param parser: object with reset(), feed(text) and finish() (Example: json_stream.TailoredResumeStreamParser)
+        :param config: optional generation config (e.g. cached_content)
+        :param max_retries: attempts before giving up (defaults to the configured max_retries)
+        :param base_delay: first backoff delay in seconds (defaults to the configured base_delay)
+        :return: (parser.finish() result, usage metadata of the response or None)
+        :raises: the last error once retries are exhausted, or any non-retryable error immediately
+        """
+        max_retries = max_retries or self.config["max_retries"]
+        base_delay = base_delay or self.config["base_delay"]
+        estimated_tokens = self._estimate_tokens(contents)
+
+        for attempt in range(1, max_retries + 1):
+            await self.request_bucket.acquire()
+            await self.token_bucket.acquire(estimated_tokens)
+            parser.reset()
+            usage = None
+            try:
+                with span("llm_call", model=self.model, attempt=attempt, streamed=True) as call_span:
+                    async with self._semaphore:
+                        self.stats["requests"] += 1
+                        chunks = 0
+                        stream = await self.client.models.generate_content_stream(
+                            model=self.model,
+                            contents=contents,
+                            config=config
+                        )
+                        try:
+                            async for chunk in stream:
+                                chunks += 1
+                                usage = chunk.usage_metadata or usage
+                                if chunk.text:
+                                    parser.feed(chunk.text)
+                            result = parser.finish()
+                        finally:
+                            # An abandoned stream (malformed output, cancellation) releases its connection before any retry
+                            await stream.aclose()
+                    call_span.tag(chunks=chunks)
+                    if usage and usage.total_token_count:
+                        self.token_bucket.adjust(usage.total_token_count - estimated_tokens)
+                        call_span.tag(total_tokens=usage.total_token_count, cached_tokens=usage.cached_content_token_count or 0)
+                return result, usage
+            except MalformedJSONError as e:
+                self.stats["malformed"] += 1
+                if attempt == max_retries:
+                    raise
+                self.stats["retries"] += 1
+                logger.warning(f"LLM response was malformed on attempt {attempt} ({e}), retrying...")
+            except Exception as e:
+                if not self._is_retryable(e) or attempt == max_retries:
+                    raise
+                delay = self._backoff_delay(attempt, base_delay)
+                self.stats["retries"] += 1
+                logger.warning(f"LLM request failed on attempt {attempt} ({e}), retrying in {delay:.1f} seconds...")
+                await asyncio.sleep(delay)
+
+    def metrics(self) -> dict:
+        """
+        :return: request/retry counters and how often the rate limiters made a call wait
+        """
+        return {**self.stats, "rpm_waits": self.request_bucket.waits, "tpm_waits": self.token_bucket.waits}
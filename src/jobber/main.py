@@ -1,9 +1,10 @@
 from job_post_scraper import JobPostScraper
 from resume_tailor import ResumeTailor
 from file_handler import FileHandler
-from hotkey_listener import HotkeyListener
+from browser_pool import BrowserPool
+from tracing import Tracer
 import asyncio
-import keyboard
+import logging
 
 
 
@@ -15,6 +16,8 @@ async def main():
     
     rw = await ResumeTailor.set_scraper(jackie_resume, resume_template)
     await rw.generate_tailored_resume_async(r"https://www.oneforma.com/jobs/agate-photo-style-editor/")
+    await BrowserPool.close_all()
+    print(Tracer.shared().format_summary())
 
 
     # stuff = await rw.generate_tailored_resume_async("https://job-boards.greenhouse.io/greenhouse/jobs/6605179?gh_jid=6605179")
@@ -35,16 +38,10 @@ async def save_new_pdf():
     await f_handler.generate_pdf_async("2025-07-17_03-19_n-a_associate-applied-technology-developer_v1", "Jackie_Ling_Resume.pdf", "resume_wip.html")
     
 
-asyncio.run(main())
-# asyncio.run(test_scraper())
-# asyncio.run(save_new_pdf())
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
+    # asyncio.run(test_scraper())
+    # asyncio.run(save_new_pdf())
 
-# async def hm():
-#     listener = await HotkeyListener.create()
-#     try:
-#         await listener.listen()
-#     except KeyboardInterrupt:
-#         print("👋 Interrupted by user.")
-#         listener.stop()
-
-# asyncio.run(hm())
\ No newline at end of file
+# Hotkeys: python src/jobber/hotkey_listener.py
\ No newline at end of file
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import base64
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from browser_pool import BrowserPool
+from tracing import span
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+PRINT_OPTIONS = {
+    "preferCSSPageSize": False,
+    "marginLeft": 0,
+    "marginRight": 0,
+    "marginTop": 0,
+    "marginBottom": 0,  # Adjust >0 to add margins and prevent text overflow on pdf (If resume is a page long then ignore this)
+}
+
+# US Letter at 96 css px per inch, matching printToPDF's default paper size
+PAGE_WIDTH_PX = 816
+PAGE_HEIGHT_PX = 1056
+
+# The fitted print scale is stored in the html so re-printing an edited resume_wip.html keeps it
+SCALE_META_NAME = "jobber-print-scale"
+
+MEASURE_SCRIPT = "() => Math.ceil(document.body.getBoundingClientRect().bottom + window.scrollY)"
+# Removes the last (lowest ranked) bullet from the role with the most bullets, keeping at least minBullets per role
+DROP_BULLET_SCRIPT = """(minBullets) => {
+    let longest = null, longestCount = minBullets;
+    for (const ul of document.querySelectorAll("ul.exp-bullets")) {
+        const count = ul.querySelectorAll(":scope > li").length;
+        if (count > longestCount) { longest = ul; longestCount = count; }
+    }
+    if (!longest) return null;
+    const li = longest.querySelector(":scope > li:last-of-type");
+    li.remove();
+    return li.textContent;
+}"""
+SET_SCALE_SCRIPT = """([name, scale]) => {
+    let meta = document.querySelector(`meta[name="${name}"]`);
+    if (!meta) {
+        meta = document.createElement("meta");
+        meta.name = name;
+        document.head.appendChild(meta);
+    }
+    meta.content = String(scale);
+}"""
+GET_SCALE_SCRIPT = "(name) => document.querySelector(`meta[name=\"${name}\"]`)?.content ?? null"
+
+
+@dataclass
+class FitResult:
+    """Outcome of fitting a resume onto one page"""
+    pdf: bytes
+    html: str
+    fits: bool
+    scale: float
+    iterations: int
+    dropped_bullets: list[str] = field(default_factory=list)
+
+
+async def print_to_pdf_async(page: Page, options: dict = PRINT_OPTIONS, scale: float = None) -> bytes:
+    """
+    Prints whatever the page currently shows through Chrome DevTools Page.printToPDF
+
+    :param page: loaded page (must come from a headless browser)
+    :param options: Page.printToPDF parameters
+    :param scale: print scale, defaults to the scale stored in the page by fit-to-page (or 1)
+    :return: pdf bytes
+    """
+    if scale is None:
+        stored = await page.evaluate(GET_SCALE_SCRIPT, SCALE_META_NAME)
+        scale = float(stored) if stored else 1.0
+    client = await page.context.new_cdp_session(page)
+    try:
+        pdf_data = await client.send("Page.printToPDF", {**options, "scale": scale})
+    finally:
+        await client.detach()
+    return base64.b64decode(pdf_data["data"])
+
+
+class PdfRenderer:
+    """
+    Turns rendered resume html into pdf bytes entirely in memory: the html is loaded into a warm pooled page
+    with set_content and printed, so nothing has to be written to disk first.
+    Assets must be inline (see CompiledTemplate.compile's asset_dir) since the page has no base url.
+    """
+    def __init__(self, pool: BrowserPool = None):
+        """
+        :param pool: pool to lease pages from, defaults to the shared headless pool (printToPDF needs headless)
+        """
+        self._pool = pool
+
+    @property
+    def pool(self) -> BrowserPool:
+        if self._pool is None:
+            self._pool = BrowserPool.shared(headless=True)
+        return self._pool
+
+    async def render_async(self, html: str | bytes) -> bytes | None:
+        """
+        :param html: full html document
+        :return: pdf bytes, or None if rendering failed
+        """
+        if isinstance(html, bytes):
+            html = html.decode("utf-8")
+        try:
+            with span("pdf", fit=False):
+                async with self.pool.lease() as page:
+                    await page.set_content(html, wait_until="load")
+                    return await print_to_pdf_async(page)
+        except Exception as e:
+            logger.error("Error rendering PDF: %s", e)
+            return None
+
+    async def render_fit_async(self, html: str | bytes, min_scale: float = 0.85, min_bullets: int = 2,
+                               precision: float = 0.01, page_height_px: int = PAGE_HEIGHT_PX) -> FitResult | None:
+        """
+        Renders the html onto a single page, measuring the layout in the same warm page between attempts.
+        Shrinking the print scale comes first (binary searched between min_scale and 1), and the lowest ranked
+        bullets are only dropped when even min_scale overflows. Nothing is relaunched or written to disk.
+
+        :param html: full html document
+        :param min_scale: smallest print scale to allow
+        :param min_bullets: bullets every role keeps no matter what
+        :param precision: stop the scale search once the range is smaller than this
+        :param page_height_px: printable page height in css px
+        :return: FitResult (fits is False if it still overflows at min_scale with no bullets left to drop),
+        or None if rendering failed
+        """
+        if isinstance(html, bytes):
+            html = html.decode("utf-8")
+        try:
+            with span("pdf", fit=True) as pdf_span:
+                async with self.pool.lease() as page:
+                    viewport = page.viewport_size
+                    try:
+                        await page.set_content(html, wait_until="load")
+                        result = await self._fit_async(page, min_scale, min_bullets, precision, page_height_px)
+                    finally:
+                        if viewport is not None:
+                            await page.set_viewport_size(viewport)
+                pdf_span.tag(iterations=result.iterations, scale=result.scale, dropped_bullets=len(result.dropped_bullets))
+        except Exception as e:
+            logger.error("Error fitting PDF to one page: %s", e)
+            return None
+        logger.info(f"Fit to page in {result.iterations} iterations (scale={result.scale:.2f}, "
+                    f"dropped bullets={len(result.dropped_bullets)}, fits={result.fits})")
+        return result
+
+    async def _fit_async(self, page: Page, min_scale: float, min_bullets: int, precision: float, page_height_px: int) -> FitResult:
+        iterations = 0
+        viewport_height = (page.viewport_size or {}).get("height", page_height_px)
+
+        async def fits_at(scale: float) -> bool:
+            # printToPDF lays the page out (page width / scale) wide and shrinks it by scale,
+            # so measure at that width and scale the measured height the same way
+            nonlocal iterations
+            iterations += 1
+            await page.set_viewport_size({"width": round(PAGE_WIDTH_PX / scale), "height": viewport_height})
+            return await page.evaluate(MEASURE_SCRIPT) * scale <= page_height_px
+
+        dropped = []
+        fits = await fits_at(1.0)
+        scale = 1.0
+        if not fits:
+            fits = await fits_at(min_scale)
+            while not fits:
+                bullet = await page.evaluate(DROP_BULLET_SCRIPT, min_bullets)
+                if bullet is None:
+                    break
+                dropped.append(bullet)
+                fits = await fits_at(min_scale)
+            scale = min_scale
+            if fits and dropped and await fits_at(1.0):
+                scale = 1.0
+            elif fits:
+                low, high = min_scale, 1.0
+                while high - low > precision:
+                    mid = (low + high) / 2
+                    if await fits_at(mid):
+                        low = mid
+                    else:
+                        high = mid
+                scale = low
+
+        await page.evaluate(SET_SCALE_SCRIPT, [SCALE_META_NAME, scale])
+        return FitResult(
+            pdf=await print_to_pdf_async(page, scale=scale),
+            html=await page.content(),
+            fits=fits,
+            scale=scale,
+            iterations=iterations,
+            dropped_bullets=dropped,
+        )
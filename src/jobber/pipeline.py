@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class PipelineJob:
+    """One item moving through a Pipeline, and its final result once it comes out the other end"""
+    key: str
+    payload: Any
+    stage: str | None = None  # stage currently running, or the last one that ran
+    finished: bool = False
+    success: bool = False
+    cancelled: bool = False
+    error: str | None = None
+    stage_seconds: dict = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+    _task: asyncio.Task | None = field(default=None, repr=False)
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline stage: `workers` tasks each pull a job from the stage's queue and await func(job).
+    func returns True to pass the job on to the next stage or False to stop it there as a failure.
+    """
+    name: str
+    func: Callable[[PipelineJob], Awaitable[bool]]
+    workers: int = 1
+
+
+class Pipeline:
+    """
+    Runs jobs through a chain of stages connected by bounded queues, each stage with its own worker pool,
+    so different jobs can be in different stages at the same time.
+    A full queue blocks the stage in front of it (backpressure), so a slow stage never has more than
+    queue_size jobs piled up waiting for it. Jobs can be cancelled individually with cancel().
+    """
+    def __init__(self, stages: list[Stage], queue_size: int | None = None):
+        """
+        :param stages: stages in the order every job goes through them
+        :param queue_size: max jobs waiting in front of each stage, defaults to that stage's worker count
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        for stage in stages:
+            if stage.workers < 1:
+                raise ValueError(f"Stage '{stage.name}' needs at least 1 worker, got {stage.workers}")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.jobs = []
+
+    def cancel(self, key: str) -> bool:
+        """
+        Cancels every unfinished job with this key, interrupting its current stage if it is running
+
+        :param key: job key (Example: the job url)
+        :return: True if a job was cancelled
+        """
+        cancelled = False
+        for job in self.jobs:
+            if job.key == key and not job.finished and not job.cancelled:
+                job.cancelled = True
+                if job._task is not None:
+                    job._task.cancel()
+                cancelled = True
+        return cancelled
+
+    async def _run_stage(self, stage: Stage, job: PipelineJob) -> bool:
+        """:return: True if the job should move on to the next stage"""
+        job.stage = stage.name
+        start = time.perf_counter()
+        job._task = asyncio.create_task(stage.func(job))
+        try:
+            await asyncio.wait({job._task})
+        except asyncio.CancelledError:
+            job._task.cancel()  # the pipeline itself is shutting down
+            raise
+        finally:
+            job.stage_seconds[stage.name] = time.perf_counter() - start
+        task, job._task = job._task, None
+        if task.cancelled():
+            job.cancelled = True
+            return False
+        if task.exception() is not None:
+            logger.error(f"Stage '{stage.name}' failed for {job.key}", exc_info=task.exception())
+            job.error = str(task.exception())
+            return False
+        if not task.result():
+            job.error = f"{stage.name} stage failed (see logs)"
+            return False
+        return True
+
+    async def _worker(self, index: int, inbox: asyncio.Queue, outbox: asyncio.Queue | None, done: asyncio.Queue):
+        stage = self.stages[index]
+        while True:
+            job = await inbox.get()
+            try:
+                if not job.cancelled and await self._run_stage(stage, job):
+                    if outbox is None:
+                        job.success = True
+                    else:
+                        await outbox.put(job)
+                        continue
+                job.finished = True
+                job.elapsed = time.perf_counter() - job.started
+                await done.put(job)
+            finally:
+                inbox.task_done()
+
+    async def _feed(self, jobs: list[PipelineJob], inbox: asyncio.Queue):
+        for job in jobs:
+            job.started = time.perf_counter()
+            await inbox.put(job)
+
+    async def run(self, items: list[tuple[str, Any]]):
+        """
+        Runs every item through the stages and yields each PipelineJob as soon as it finishes, fails or is cancelled
+
+        :param items: (key, payload) pairs, the payload is what the stage functions work on
+        """
+        jobs = [PipelineJob(key=key, payload=payload) for key, payload in items]
+        self.jobs.extend(jobs)
+        queues = [asyncio.Queue(maxsize=self.queue_size or stage.workers) for stage in self.stages]
+        done = asyncio.Queue()
+        tasks = [asyncio.create_task(self._feed(jobs, queues[0]))]
+        for i, stage in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(queues) else None
+            tasks += [asyncio.create_task(self._worker(i, queues[i], outbox, done)) for _ in range(stage.workers)]
+        try:
+            for _ in jobs:
+                yield await done.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.jobs = [job for job in self.jobs if job not in jobs]
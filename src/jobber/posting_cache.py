@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+# Query params that only track where the click came from and never change which posting is shown
+TRACKING_PARAMS = {"source", "src", "ref", "referrer", "trk", "trackingid", "gh_src", "lever-source", "lever-origin", "fbclid", "gclid", "mc_cid", "mc_eid"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a job posting url so the same posting always maps to the same cache key.
+    Lowercases the scheme/host, drops "www.", the fragment, trailing slashes and tracking params, and sorts the query
+
+    :param url: raw job posting url
+    :return: normalized url
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", host, path, urlencode(query), ""))
+
+
+class PostingCache:
+    """
+    Persistent SQLite cache of scraped job postings keyed by normalized url.
+    Lets the scraper skip the network entirely for postings it has seen within the TTL.
+    """
+    FIELDS = ("job_title", "job_location", "job_description", "company_name")
+
+    def __init__(self, db_path: str | Path, ttl: float = 7 * 24 * 60 * 60):
+        """
+        :param db_path: path to the sqlite file (created if missing)
+        :param ttl: seconds before a cached posting is considered stale
+        """
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with connect(self.db_path, wal=True) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS postings (
+                    url TEXT PRIMARY KEY,
+                    job_title TEXT,
+                    job_location TEXT,
+                    job_description TEXT,
+                    company_name TEXT,
+                    scraped_at REAL NOT NULL
+                )"""
+            )
+
+    def get(self, url: str) -> dict | None:
+        """
+        :param url: job posting url (normalized internally)
+        :return: dict of cached posting fields, or None if missing or older than the TTL
+        """
+        with connect(self.db_path) as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(self.FIELDS)}, scraped_at FROM postings WHERE url = ?",
+                (normalize_url(url),)
+            ).fetchone()
+        if row is None:
+            return None
+        if time.time() - row[-1] > self.ttl:
+            logger.debug(f"Cached posting for {url} is stale")
+            return None
+        return dict(zip(self.FIELDS, row[:-1]))
+
+    def put(self, url: str, posting: dict):
+        """
+        Stores (or replaces) a scraped posting
+
+        :param url: job posting url (normalized internally)
+        :param posting: dict containing the keys in PostingCache.FIELDS
+        """
+        with connect(self.db_path) as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO postings (url, {', '.join(self.FIELDS)}, scraped_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), *(posting.get(field, "n-a") for field in self.FIELDS), time.time())
+            )
+
+    async def get_async(self, url: str) -> dict | None:
+        return await asyncio.to_thread(self.get, url)
+
+    async def put_async(self, url: str, posting: dict):
+        await asyncio.to_thread(self.put, url, posting)
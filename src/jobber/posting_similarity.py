@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from array import array
+from pathlib import Path
+from file_handler import FileHandler
+from sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DUPLICATE_CONFIG = {
+    "enabled": True,
+    "threshold": 0.8,  # estimated Jaccard similarity of the descriptions' word shingles above which a result is reused
+}
+NUM_HASHES = 128  # MinHash signature length, changing it (or the shingle size) makes stored signatures incomparable
+BANDS = 16  # LSH bands of NUM_HASHES // BANDS rows, postings sharing any band are compared (finds pairs above ~0.7)
+SHINGLE_SIZE = 5  # words per shingle
+_BIN_BITS = NUM_HASHES.bit_length() - 1
+_EMPTY = 1 << 64
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """:return: 64 bit hashes of the overlapping word shingles of the lowercased text, punctuation and spacing ignored"""
+    words = _WORD.findall(text.lower())
+    shingles = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))} if words else set()
+    return {int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little") for shingle in shingles}
+
+
+def minhash_signature(hashes: set[int]) -> list[int] | None:
+    """
+    One permutation MinHash: each shingle hash is binned by its low bits and every bin keeps its smallest value,
+    so the whole signature takes a single pass instead of NUM_HASHES. Empty bins borrow the nearest non-empty bin to
+    their right, offset by the distance (rotation densification), which keeps the collision probability of each
+    position equal to the Jaccard similarity.
+
+    :return: NUM_HASHES values, None for text without any words
+    """
+    if not hashes:
+        return None
+    bins = [_EMPTY] * NUM_HASHES
+    for value in hashes:
+        index = value & (NUM_HASHES - 1)
+        value >>= _BIN_BITS
+        if value < bins[index]:
+            bins[index] = value
+    signature = list(bins)
+    for index, value in enumerate(bins):
+        if value == _EMPTY:
+            distance = 1
+            while bins[(index + distance) % NUM_HASHES] == _EMPTY:
+                distance += 1
+            signature[index] = bins[(index + distance) % NUM_HASHES] + (distance << (64 - _BIN_BITS))
+    return signature
+
+
+def band_keys(signature: list[int]) -> list[int]:
+    """:return: one signed 64 bit bucket key per LSH band"""
+    rows = NUM_HASHES // BANDS
+    return [
+        int.from_bytes(hashlib.blake2b(bytes([band]) + array("Q", signature[band * rows:(band + 1) * rows]).tobytes(), digest_size=8).digest(), "little", signed=True)
+        for band in range(BANDS)
+    ]
+
+
+def estimate_similarity(signature: list[int], other: list[int]) -> float:
+    """:return: estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return sum(a == b for a, b in zip(signature, other)) / NUM_HASHES
+
+
+class PostingSimilarityIndex:
+    """
+    Persistent MinHash/LSH index over the job descriptions that were already tailored, so a posting that was reposted
+    under another url (LinkedIn, Greenhouse, the company site...) with only boilerplate changes reuses the earlier
+    result instead of paying for another LLM call and pdf.
+    A lookup reads the 16 LSH buckets of the new signature from an indexed SQLite table and compares only the postings
+    found there, so it stays well under a millisecond with tens of thousands of postings indexed.
+    """
+    FIELDS = ("id", "url", "company", "title", "output_dir", "description_sha256", "created_at")
+
+    def __init__(self, db_path: str | Path, threshold: float = DEFAULT_DUPLICATE_CONFIG["threshold"]):
+        """
+        :param db_path: path to the sqlite file (created if missing)
+        :param threshold: estimated similarity at or above which a posting counts as a duplicate
+        """
+        self.db_path = Path(db_path)
+        self.threshold = threshold
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with connect(self.db_path, wal=True) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS postings (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT,
+                    company TEXT,
+                    title TEXT,
+                    output_dir TEXT NOT NULL,
+                    description_sha256 TEXT,
+                    inputs_sha256 TEXT NOT NULL,
+                    signature BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS bands (
+                    key INTEGER NOT NULL,
+                    posting_id INTEGER NOT NULL,
+                    PRIMARY KEY (key, posting_id)
+                ) WITHOUT ROWID"""
+            )
+
+    @classmethod
+    async def from_config_async(cls, db_path: str | Path) -> "PostingSimilarityIndex | None":
+        """
+        :param db_path: path to the sqlite file
+        :return: index set up from configs/duplicate_config.json, None if duplicate detection is disabled
+        """
+        config = {**DEFAULT_DUPLICATE_CONFIG, **(await FileHandler().load_duplicate_config_async() or {})}
+        if not config["enabled"]:
+            return None
+        return cls(db_path, threshold=config["threshold"])
+
+    @staticmethod
+    def signature(job_description: str) -> list[int] | None:
+        """:return: MinHash signature of the job description, None if it has no words"""
+        return minhash_signature(shingle_hashes(job_description))
+
+    def find(self, signature: list[int], inputs_sha256: str) -> dict | None:
+        """
+        :param signature: MinHash signature of the new job description
+        :param inputs_sha256: hash of what the result is tailored from (resume data, prompt version), results tailored
+        from other inputs are never reused
+        :return: the most similar indexed posting at or above the threshold, with its "similarity", None if there is none
+        """
+        keys = band_keys(signature)
+        with connect(self.db_path) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(self.FIELDS)}, signature FROM postings WHERE inputs_sha256 = ? AND id IN "
+                f"(SELECT posting_id FROM bands WHERE key IN ({', '.join('?' * len(keys))}))",
+                (inputs_sha256, *keys)
+            ).fetchall()
+        best = None
+        for row in rows:
+            similarity = estimate_similarity(signature, array("Q", row[-1]))
+            if similarity >= self.threshold and (best is None or similarity > best["similarity"]):
+                best = {**dict(zip(self.FIELDS, row[:-1])), "similarity": similarity}
+        return best
+
+    def add(self, signature: list[int], inputs_sha256: str, output_dir: str, url: str = None, company: str = None,
+            title: str = None, description_sha256: str = None) -> int:
+        """
+        Indexes a posting that was tailored successfully
+
+        :param output_dir: name of the directory in resources/outputs holding its tailored resume
+        :return: id of the new entry
+        """
+        with connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "INSERT INTO postings (url, company, title, output_dir, description_sha256, inputs_sha256, signature, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, company, title, output_dir, description_sha256, inputs_sha256, array("Q", signature).tobytes(), time.time())
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO bands (key, posting_id) VALUES (?, ?)",
+                [(key, cursor.lastrowid) for key in band_keys(signature)]
+            )
+            return cursor.lastrowid
+
+    def count(self) -> int:
+        with connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    async def signature_async(self, job_description: str) -> list[int] | None:
+        return await asyncio.to_thread(self.signature, job_description)
+
+    async def find_async(self, signature: list[int], inputs_sha256: str) -> dict | None:
+        return await asyncio.to_thread(self.find, signature, inputs_sha256)
+
+    async def add_async(self, *args, **kwargs) -> int:
+        return await asyncio.to_thread(self.add, *args, **kwargs)
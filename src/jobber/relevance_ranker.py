@@ -0,0 +1,146 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+_TOKEN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")  # keeps "c#", "c++", "node.js" whole
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to was we were will with "
+    "you your i my me us they them who what which while into over about across per via using used use able well "
+    "including such other than more most all any can also etc".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """:return: lowercased word tokens without stopwords, plurals reduced to their singular (Example: "APIs" -> "api")"""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.isalpha() and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class _Corpus:
+    """
+    BM25 over a fixed set of short documents. The query independent part of every (term, document) score,
+    idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg length)), is precomputed into an inverted index,
+    so ranking against a job description only sums the weights of the terms the two share.
+    """
+    def __init__(self, documents: list[str], k1: float = 1.2, b: float = 0.75):
+        term_counts = [Counter(tokenize(document)) for document in documents]
+        lengths = [sum(counts.values()) for counts in term_counts]
+        avg_length = (sum(lengths) / len(lengths)) if lengths and sum(lengths) else 1.0
+        document_frequency = Counter(term for counts in term_counts for term in counts)
+        self.size = len(documents)
+        self.weights = {}  # term -> [(document index, weight)]
+        for index, counts in enumerate(term_counts):
+            norm = k1 * (1 - b + b * lengths[index] / avg_length)
+            for term, tf in counts.items():
+                idf = math.log(1 + (self.size - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+                self.weights.setdefault(term, []).append((index, idf * tf * (k1 + 1) / (tf + norm)))
+
+    def score(self, query_counts: Counter) -> list[float]:
+        """:return: score of every document, query terms repeated in the job description count logarithmically more"""
+        scores = [0.0] * self.size
+        for term, count in query_counts.items():
+            postings = self.weights.get(term)
+            if postings:
+                boost = 1 + math.log(count)
+                for index, weight in postings:
+                    scores[index] += boost * weight
+        return scores
+
+
+@dataclass
+class Shortlist:
+    """Outcome of pre-ranking a resume against a job description"""
+    payload: dict  # same schema as ResumeTailor._extract_exp_payload, with only the candidates
+    bullet_scores: dict  # {role key: [(score, bullet)] best first}, every bullet, kept for inspection
+    skill_scores: dict  # {skill category: [(score, skill)] best first}
+    sent_bullets: int
+    total_bullets: int
+    sent_skills: int
+    total_skills: int
+
+    def to_dict(self) -> dict:
+        return {
+            "sent_bullets": f"{self.sent_bullets}/{self.total_bullets}",
+            "sent_skills": f"{self.sent_skills}/{self.total_skills}",
+            "bullets": {role: [{"score": round(score, 3), "text": text} for score, text in ranked] for role, ranked in self.bullet_scores.items()},
+            "skills": {category: [{"score": round(score, 3), "text": text} for score, text in ranked] for category, ranked in self.skill_scores.items()},
+        }
+
+
+class ResumeRelevanceIndex:
+    """
+    Precomputed BM25 index over a resume's responsibility bullets and skills (see ResumeTailor._extract_exp_payload),
+    built once per resume. shortlist() scores everything against a job description locally, so only the most relevant
+    candidates go into the LLM prompt instead of every bullet and skill.
+    Bullets and skills are separate corpora: skills are one to a few words, so they'd be drowned by bullet lengths.
+    """
+    def __init__(self, payload: dict):
+        """
+        :param payload: {"work_experience": {role key: {"title", "responsibilities"}}, "skills": {category: [skill]}}
+        """
+        self.payload = payload
+        self.bullets = [
+            (role, index, bullet)
+            for role, entry in payload["work_experience"].items()
+            for index, bullet in enumerate(entry["responsibilities"])
+        ]
+        self.skills = [(category, skill) for category, skills in payload["skills"].items() for skill in skills]
+        # A bullet is also scored on its role's title, a "Software Engineer" role is relevant to a software posting
+        self.bullet_corpus = _Corpus([f"{payload['work_experience'][role]['title']} {bullet}" for role, _, bullet in self.bullets])
+        self.skill_corpus = _Corpus([skill for _, skill in self.skills])
+
+    def shortlist(self, job_description: str, max_bullets: int = 20, min_per_role: int = 3, max_skills_per_category: int = 8) -> Shortlist:
+        """
+        :param job_description: scraped or copied job posting description
+        :param max_bullets: bullets sent in total (roles below min_per_role are topped up first)
+        :param min_per_role: best bullets of every role that are always sent, so each role keeps enough to choose from
+        :param max_skills_per_category: skills sent per category, best first
+        :return: the reduced payload and every score
+        """
+        query = Counter(tokenize(job_description))
+        bullet_scores = self.bullet_corpus.score(query)
+        # Ties keep the resume's own order
+        ranked = sorted(range(len(self.bullets)), key=lambda i: (-bullet_scores[i], i))
+        chosen, per_role = set(), Counter()
+        for i in ranked:
+            role = self.bullets[i][0]
+            if per_role[role] < min_per_role:
+                chosen.add(i)
+                per_role[role] += 1
+        limit = max(max_bullets, len(chosen))
+        for i in ranked:
+            if len(chosen) >= limit:
+                break
+            chosen.add(i)
+
+        work_experience = {role: {"title": entry["title"], "responsibilities": []} for role, entry in self.payload["work_experience"].items()}
+        ranked_bullets = {role: [] for role in work_experience}
+        for i in ranked:
+            role, _, bullet = self.bullets[i]
+            ranked_bullets[role].append((bullet_scores[i], bullet))
+            if i in chosen:
+                work_experience[role]["responsibilities"].append(bullet)
+
+        skill_scores = self.skill_corpus.score(query)
+        ranked_skills = {category: [] for category in self.payload["skills"]}
+        for i in sorted(range(len(self.skills)), key=lambda i: (-skill_scores[i], i)):
+            category, skill = self.skills[i]
+            ranked_skills[category].append((skill_scores[i], skill))
+        skills = {category: [skill for _, skill in scored[:max_skills_per_category]] for category, scored in ranked_skills.items()}
+
+        return Shortlist(
+            payload={"work_experience": work_experience, "skills": skills},
+            bullet_scores=ranked_bullets,
+            skill_scores=ranked_skills,
+            sent_bullets=len(chosen),
+            total_bullets=len(self.bullets),
+            sent_skills=sum(len(s) for s in skills.values()),
+            total_skills=len(self.skills),
+        )
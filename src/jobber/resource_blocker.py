@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Route, Response
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceBlocker:
+    """
+    Aborts requests the scraper never needs (images, fonts, media, analytics and ad domains) through
+    request interception, and counts what was blocked vs loaded for one page visit.
+    Blocked bytes can't be measured since aborted requests are never downloaded, so the report gives
+    the blocked request counts next to the bytes that were actually loaded.
+    """
+    def __init__(self, profile: dict):
+        """
+        :param profile: scrape profile with "blocked_resource_types" and "blocked_domains" lists
+        """
+        self.blocked_types = set(profile.get("blocked_resource_types", []))
+        self.blocked_domains = tuple(profile.get("blocked_domains", []))
+        self.stats = {"blocked_requests": 0, "blocked_by_type": {}, "loaded_requests": 0, "loaded_bytes": 0}
+
+    def _is_blocked_host(self, url: str) -> bool:
+        host = urlsplit(url).hostname or ""
+        return any(host == domain or host.endswith("." + domain) for domain in self.blocked_domains)
+
+    async def _handle_route(self, route: Route):
+        request = route.request
+        # Navigations (the posting itself, or an iframe holding it) are never blocked, whatever domain they redirect through
+        if request.is_navigation_request():
+            await route.continue_()
+        elif request.resource_type in self.blocked_types or self._is_blocked_host(request.url):
+            self.stats["blocked_requests"] += 1
+            by_type = self.stats["blocked_by_type"]
+            by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _on_response(self, response: Response):
+        self.stats["loaded_requests"] += 1
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            self.stats["loaded_bytes"] += int(content_length)
+
+    async def install_async(self, page: Page):
+        """Starts intercepting requests on the page"""
+        if self.blocked_types or self.blocked_domains:
+            await page.route("**/*", self._handle_route)
+        page.on("response", self._on_response)
+
+    async def remove_async(self, page: Page):
+        """Stops intercepting so the page can go back to the browser pool clean"""
+        page.remove_listener("response", self._on_response)
+        if self.blocked_types or self.blocked_domains:
+            try:
+                await page.unroute("**/*", self._handle_route)
+            except Exception as e:
+                logger.debug(f"Failed to remove request interception: {e}")
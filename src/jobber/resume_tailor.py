@@ -1,38 +1,70 @@
+from __future__ import annotations
+
 import logging
 import json
 import asyncio
-from google import genai
-from bs4 import BeautifulSoup
-from datetime import datetime
+import copy
+import sqlite3
+import time
+from typing import TYPE_CHECKING
 from job_post_scraper import JobPostScraper
 from file_handler import FileHandler
-from httpx import TimeoutException, RequestError
-import re
-import validators
+from application_history import ApplicationHistory, content_hash
+from posting_similarity import PostingSimilarityIndex
+from relevance_ranker import ResumeRelevanceIndex, Shortlist
+from stage_limits import StageLimits
+from llm_cache import LLMResponseCache, make_cache_key
+from gemini_context_cache import ResumeContextCache
+from llm_client import LLMClient
+from json_stream import MalformedJSONError, TailoredResumeStreamParser
+from template_renderer import CompiledTemplate
+from pdf_renderer import PdfRenderer
+from tracing import span, tag_current
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump whenever the tailoring prompt changes so cached LLM responses from the old prompt are not reused
+PROMPT_VERSION = "v2"
+
 
-# TODO make use of gemini cache so I dont have to keep sending the resume
-# TODO Fix bug where it would write multiple times to the same file so there would be duplicate entries
 class ResumeTailor:
     """
     ResumeTailor is responsible for tailoring a resume to a specific job posting by leveraging an LLM to rewrite work experience and skills,
     By taking in a resume template, it generates output files such as an HTML and PDF.
     """
 
-    def __init__(self, resume: dict, parsed_template: BeautifulSoup):
+    def __init__(self, resume: dict, parsed_template: BeautifulSoup, template: CompiledTemplate = None):
         """
         :param resume: dict containing resume data
-        :param parsed_template: parsed resume template html
+        :param parsed_template: parsed resume template html, never modified
+        :param template: already compiled parsed_template, compiled here if None
         """ 
         self.resume = resume
         self.parsed_template = parsed_template
         self.f_handler = FileHandler()
+        self.template = template if template is not None else self._compile_template(parsed_template, self.f_handler.input_dir / 'templates')
+        self.pdf_renderer = PdfRenderer()
+        self.write_html = True # Set to False to only save the pdf (the html is needed to edit and re-save the pdf later)
+        self.fit_to_page = False # Shrink the print scale / drop the lowest ranked bullets until the resume fits on one page
         self.most_recent_output_dir = None
+        self.most_recent_pdf = None
+        self.most_recent_fit = None
         self.resume_pdf_file_name = self._generate_resume_pdf_name()
+        self.limits = StageLimits()  # unbounded, the daemon and CLI set the configured limits (shared by every clone)
+        self.llm_cache = None
+        self.context_cache = None
+        self.llm_client = None
+        self.history = None  # ApplicationHistory every run is recorded in
+        self.similar_postings = None  # PostingSimilarityIndex of tailored postings, None disables duplicate detection
+        self.reuse_duplicates = True # Set to False to tailor near-duplicates of earlier postings again
+        self.duplicate_of = None  # earlier posting whose result this run reused (see find_duplicate_async)
+        self._pending_posting = None  # (signature, inputs hash, description) indexed once this run's outputs are saved
+        self.most_recent_url = None
+        self.resume_index = None  # ResumeRelevanceIndex over the untailored resume, built on first use
+        self.most_recent_shortlist = None  # locally pre-ranked candidates (and every score) sent to the LLM last
 
 
     @classmethod
@@ -43,7 +75,54 @@ class ResumeTailor:
         """
         instance = cls(resume, parsed_template)
         instance.scraper = await JobPostScraper.fetch_configs()
+        instance.llm_cache = LLMResponseCache(instance.f_handler.cache_dir / "llm_responses.sqlite3")
+        instance.llm_client = await LLMClient.shared_async()
+        instance.context_cache = ResumeContextCache(instance.llm_client.model)
+        instance.history = ApplicationHistory(instance.f_handler.history_db)
+        instance.resume_index = ResumeRelevanceIndex(instance._extract_exp_payload())  # shared by every clone
+        instance.similar_postings = await PostingSimilarityIndex.from_config_async(instance.f_handler.cache_dir / "posting_similarity.sqlite3")
+        return instance
+
+    def clone(self, resume: dict = None, parsed_template: BeautifulSoup = None) -> "ResumeTailor":
+        """
+        Creates an independent ResumeTailor with its own copy of the resume data and scraper state.
+        Configs, stage limits and the compiled template (which is never modified) are shared, so clones can tailor different postings concurrently.
+
+        :param resume: replaces the resume data (Example: after the resume file was edited)
+        :param parsed_template: replaces the template, which is compiled again
+        """
+        if parsed_template is None:
+            parsed_template, template = self.parsed_template, self.template
+        else:
+            template = None
+        instance = ResumeTailor(copy.deepcopy(resume if resume is not None else self.resume), parsed_template, template=template)
+        instance.scraper = self.scraper.clone()
+        instance.f_handler = self.f_handler
+        instance.limits = self.limits
+        instance.llm_cache = self.llm_cache
+        instance.context_cache = self.context_cache
+        instance.llm_client = self.llm_client
+        instance.history = self.history
+        instance.similar_postings = self.similar_postings
+        # An edited resume gets its index built once here, so the clones made from this one share it again
+        instance.resume_index = self.resume_index if resume is None else ResumeRelevanceIndex(instance._extract_exp_payload())
+        instance.reuse_duplicates = self.reuse_duplicates
+        instance.pdf_renderer = self.pdf_renderer
+        instance.write_html = self.write_html
+        instance.fit_to_page = self.fit_to_page
         return instance
+
+    @staticmethod
+    def _compile_template(parsed_template: BeautifulSoup, asset_dir) -> CompiledTemplate | None:
+        """
+        :param asset_dir: directory the template's local stylesheets/images are inlined from
+        :return: compiled template, or None if the template is missing the work experience or skills section
+        """
+        try:
+            return CompiledTemplate.compile(parsed_template, asset_dir=asset_dir)
+        except ValueError as e:
+            logger.error(e)
+            return None
         
         
     def _parse_llm_json_response(self, payload: str | dict) -> dict | None:
@@ -86,15 +165,11 @@ class ResumeTailor:
         self.resume["data"]["skills"]["coding_languages"] = skills.get("coding_languages", [])
         return True
     
-    async def _get_tailored_work_exp_async(self, job_desc: str, num_bullets: int = 12, max_retries: int = 3, delay: float = 2.0) -> dict | None:
+    def _extract_exp_payload(self) -> dict:
         """
-        Makes LLM tailor resume job descriptions based on the job posting
-
-        :param job_desc: job description from job posting
-        :return: LLM response which should be in json format converted to dict
-        """ 
-        num_skills = 5
-        extracted_exp = {
+        :return: the parts of the resume the LLM gets to rewrite (work experience bullets and skills)
+        """
+        return {
             "work_experience": {
                 key: {
                     "title": value["title"],
@@ -107,144 +182,191 @@ class ResumeTailor:
                 "softwares": self.resume["data"]["skills"]["softwares"]
             }
         }
-        prompt = (
+
+    def _shortlist(self, job_desc: str, num_bullets: int, config: dict) -> Shortlist | None:
+        """
+        Scores every bullet and skill against the job description locally (BM25) so only the best candidates are sent to the LLM
+
+        :param num_bullets: bullets the LLM has to pick, never send fewer candidates
+        :param config: LLM client config holding the prerank_* settings
+        :return: reduced payload and scores, None if pre-ranking is disabled
+        """
+        if not config["prerank_bullets"]:
+            return None
+        if self.resume_index is None:
+            self.resume_index = ResumeRelevanceIndex(self._extract_exp_payload())
+        with span("prerank"):
+            shortlist = self.resume_index.shortlist(
+                job_desc, max(config["prerank_bullets"], num_bullets), config["prerank_min_per_role"], config["prerank_skills_per_category"]
+            )
+        logger.info(f"Pre-ranking sends {shortlist.sent_bullets}/{shortlist.total_bullets} bullets and "
+                    f"{shortlist.sent_skills}/{shortlist.total_skills} skills to the LLM")
+        return shortlist
+
+    def _build_instructions(self, num_bullets: int, num_skills: int) -> str:
+        """
+        :return: the static tailoring instructions (everything in the prompt except the resume payload and job posting)
+        """
+        return (
             "You will receive a JSON payload containing my work experience, skills, and a job posting description. "
             "Your task is to generate a revised version of my experience that is tailored to the job posting. "
             "Select and rewrite a total of" + str(num_bullets) + " bullet points across my roles that are most relevant to the job description. "
             "Each role should have at least 2 bullet point. "
+            "List each role's bullet points from most to least relevant. "
             "You may combine multiple bullets if doing so improves clarity or relevance. "
             "If my work experience is from a different domain than the posting, try to emphasize transferable skills, or technical proficiencies."
             "Select at least " + str(num_skills) + "of the most relevant skills from the skills section and incorporate them appropriately. "
             "Format the rewrite in pure json, the same schema as the inputs. "
             "Do not include any markdown or explanations. Use double quotes. No periods. "
-            "Here is my experience and the job app:\n" + json.dumps(extracted_exp) + "\n" + job_desc
         )
 
-        client = genai.Client()
+    def _log_llm_usage(self, usage, elapsed: float, used_context_cache: bool, first_section: float | None = None):
+        """
+        Logs latency and token counts of an LLM call so runs with and without the context cache can be compared
 
-        for attempt in range(1, max_retries + 1):
-            try:
-                response = client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=prompt
-                )
-                logger.info(f"LLM tailoring succeeded on attempt {attempt}")
-                return json.loads(response.text)
-            except TimeoutException:
-                logger.warning(f"Timeout on attempt {attempt}, retrying in {delay} seconds...")
-            except RequestError as req_err:
-                logger.error(f"Request failed: {req_err}")
-                break
-            except (json.JSONDecodeError, TypeError):
-                logger.error("Failed to convert tailored work experience response to dict")
-                break
-            except Exception as e:
-                logger.exception("Unexpected error occurred while tailoring resume")
-                break
+        :param usage: usage metadata of the response, may be None
+        :param first_section: seconds until the first work experience entry was parsed, for streamed responses
+        """
+        timing = f"LLM call took {elapsed:.2f}s"
+        if first_section is not None:
+            timing += f", first section after {first_section:.2f}s"
+        timing += f" (context cache: {'on' if used_context_cache else 'off'})"
+        if usage is None:
+            logger.info(timing)
+            return
+        logger.info(
+            f"{timing} prompt_tokens={usage.prompt_token_count} cached_tokens={usage.cached_content_token_count or 0} "
+            f"output_tokens={usage.candidates_token_count} total_tokens={usage.total_token_count}"
+        )
+
+    async def _get_tailored_work_exp_async(self, job_desc: str, num_bullets: int = 12, max_retries: int | None = None,
+                                           delay: float | None = None) -> dict | None:
+        """
+        Makes LLM tailor resume job descriptions based on the job posting
+        Responses are cached by a hash of the resume payload, job description, num_bullets, model and prompt version
+
+        :param job_desc: job description from job posting
+        :param max_retries: attempts on rate limits, server errors and timeouts (defaults to max_retries in llm_config.json)
+        :param delay: base delay in seconds for the exponential backoff between retries (defaults to base_delay in llm_config.json)
+        :return: LLM response which should be in json format converted to dict
+        """ 
+        llm_client = self.llm_client or await LLMClient.shared_async()
+        num_skills = 5
+        self.most_recent_shortlist = self._shortlist(job_desc, num_bullets, llm_client.config)
+        extracted_exp = self.most_recent_shortlist.payload if self.most_recent_shortlist else self._extract_exp_payload()
+        cache_key = make_cache_key(
+            prompt_version=PROMPT_VERSION,
+            model=llm_client.model,
+            num_bullets=num_bullets,
+            num_skills=num_skills,
+            resume=extracted_exp,
+            job_desc=job_desc,
+        )
+        if self.llm_cache is not None:
+            cached = await self.llm_cache.get_async(cache_key)
+            if cached is not None:
+                logger.info(f"LLM response cache hit ({self.llm_cache.stats})")
+                tag_current(cache_hit=True)
+                return cached
+        tag_current(cache_hit=False)
 
-            await asyncio.sleep(delay)
+        # Only a cache miss needs google-genai and httpx, so a cached run never imports them
+        from google.genai import types, errors
+        from httpx import TimeoutException, RequestError
+        instructions = self._build_instructions(num_bullets, num_skills)
+        cache_name = None
+        if self.context_cache is not None and self.most_recent_shortlist is None:
+            # A shortlist differs for every posting, a server side cache only pays off for the full resume (prerank_bullets 0)
+            cache_name = await self.context_cache.get_cache_name_async(llm_client.client, instructions, extracted_exp)
+        tag_current(context_cache=cache_name is not None)
+        if cache_name:
+            # The instructions and resume already live in the server side cache, only the posting is sent
+            contents = "Here is the job app:\n" + job_desc
+            config = types.GenerateContentConfig(cached_content=cache_name)
+        else:
+            contents = instructions + "Here is my experience and the job app:\n" + json.dumps(extracted_exp) + "\n" + job_desc
+            config = None
+
+        try:
+            start = time.perf_counter()
+            if llm_client.config["stream"]:
+                # Entries are validated as they arrive, so a malformed answer is retried without waiting for the rest
+                parser = TailoredResumeStreamParser()
+                tailored, usage = await llm_client.stream_content_async(contents, parser, config, max_retries=max_retries, base_delay=delay)
+                self._log_llm_usage(usage, time.perf_counter() - start, cache_name is not None, parser.first_entry_seconds)
+                tag_current(streamed=True, first_section_s=parser.first_entry_seconds)
+            else:
+                response = await llm_client.generate_content_async(contents, config, max_retries=max_retries, base_delay=delay)
+                self._log_llm_usage(response.usage_metadata, time.perf_counter() - start, cache_name is not None)
+                tailored = json.loads(response.text)
+        except (TimeoutException, RequestError, errors.APIError) as e:
+            logger.error(f"LLM request failed: {e}")
+            return None
+        except MalformedJSONError as e:
+            logger.error(f"LLM response was malformed: {e}")
+            return None
+        except (json.JSONDecodeError, TypeError):
+            logger.error("Failed to convert tailored work experience response to dict")
+            return None
+        except Exception:
+            logger.exception("Unexpected error occurred while tailoring resume")
+            return None
 
-        logger.error("All attempts to tailor resume failed")
-        return None
+        logger.info(f"LLM tailoring succeeded ({llm_client.metrics()})")
+        if self.llm_cache is not None:
+            await self.llm_cache.put_async(cache_key, tailored)
+        return tailored
 
     
-    def _update_resume_work_exp(self) -> bool:
+    def _render_resume_html(self) -> str | None:
         """
-        Takes the work_experience section of self.resume and updates the work experience section of the parsed template soup object
+        Renders self.resume into the compiled template
 
-        :return: True if the work experience section was updated successfully, False otherwise
+        :return: full resume html, or None if the template could not be compiled or rendered
         """
-        section = self.parsed_template.find(id="work-experience")
-        if section is None:
-            logger.error("Could not find 'work-experience' section in the template.")
-            return False
-
+        if self.template is None:
+            logger.error("No compiled resume template to render into.")
+            return None
         try:
-            # for element in section.find_all(recursive=False):
-            #     if element.name != "h3" or element.name != "h2":  # Keep the section header
-            #         element.decompose()
-
-            # Inject each experience as a complete block
-            for exp in self.resume["data"]["work_experience"].values():
-                div = self.parsed_template.new_tag("div", **{"class": "experience"})
-                table = self.parsed_template.new_tag("table")
-
-                # table body
-                tbody = self.parsed_template.new_tag("tbody")
-                tr_left = self.parsed_template.new_tag("tr")
-                tr_right = self.parsed_template.new_tag("tr")
-                tbody.append(tr_left)
-                tbody.append(tr_right)
-
-                # job title and date
-                title = self.parsed_template.new_tag("td", **{"class": "title"})
-                title.string = exp["title"]
-                date = self.parsed_template.new_tag("td", **{"class": "date"})
-                date.string = f"{exp['start']} - {exp['end']}"
-                tr_left.append(title)
-                tr_left.append(date)
-
-                # company and location
-                company = self.parsed_template.new_tag("td", **{"class": "company"})
-                company.string = exp["company"]
-                location = self.parsed_template.new_tag("td", **{"class": "location"})
-                location.string = exp["location"]
-                tr_right.append(company)
-                tr_right.append(location)
-
-                # Bullet points
-                ul = self.parsed_template.new_tag("ul", **{"class": "exp-bullets"})
-                for bullet in exp["responsibilities"]:
-                    li = self.parsed_template.new_tag("li")
-                    li.string = bullet
-                    ul.append(li)
-
-                # Assemble and inject
-                section.append(div)
-                div.append(table)
-                table.append(tbody)
-                div.append(ul)
-            return True
+            with span("render"):
+                return self.template.render_resume(self.resume)
         except Exception as e:
-            logger.exception("Error occurred while updating work experience section: %s", e)
-            return False
-    
-    def _update_resume_skills(self) -> bool:
+            logger.exception("Error occurred while rendering the resume template: %s", e)
+            return None
+
+
+    async def _save_outputs_async(self, resume_html: str) -> bool:
         """
-        Takes the skills section of self.resume and updates the skills section of the parsed template soup object
+        Renders the pdf in memory and saves it to self.most_recent_output_dir.
+        The html (if self.write_html) is written to disk while the pdf renders. With self.fit_to_page the fitted html
+        is only known once rendering is done, so it is written alongside the pdf instead.
 
-        :return: True if the skill section was updated successfully, False otherwise
+        :param resume_html: rendered resume html
+        :return: True if the pdf (and html) were saved successfully, False otherwise
         """
-        section = self.parsed_template.find(id="technical_skills")
-        if section is None:
-            logger.error("Could not find 'technical_skills' section in the template.")
+        html_saved = None
+        if self.write_html and not self.fit_to_page:
+            html_saved = asyncio.create_task(self.f_handler.write_resume_to_html_async(resume_html, self.most_recent_output_dir))
+        async with self.limits.render:
+            if self.fit_to_page:
+                self.most_recent_fit = await self.pdf_renderer.render_fit_async(resume_html)
+                self.most_recent_pdf = self.most_recent_fit.pdf if self.most_recent_fit else None
+            else:
+                self.most_recent_pdf = await self.pdf_renderer.render_async(resume_html)
+        if self.most_recent_fit is not None and self.write_html:
+            html_saved = asyncio.create_task(self.f_handler.write_resume_to_html_async(self.most_recent_fit.html, self.most_recent_output_dir))
+        pdf_saved = self.most_recent_pdf is not None and await self.f_handler.save_pdf_async(
+            self.most_recent_pdf, self.most_recent_output_dir, self.resume_pdf_file_name
+        )
+        if self.most_recent_shortlist is not None and self.write_html:
+            await self.f_handler.write_json_async(self.most_recent_shortlist.to_dict(), self.most_recent_output_dir, "relevance_scores.json")
+        if html_saved is not None and not await html_saved:
+            logger.error("Failed to write resume to HTML")
             return False
-        try:
-            # for element in section.find_all(recursive=False):
-            #     if element.name != "h3" or element.name != "h2":  # Keep the section header
-            #         element.decompose()
-
-            table = self.parsed_template.new_tag("table")
-            tbody = self.parsed_template.new_tag("tbody")
-            section.append(table)
-            table.append(tbody)
-            for skill_type, skills in self.resume["data"]["skills"].items():
-                if skill_type == "coding_languages" or skill_type == "softwares":
-                    tr = self.parsed_template.new_tag("tr")
-                    td1 = self.parsed_template.new_tag("td", **{"class": "skill-type"})
-                    td1.string = skill_type.replace("_", " ").title() + ":"
-
-                    td2 = self.parsed_template.new_tag("td")
-                    td2.string = ", ".join(skills) if skills else "None"
-
-                    tr.append(td1)
-                    tr.append(td2)
-                    tbody.append(tr)
-            return True
-        except Exception as e:
-            logger.exception("Error occurred while updating skills section: %s", e)
+        if not pdf_saved:
+            logger.error("Failed to generate resume PDF")
             return False
-               
+        return True
 
     def _generate_resume_pdf_name(self) -> str:
         """
@@ -263,60 +385,174 @@ class ResumeTailor:
         name = self.f_handler._sanitize_file_and_directory_name(name)
         return f"{name}_Resume.pdf"
     
-    async def generate_tailored_resume_async(self, url: str) -> bool:
+    async def scrape_stage_async(self, url: str, force_refresh: bool = False) -> bool:
         """
-        Pipeline:
-            1. Scrape job posting
-            2. Prompt LLM with job description + your own work experience
-            3. Parse LLM response
-            4. Insert LLM response into template and save as new html resume
-            5. Convert html resume to pdf
-        """ 
-        if not (await self.scraper.scrape_job_posting_async(url)):
+        Pipeline stage 1: scrapes the job posting into self.scraper
+
+        :param url: job posting url
+        :param force_refresh: re-scrape the posting even if it is in the posting cache
+        :return: True if the posting was scraped, False otherwise
+        """
+        self.most_recent_url = url
+        async with self.limits.scrape:
+            scraped = await self.scraper.scrape_job_posting_async(url, force_refresh=force_refresh)
+        if not scraped:
             logger.error("Failed to scrape job posting from URL: %s", url)
             return False
-        tailored = await self._get_tailored_work_exp_async(self.scraper.job_description)
+        return True
+
+    async def tailor_stage_async(self, job_description: str) -> bool:
+        """
+        Pipeline stage 2: prompts the LLM with the job description + work experience and applies the response to self.resume
+
+        :param job_description: job posting description
+        :return: True if the resume was tailored (or a near-duplicate posting's result is reused), False otherwise
+        """
+        if await self.find_duplicate_async(job_description):
+            return True
+        with span("llm") as llm_span:
+            async with self.limits.llm:
+                tailored = await self._get_tailored_work_exp_async(job_description)
+            llm_span.tag(success=tailored is not None)
         if not self._update_work_exp(tailored):
             logger.error("Failed to update work experience with tailored data")
             return False
-        if not self._update_resume_work_exp():
-            logger.error("Failed to update work experience section in the template")
-            return False
-        if not self._update_resume_skills():
-            logger.error("Failed to update skills section in the template")
+        return True
+
+    async def render_stage_async(self, company_name: str = "n-a", job_title: str = "n-a") -> bool:
+        """
+        Pipeline stage 3: renders self.resume into the template and saves the pdf (and html) to a new output directory.
+        Skipped when tailor_stage_async found a near-duplicate posting, its output directory is reused instead
+
+        :param company_name: used to name the output directory
+        :param job_title: used to name the output directory
+        :return: True if the outputs were saved, False otherwise
+        """
+        if self.duplicate_of is not None:
+            self.most_recent_output_dir = self.duplicate_of["output_dir"]
+            return True
+        resume_html = self._render_resume_html()
+        if resume_html is None:
+            logger.error("Failed to render the tailored resume into the template")
             return False
-        self.most_recent_output_dir = self.f_handler.get_output_dir_name() # Keeps track of the most recent output directory if we need to edit and re-save the pdf
-        if not await self.f_handler.write_resume_to_html_async(self.parsed_template, self.most_recent_output_dir):
-            logger.error("Failed to write resume to HTML")
+        try:
+            # Keeps track of the most recent output directory if we need to edit and re-save the pdf
+            self.most_recent_output_dir = self.f_handler.create_output_dir(company_name, job_title)
+        except OSError as e:
+            logger.error(f"Could not create the output directory: {e}")
             return False
-        await self.f_handler.generate_pdf_async(
-            dir_name=self.most_recent_output_dir,
-            output_name=self.resume_pdf_file_name
+        saved = await self._save_outputs_async(resume_html)
+        if saved:
+            await self._index_posting_async(company_name, job_title)
+        return saved
+
+    def _inputs_hash(self) -> str:
+        """:return: hash of everything a tailored result depends on besides the posting, taken before tailoring"""
+        return content_hash(json.dumps(self.resume, sort_keys=True) + PROMPT_VERSION)
+
+    async def find_duplicate_async(self, job_description: str) -> dict | None:
+        """
+        Looks the job description up in the similarity index. A match is only reused if its pdf still exists
+
+        :return: the earlier posting whose result is reused (also kept in self.duplicate_of), None to tailor this one
+        """
+        self.duplicate_of = None
+        self._pending_posting = None
+        if self.similar_postings is None:
+            return None
+        try:
+            with span("duplicate_lookup") as lookup_span:
+                signature = await self.similar_postings.signature_async(job_description)
+                if signature is None:
+                    return None
+                inputs_hash = self._inputs_hash()
+                self._pending_posting = (signature, inputs_hash, job_description)
+                match = await self.similar_postings.find_async(signature, inputs_hash) if self.reuse_duplicates else None
+                lookup_span.tag(duplicate=match is not None)
+        except sqlite3.Error as e:
+            logger.error(f"Could not look up similar postings: {e}")
+            return None
+        if match is None or not (self.f_handler.output_dir / match["output_dir"] / self.resume_pdf_file_name).exists():
+            return None
+        logger.info(f"Job description is {match['similarity']:.0%} similar to {match['company']} - {match['title']} "
+                    f"({match['url'] or 'copied description'}), reusing {match['output_dir']}")
+        self.duplicate_of = match
+        self.most_recent_pdf = None
+        self.most_recent_fit = None
+        return match
+
+    async def _index_posting_async(self, company_name: str, job_title: str):
+        """Adds the posting that was just tailored to the similarity index"""
+        if self.similar_postings is None or self._pending_posting is None:
+            return
+        signature, inputs_hash, job_description = self._pending_posting
+        self._pending_posting = None
+        try:
+            await self.similar_postings.add_async(
+                signature, inputs_hash, self.most_recent_output_dir, url=self.most_recent_url, company=company_name,
+                title=job_title, description_sha256=content_hash(job_description)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Could not add the posting to the similarity index: {e}")
+
+    async def generate_tailored_resume_async(self, url: str, force_refresh: bool = False) -> bool:
+        """
+        Runs every stage for a single posting, one after another (see BatchRunner to overlap stages across postings)
+
+        :param url: job posting url
+        :param force_refresh: re-scrape the posting even if it is in the posting cache
+
+        Pipeline:
+            1. Scrape job posting
+            2. Prompt LLM with job description + your own work experience and parse the response
+            3. Render LLM response into the compiled template, then convert the html to pdf in memory
+               (saving the html alongside it while it renders)
+        """ 
+        succeeded = (
+            await self.scrape_stage_async(url, force_refresh)
+            and await self.tailor_stage_async(self.scraper.job_description)
+            and await self.render_stage_async(self.scraper.company_name, self.scraper.job_title)
         )
-        return True
+        await self.record_application_async(url, self.scraper.job_description, "done" if succeeded else "failed")
+        return succeeded
     
     async def alternative_generate_tailored_resume_async(self, job_description: str) -> bool:
         """
         Similar to generate_tailored_resume_async, but takes the job description as a parameter instead of scraping it from the URL
         This is used if the scraper is unable to scrape the job posting
         """ 
-        tailored = await self._get_tailored_work_exp_async(job_description)
-        if not self._update_work_exp(tailored):
-            logger.error("Failed to update work experience with tailored data")
-            return False
-        if not self._update_resume_work_exp():
-            logger.error("Failed to update work experience section in the template")
-            return False
-        if not self._update_resume_skills():
-            logger.error("Failed to update skills section in the template")
-            return False
-        self.most_recent_output_dir = self.f_handler.get_output_dir_name() # Keeps track of the most recent output directory if we need to edit and re-save the pdf
-        if not await self.f_handler.write_resume_to_html_async(self.parsed_template, self.most_recent_output_dir):
-            logger.error("Failed to write resume to HTML")
-            return False
-        await self.f_handler.generate_pdf_async(
-            dir_name=self.most_recent_output_dir,
-            output_name=self.resume_pdf_file_name
-        )
-        return True
+        self.most_recent_url = None
+        succeeded = await self.tailor_stage_async(job_description) and await self.render_stage_async()
+        await self.record_application_async(None, job_description, "done" if succeeded else "failed")
+        return succeeded
+
+    async def record_application_async(self, url: str | None, job_description: str | None, status: str, error: str = None):
+        """
+        Adds the run to the application history (see ApplicationHistory), failing to record it is only logged
 
+        :param url: job posting url, None for a copied job description
+        :param job_description: hashed so reruns of an unchanged posting can be spotted
+        :param status: "done", "failed" or "cancelled" ("done" is recorded as "duplicate" if an earlier result was reused)
+        :param error: why the run failed
+        """
+        if self.history is None:
+            return
+        done = status == "done"
+        if done and self.duplicate_of is not None:
+            status = "duplicate"
+        output_dir = self.f_handler.output_dir / self.most_recent_output_dir if done else None
+        try:
+            await self.history.record_async(
+                url,
+                self.scraper.company_name if url else None,
+                self.scraper.job_title if url else None,
+                status,
+                error,
+                output_dir=self.most_recent_output_dir if done else None,
+                pdf_path=output_dir / self.resume_pdf_file_name if done else None,
+                html_path=output_dir / "resume_wip.html" if done and self.write_html else None,
+                description_sha256=content_hash(job_description),
+                pdf_sha256=content_hash(self.most_recent_pdf) if done and self.duplicate_of is None else None,
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Could not record the run in the application history: {e}")
@@ -0,0 +1,121 @@
+import logging
+from urllib.parse import urlsplit
+from file_handler import FileHandler
+from config_cache import ConfigCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOMAIN_KEY = "default"
+_TERMINAL = "$"
+
+
+class SelectorRegistry:
+    """
+    Validated, precompiled view of job_app_selectors.json shared by every scraper in the process.
+    URLs are resolved by their hostname through a suffix trie over reversed domain labels,
+    so "jobs.adp.com" matches "adp.com" but "example.com/?next=adp.com" does not.
+    """
+    _shared = None
+    _shared_stamp = None  # version of job_app_selectors.json the shared registry was built from
+
+    def __init__(self, selector_config: dict):
+        """
+        :param selector_config: raw {domain: {field: [selectors], flag: value}} dict from job_app_selectors.json
+        """
+        self.domains = {}
+        self.compiled = {}
+        self._trie = {}
+        for domain, entry in selector_config.items():
+            self.domains[domain], self.compiled[domain] = self._clean_entry(domain, entry)
+            if domain != DEFAULT_DOMAIN_KEY:
+                self._insert(domain)
+        if DEFAULT_DOMAIN_KEY not in self.domains:
+            self.domains[DEFAULT_DOMAIN_KEY], self.compiled[DEFAULT_DOMAIN_KEY] = {}, {}
+        self._fill_empty_fields_from_default()
+
+    @classmethod
+    async def shared_async(cls) -> "SelectorRegistry":
+        """
+        Returns the process-wide registry, loading job_app_selectors.json on first use
+        and rebuilding it after the file was edited
+        """
+        f_handler = FileHandler()
+        stamp = ConfigCache.shared().stamp(f_handler.config_dir / 'job_app_selectors.json')
+        if cls._shared is None or stamp != cls._shared_stamp:
+            selector_config = await f_handler.load_job_app_selectors_async() or {}
+            if cls._shared is None or stamp != cls._shared_stamp:
+                cls._shared, cls._shared_stamp = cls(selector_config), stamp
+        return cls._shared
+
+    def _clean_entry(self, domain: str, entry: dict) -> tuple[dict, dict]:
+        """
+        Drops empty, duplicate and invalid selectors and precompiles the rest
+
+        :return: (cleaned entry with flags kept as is, {field: [compiled selectors]})
+        """
+        import soupsieve  # pulls in bs4, imported when the registry is built rather than with the tailor
+        cleaned = {}
+        compiled = {}
+        for field, value in entry.items():
+            if not isinstance(value, list):
+                cleaned[field] = value
+                continue
+            cleaned[field] = []
+            compiled[field] = []
+            for selector in value:
+                selector = selector.strip() if isinstance(selector, str) else ""
+                if not selector or selector in cleaned[field]:
+                    continue
+                try:
+                    compiled[field].append(soupsieve.compile(selector))
+                except soupsieve.SelectorSyntaxError:
+                    logger.warning(f"Dropping invalid selector for {domain}.{field}: {selector}")
+                    continue
+                cleaned[field].append(selector)
+        return cleaned, compiled
+
+    def _fill_empty_fields_from_default(self):
+        """Fields left with no usable selectors (e.g. everything under oraclecloud.com) use the default selectors"""
+        default, default_compiled = self.domains[DEFAULT_DOMAIN_KEY], self.compiled[DEFAULT_DOMAIN_KEY]
+        for domain, entry in self.domains.items():
+            for field, selectors in default.items():
+                if isinstance(selectors, list) and not entry.get(field):
+                    entry[field] = list(selectors)
+                    self.compiled[domain][field] = list(default_compiled[field])
+
+    def _insert(self, domain: str):
+        node = self._trie
+        for label in reversed(domain.lower().split(".")):
+            node = node.setdefault(label, {})
+        node[_TERMINAL] = domain
+
+    def resolve(self, url: str) -> str:
+        """
+        Finds the most specific configured domain that the url's hostname belongs to
+
+        :param url: site url
+        :return: domain key (Example: "myworkdayjobs.com"), or "default" if none matches
+        """
+        host = urlsplit(url if "//" in url else "//" + url).hostname or ""
+        node = self._trie
+        match = DEFAULT_DOMAIN_KEY
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            match = node.get(_TERMINAL, match)
+        return match
+
+    def get(self, domain_key: str) -> dict:
+        """
+        :param domain_key: key from resolve()
+        :return: cleaned selector entry ({field: [selectors]} plus flags such as needs_js)
+        """
+        return self.domains.get(domain_key, self.domains[DEFAULT_DOMAIN_KEY])
+
+    def get_compiled(self, domain_key: str) -> dict:
+        """
+        :param domain_key: key from resolve()
+        :return: {field: [precompiled soupsieve selectors]} in priority order
+        """
+        return self.compiled.get(domain_key, self.compiled[DEFAULT_DOMAIN_KEY])
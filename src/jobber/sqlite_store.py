@@ -0,0 +1,23 @@
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def connect(db_path: str | Path, wal: bool = False):
+    """
+    Opens a short-lived connection that commits on success and always closes.
+    Shared by the SQLite files in resources (posting cache, LLM cache, application history, posting similarity)
+
+    :param db_path: path to the sqlite file
+    :param wal: switch the file to write-ahead logging, so readers don't block the writer. The mode persists in the file,
+    so it's only needed once, when the tables are created, instead of costing a statement on every connection
+    """
+    conn = sqlite3.connect(db_path, timeout=10)
+    try:
+        if wal:
+            conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            yield conn
+    finally:
+        conn.close()
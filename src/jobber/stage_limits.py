@@ -0,0 +1,22 @@
+import asyncio
+from contextlib import nullcontext
+
+
+class StageLimits:
+    """
+    Caps how many scrapes, LLM calls and PDF renders can be in flight at the same time.
+    Shared between ResumeTailor clones (see ResumeTailor.clone) so concurrent jobs, such as the daemon's workers,
+    respect one set of limits.
+    A limit of None means the stage is unbounded.
+    """
+    def __init__(self, max_scrapes: int | None = None, max_llm_calls: int | None = None, max_renders: int | None = None):
+        self.scrape = self._make_limiter(max_scrapes)
+        self.llm = self._make_limiter(max_llm_calls)
+        self.render = self._make_limiter(max_renders)
+
+    def _make_limiter(self, limit: int | None):
+        if limit is None:
+            return nullcontext()
+        if limit < 1:
+            raise ValueError(f"Stage limit must be at least 1, got {limit}")
+        return asyncio.Semaphore(limit)
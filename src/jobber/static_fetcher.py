@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from tracing import span
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+@lru_cache(maxsize=None)
+def html_parser() -> str:
+    """:return: "lxml" if it is installed (much faster), else the built in "html.parser". Checked on first parse, not on import"""
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+class StaticPostingFetcher:
+    """
+    Fetches a job posting with a plain async HTTP request and applies the same selector config as the
+    browser scraper to the initial HTML. Many boards (greenhouse, jobvite, adp...) render the posting
+    server side, so this avoids launching a browser for them.
+    """
+    def __init__(self, timeout: float = 10.0, proxy: str | None = None):
+        """
+        :param timeout: request timeout in seconds
+        :param proxy: optional http proxy url every request goes through
+        """
+        self.timeout = timeout
+        self.proxy = proxy
+        self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared connection pool, created on first use"""
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(headers=DEFAULT_HEADERS, follow_redirects=True, timeout=self.timeout, proxy=self.proxy)
+        return self._client
+
+    def extract_fields(self, html: str, compiled_selectors: dict) -> dict:
+        """
+        Applies the selectors to static HTML, taking the first non-empty match per field in priority order
+
+        :param html: page html
+        :param compiled_selectors: {field: [precompiled selectors in priority order]} (see SelectorRegistry.get_compiled)
+        :return: {field: text} with "n-a" for fields that did not match
+        """
+        from bs4 import BeautifulSoup  # imported on first fetch so that loading the tailor doesn't pay for bs4
+        with span("selector_match", source="static") as match_span:
+            soup = BeautifulSoup(html, html_parser())
+            results = {}
+            for field, selectors in compiled_selectors.items():
+                results[field] = "n-a"
+                for selector in selectors:
+                    el = selector.select_one(soup)
+                    text = el.get_text(" ", strip=True) if el else ""
+                    if text:
+                        results[field] = text.replace('\n', ' ').replace('\r', '')
+                        break
+            match_span.tag(matched=sum(text != "n-a" for text in results.values()))
+        return results
+
+    async def fetch_async(self, url: str, compiled_selectors: dict) -> dict | None:
+        """
+        :param url: job posting url
+        :param compiled_selectors: {field: [precompiled selectors in priority order]} (see SelectorRegistry.get_compiled)
+        :return: {field: text} from the initial HTML, or None if the request failed or didn't return HTML
+        """
+        import httpx
+        try:
+            response = await self.client.get(url)
+        except httpx.HTTPError as e:
+            logger.debug(f"Static fetch failed for {url}: {e}")
+            return None
+        if response.status_code != 200 or "html" not in response.headers.get("content-type", ""):
+            logger.debug(f"Static fetch for {url} returned {response.status_code} {response.headers.get('content-type')}")
+            return None
+        return self.extract_fields(response.text, compiled_selectors)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
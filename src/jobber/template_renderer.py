@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import re
+import base64
+import logging
+import mimetypes
+from pathlib import Path
+from urllib.parse import urlsplit
+from html import escape
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# Slot name -> id of the template section whose end the rendered html is inserted at
+RESUME_SLOTS = {
+    "work_experience": "work-experience",
+    "skills": "technical_skills",
+}
+RENDERED_SKILL_TYPES = ("coding_languages", "softwares")
+
+_SLOT_MARKER = "jobber-slot:{}"
+_SLOT_SPLIT = re.compile(r"<!--jobber-slot:(\w+)-->")
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledTemplate:
+    """
+    A resume template parsed once and split into static html chunks around named slots.
+    Rendering only joins strings, so it takes microseconds and never touches shared state:
+    every render returns a fresh html string and the template itself is never modified.
+    """
+    def __init__(self, chunks: tuple[str, ...], slot_names: tuple[str, ...]):
+        """
+        Use CompiledTemplate.compile() instead of calling this directly
+
+        :param chunks: static html, one more chunk than there are slots
+        :param slot_names: slot filled in between chunks[i] and chunks[i + 1]
+        """
+        self.chunks = chunks
+        self.slot_names = slot_names
+
+    @classmethod
+    def compile(cls, parsed_template: BeautifulSoup, slots: dict = RESUME_SLOTS, asset_dir: Path = None) -> "CompiledTemplate":
+        """
+        Compiles a parsed template. The parsed template is copied, not modified
+
+        :param parsed_template: parsed resume template html
+        :param slots: {slot name: id of the element whose end the slot sits at}
+        :param asset_dir: if given, local stylesheets and images are inlined relative to this directory
+        so the rendered html is self contained (it is loaded with set_content, which has no base url)
+        :return: reusable CompiledTemplate
+        :raises ValueError: if an element for a slot is missing from the template
+        """
+        from bs4 import BeautifulSoup, Comment  # only needed at compile time, rendering joins strings
+        soup = BeautifulSoup(str(parsed_template), "html.parser")
+        if asset_dir is not None:
+            inline_local_assets(soup, Path(asset_dir))
+        for slot_name, element_id in slots.items():
+            element = soup.find(id=element_id)
+            if element is None:
+                raise ValueError(f"Could not find '{element_id}' section in the template for slot '{slot_name}'")
+            element.append(Comment(_SLOT_MARKER.format(slot_name)))
+        parts = _SLOT_SPLIT.split(str(soup))
+        return cls(chunks=tuple(parts[0::2]), slot_names=tuple(parts[1::2]))
+
+    def render(self, **slot_html: str) -> str:
+        """
+        :param slot_html: html for each slot by name, missing slots render empty
+        :return: the full html document
+        """
+        out = [self.chunks[0]]
+        for slot_name, chunk in zip(self.slot_names, self.chunks[1:]):
+            out.append(slot_html.get(slot_name, ""))
+            out.append(chunk)
+        return "".join(out)
+
+    def render_resume(self, resume: dict) -> str:
+        """
+        :param resume: dict containing resume data
+        :return: the full resume html with work experience and skills filled in
+        """
+        return self.render(
+            work_experience=render_work_experience(resume),
+            skills=render_skills(resume),
+        )
+
+
+def render_work_experience(resume: dict) -> str:
+    """
+    :param resume: dict containing resume data
+    :return: html for every work experience entry (title/date, company/location and the bullet points)
+    """
+    blocks = []
+    for exp in resume["data"]["work_experience"].values():
+        bullets = "".join(f"<li>{escape(bullet)}</li>" for bullet in exp["responsibilities"])
+        blocks.append(
+            '<div class="experience"><table><tbody>'
+            f'<tr><td class="title">{escape(exp["title"])}</td><td class="date">{escape(exp["start"])} - {escape(exp["end"])}</td></tr>'
+            f'<tr><td class="company">{escape(exp["company"])}</td><td class="location">{escape(exp["location"])}</td></tr>'
+            f'</tbody></table><ul class="exp-bullets">{bullets}</ul></div>'
+        )
+    return "".join(blocks)
+
+
+def render_skills(resume: dict) -> str:
+    """
+    :param resume: dict containing resume data
+    :return: html table with a row per rendered skill type
+    """
+    rows = []
+    for skill_type, skills in resume["data"]["skills"].items():
+        if skill_type in RENDERED_SKILL_TYPES:
+            label = escape(skill_type.replace("_", " ").title() + ":")
+            value = escape(", ".join(skills)) if skills else "None"
+            rows.append(f'<tr><td class="skill-type">{label}</td><td>{value}</td></tr>')
+    return f"<table><tbody>{''.join(rows)}</tbody></table>"
+
+
+def _local_asset_path(ref: str, asset_dir: Path) -> Path | None:
+    """:return: path of a relative/file:// asset reference that exists on disk, None for remote or missing assets"""
+    parts = urlsplit(ref)
+    if parts.scheme not in ("", "file") or parts.netloc:
+        return None
+    path = (asset_dir / parts.path).resolve()
+    return path if path.is_file() else None
+
+
+def inline_local_assets(soup: BeautifulSoup, asset_dir: Path):
+    """
+    Replaces <link rel="stylesheet"> tags with <style> blocks and image sources with data uris
+    for every asset that lives on disk. Remote assets are left alone
+
+    :param soup: parsed html, modified in place
+    :param asset_dir: directory relative references are resolved against
+    """
+    for link in soup.find_all("link", href=True):
+        if "stylesheet" not in (link.get("rel") or []):
+            continue
+        path = _local_asset_path(link["href"], asset_dir)
+        if path is None:
+            logger.debug(f"Not inlining stylesheet {link['href']}")
+            continue
+        style = soup.new_tag("style")
+        style.string = path.read_text(encoding="utf-8")
+        link.replace_with(style)
+    for img in soup.find_all("img", src=True):
+        path = _local_asset_path(img["src"], asset_dir)
+        if path is None:
+            continue
+        mime = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        img["src"] = f"data:{mime};base64,{base64.b64encode(path.read_bytes()).decode('ascii')}"
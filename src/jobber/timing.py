@@ -1,34 +0,0 @@
-import atexit
-from time import time, strftime, localtime
-from datetime import timedelta
-
-""" This is used to help track execution times. Call log in your functions """
-
-def secondsToStr(elapsed=None):
-    if elapsed is None:
-        return strftime("%Y-%m-%d %H:%M:%S", localtime())
-    else:
-        return str(timedelta(seconds=elapsed))
-
-def log(s, elapsed=None):
-    """
-    prints execution time
-
-    :param s: String message
-    """ 
-    line = "="*40
-    print(line)
-    print(secondsToStr(), '-', s)
-    if elapsed:
-        print("Elapsed time:", elapsed)
-    print(line)
-    print()
-
-def endlog():
-    end = time()
-    elapsed = end-start
-    log("End Program", secondsToStr(elapsed))
-
-start = time()
-atexit.register(endlog)
-log("Start Program")
\ No newline at end of file
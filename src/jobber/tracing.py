@@ -0,0 +1,207 @@
+import functools
+import inspect
+import itertools
+import json
+import logging
+import math
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_span_ids = itertools.count(1)
+_current_span = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed unit of work (Example: one scrape attempt) with tags describing it"""
+    __slots__ = ("id", "parent_id", "name", "tags", "start", "duration", "error")
+
+    def __init__(self, name: str, tags: dict, parent: "Span | None"):
+        self.id = next(_span_ids)
+        self.parent_id = parent.id if parent else None
+        self.name = name
+        self.tags = tags
+        self.start = time.time()
+        self.duration = 0.0
+        self.error = None
+
+    def tag(self, **tags) -> "Span":
+        """Adds tags that are only known partway through the span (Example: cache_hit)"""
+        self.tags.update(tags)
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "ts": round(self.start, 6),
+            "name": self.name,
+            "duration_ms": round(self.duration * 1000, 3),
+            "id": self.id,
+            "parent_id": self.parent_id,
+            "error": self.error,
+            "tags": self.tags,
+        }
+
+
+class JsonLinesSink:
+    """Appends every finished span to a file as one JSON object per line"""
+    def __init__(self, path: str | Path):
+        """
+        :param path: output file, parent directories are created
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(record, default=str) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest rank percentile"""
+    return sorted_values[max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)]
+
+
+class Tracer:
+    """
+    Records spans for the pipeline stages (scrape, selector_match, llm_call, render, pdf...).
+    Finished spans go to every sink and the durations of the latest ones are kept for a summary per span name,
+    so a long-running process (the daemon) keeps a bounded window instead of every span it ever recorded.
+    Nested spans remember their parent, including across awaits, since the current span lives in a ContextVar.
+    """
+    _shared = None
+
+    def __init__(self, window: int = 1000):
+        """
+        :param window: durations kept per span name for the percentiles, older ones are dropped
+        """
+        self.sinks = []
+        self.durations = defaultdict(lambda: deque(maxlen=window))
+        self.counts = Counter()  # every span recorded per name, including the ones that left the window
+
+    @classmethod
+    def shared(cls) -> "Tracer":
+        """Returns the process-wide tracer"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def add_sink(self, sink):
+        """:param sink: object with write(record: dict) and close(), Example: JsonLinesSink"""
+        self.sinks.append(sink)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+        self.sinks.clear()
+
+    @contextmanager
+    def span(self, name: str, **tags):
+        """
+        Times the body of a with block (works inside async functions too)
+
+        :param name: span name, spans are summarized by name
+        :param tags: details such as domain, attempt or cache_hit
+        :return: the Span, so more tags can be added with span.tag()
+        """
+        span = Span(name, tags, _current_span.get())
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            _current_span.reset(token)
+            self._record(span)
+
+    def traced(self, name: str = None, **tags):
+        """
+        Decorator that wraps every call of a sync or async function in a span
+
+        :param name: span name, defaults to the function's qualified name
+        :param tags: tags added to every span
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name, **tags):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, **tags):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record_duration(self, name: str, seconds: float):
+        """Adds a duration to the summary of the span name"""
+        self.durations[name].append(seconds)
+        self.counts[name] += 1
+
+    def _record(self, span: Span):
+        self.record_duration(span.name, span.duration)
+        if not self.sinks:
+            return
+        record = span.to_dict()
+        for sink in self.sinks:
+            try:
+                sink.write(record)
+            except Exception as e:
+                logger.warning(f"Could not write span to {sink}: {e}")
+
+    def summary(self) -> dict:
+        """
+        :return: {span name: {"count", "p50_ms", "p95_ms", "max_ms"}}, count covers every span recorded so far and
+        the durations only the latest window of them
+        """
+        result = {}
+        for name, durations in self.durations.items():
+            ordered = sorted(durations)
+            result[name] = {
+                "count": self.counts[name],
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 1),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+        return result
+
+    def format_summary(self) -> str:
+        """:return: summary() as a table, one row per span name"""
+        lines = [f"{'span':<20}{'count':>7}{'p50 ms':>11}{'p95 ms':>11}{'max ms':>11}"]
+        for name, stats in sorted(self.summary().items()):
+            lines.append(f"{name:<20}{stats['count']:>7}{stats['p50_ms']:>11}{stats['p95_ms']:>11}{stats['max_ms']:>11}")
+        return "\n".join(lines)
+
+    def reset(self):
+        self.durations.clear()
+        self.counts.clear()
+
+
+def tag_current(**tags):
+    """Adds tags to the innermost open span, if there is one (lets helpers tag the span their caller opened)"""
+    current = _current_span.get()
+    if current is not None:
+        current.tag(**tags)
+
+
+def span(name: str, **tags):
+    """Shortcut for Tracer.shared().span()"""
+    return Tracer.shared().span(name, **tags)
+
+
+def traced(name: str = None, **tags):
+    """Shortcut for Tracer.shared().traced()"""
+    return Tracer.shared().traced(name, **tags)
@@ -0,0 +1,54 @@
+from datetime import datetime
+from jobber.application_history import ApplicationHistory, content_hash
+from jobber.file_handler import FileHandler
+
+
+def test_recent_and_search_filters(tmp_path):
+    history = ApplicationHistory(tmp_path / "applications.sqlite3")
+    day = datetime(2025, 7, 1).timestamp()
+    history.record("https://www.boards.greenhouse.io/acme/jobs/1?gh_src=x", "Acme", "Backend Engineer", "done",
+                   output_dir="2025-07-01_09-00_acme_backend-engineer", created_at=day)
+    history.record("https://jobs.lever.co/globex/2", "Globex", "Data Engineer", "failed", error="scrape failed", created_at=day + 86400)
+    history.record(None, None, None, "done", output_dir="2025-07-03_09-00_n-a_n-a", created_at=day + 2 * 86400,
+                   description_sha256=content_hash("copied description"))
+
+    assert [run["company"] for run in history.recent(2)] == [None, "Globex"]
+    assert [run["title"] for run in history.search(company="acm")] == ["Backend Engineer"]
+    assert [run["company"] for run in history.search(title="engineer")] == ["Globex", "Acme"]
+    assert [run["company"] for run in history.search(since="2025-07-02", until="2025-07-03")] == ["Globex"]
+    assert history.search(url="https://boards.greenhouse.io/acme/jobs/1")[0]["company"] == "Acme"
+    assert history.search(company="%") == []
+    assert history.latest_output_dir() == "2025-07-03_09-00_n-a_n-a"
+
+
+def test_output_dir_names_round_trip():
+    f_handler = FileHandler()
+    dir_name = f_handler.get_output_dir_name("Acme Corp", "Backend Engineer")
+    timestamp, company, title = f_handler.parse_output_dir_name(dir_name)
+    assert timestamp.strftime("%Y-%m-%d_%H-%M") == dir_name[:16]
+    assert (company, title) == ("acme-corp", "backend-engineer")
+    assert f_handler.parse_output_dir_name("output.html") is None
+
+
+def test_reused_duplicates_count_as_successful_runs(tmp_path):
+    history = ApplicationHistory(tmp_path / "applications.sqlite3")
+    day = datetime(2025, 7, 1).timestamp()
+    history.record("https://acme.com/jobs/1", "Acme", "Backend Engineer", "done", output_dir="2025-07-01_09-00_acme_backend", created_at=day)
+    history.record("https://linkedin.com/jobs/view/9", "Acme", "Backend Engineer", "duplicate",
+                   output_dir="2025-07-02_09-00_acme_backend", created_at=day + 86400)
+    history.record("https://globex.com/jobs/2", "Globex", "Data Engineer", "failed", error="scrape failed", created_at=day + 2 * 86400)
+
+    assert history.latest_output_dir() == "2025-07-02_09-00_acme_backend"
+    assert [run["url"] for run in history.search(status="duplicate")] == ["https://linkedin.com/jobs/view/9"]
+
+
+def test_output_dirs_are_unique_within_the_same_second(tmp_path):
+    f_handler = FileHandler(base_dir=tmp_path)
+    f_handler._get_timestamp = lambda: "2025-07-13_04-34-09"
+    names = [f_handler.create_output_dir("n-a", "n-a") for _ in range(3)]
+
+    assert names == ["2025-07-13_04-34-09_n-a_n-a", "2025-07-13_04-34-09_n-a_n-a-2", "2025-07-13_04-34-09_n-a_n-a-3"]
+    assert all((f_handler.output_dir / name).is_dir() for name in names)
+    assert f_handler.parse_output_dir_name(names[1]) == (datetime(2025, 7, 13, 4, 34, 9), "n-a", "n-a-2")
+    # Directories named before seconds were added still parse
+    assert f_handler.parse_output_dir_name("2025-07-13_04-34_acme_backend")[0] == datetime(2025, 7, 13, 4, 34)
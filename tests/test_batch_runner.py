@@ -0,0 +1,60 @@
+import asyncio
+from types import SimpleNamespace
+from jobber.batch_runner import BatchRunner
+
+
+class FakeTailor:
+    """Stands in for ResumeTailor, records how many scrapes overlap"""
+    def __init__(self, state):
+        self.state = state
+        self.scraper = SimpleNamespace(job_description="desc", company_name="acme", job_title="dev")
+        self.most_recent_output_dir = None
+        self.most_recent_fit = None
+        self.duplicate_of = None
+        self.url = None
+
+    def clone(self):
+        return FakeTailor(self.state)
+
+    async def scrape_stage_async(self, url, force_refresh=False):
+        self.url = url
+        self.state["in_flight"] += 1
+        self.state["peak"] = max(self.state["peak"], self.state["in_flight"])
+        await asyncio.sleep(0.01)
+        self.state["in_flight"] -= 1
+        if "bad" in url:
+            raise RuntimeError("scrape exploded")
+        return True
+
+    async def tailor_stage_async(self, job_description):
+        return "no-llm" not in self.url
+
+    async def render_stage_async(self, company_name="n-a", job_title="n-a"):
+        self.most_recent_output_dir = self.url.rsplit("/", 1)[-1]
+        return True
+
+    async def record_application_async(self, url, job_description, status, error=None):
+        self.state["recorded"][url] = status
+
+
+def test_batch_runner_respects_worker_counts_and_reports_failures():
+    state = {"in_flight": 0, "peak": 0, "recorded": {}}
+    runner = BatchRunner(FakeTailor(state), scrape_workers=2)
+    urls = [f"https://example.com/job/{i}" for i in range(5)] + ["https://example.com/bad", "https://example.com/no-llm"]
+
+    async def run():
+        return [result async for result in runner.run(urls)]
+
+    results = asyncio.run(run())
+    summary = BatchRunner.summarize(results, elapsed=1.0)
+
+    assert state["peak"] == 2
+    assert {r.url for r in results} == set(urls)
+    assert summary["succeeded"] == 5
+    assert summary["failures"] == {
+        "https://example.com/bad": "scrape exploded",
+        "https://example.com/no-llm": "llm stage failed (see logs)",
+    }
+    assert {r.url: r.stage for r in results if not r.success} == {"https://example.com/bad": "scrape", "https://example.com/no-llm": "llm"}
+    assert set(summary["avg_stage_seconds"]) == {"scrape", "llm", "render"}
+    assert state["recorded"] == {url: "failed" if url.endswith(("bad", "no-llm")) else "done" for url in urls}
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from jobber.browser_pool import BrowserPool, PooledPage
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def on(self, event, handler):
+        self.crash_handler = handler
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def is_connected(self):
+        return True
+
+
+@pytest.fixture
+def pool():
+    pool = BrowserPool(max_pages=2, max_uses=2)
+    pool._browser = FakeBrowser()
+
+    async def new_pooled_page():
+        pool.stats["pages_created"] += 1
+        return PooledPage(FakeContext(), FakePage())
+
+    pool._new_pooled_page = new_pooled_page
+    return pool
+
+
+def test_lease_reuses_page_until_max_uses(pool):
+    async def run():
+        pages = []
+        for _ in range(3):
+            async with pool.lease() as page:
+                pages.append(page)
+        return pages
+
+    pages = asyncio.run(run())
+    assert pages[0] is pages[1]
+    assert pages[2] is not pages[0]
+    assert pool.stats["leases"] == 3
+    assert pool.stats["recycles"] == 1
+
+
+def test_lease_recycles_on_error_and_crash(pool):
+    async def run():
+        with pytest.raises(RuntimeError):
+            async with pool.lease():
+                raise RuntimeError("boom")
+        async with pool.lease() as page:
+            page.crash_handler(page)
+
+    asyncio.run(run())
+    assert pool.stats["recycles"] == 2
+    assert pool.stats["crashes"] == 1
+    assert pool.metrics()["idle"] == 0
+
+
+def test_lease_counts_waits_when_pool_is_full(pool):
+    async def hold(event):
+        async with pool.lease():
+            await event.wait()
+
+    async def run():
+        event = asyncio.Event()
+        holders = [asyncio.create_task(hold(event)) for _ in range(2)]
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold(event))
+        await asyncio.sleep(0)
+        event.set()
+        await asyncio.gather(*holders, waiter)
+
+    asyncio.run(run())
+    assert pool.stats["waits"] == 1
+    assert pool.metrics()["in_use"] == 0
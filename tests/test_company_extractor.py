@@ -0,0 +1,23 @@
+import time
+from jobber.company_extractor import CompanyNameExtractor
+
+
+def test_candidates_are_ranked_by_pattern_priority():
+    extractor = CompanyNameExtractor()
+    text = "Globex is looking for engineers. Join the team at Globex! At Initech, we care."
+    assert extractor.extract(text) == "Initech"
+    assert [name for _, _, name in extractor.candidates(text)] == ["Initech", "Globex", "Globex"]
+
+
+def test_multi_word_names_and_misses():
+    extractor = CompanyNameExtractor()
+    assert extractor.extract("Johnson & Johnson is an equal opportunity employer") == "Johnson & Johnson"
+    assert extractor.extract("At least 3 years of Python experience") == "n-a"
+
+
+def test_long_capitalized_text_does_not_backtrack():
+    extractor = CompanyNameExtractor()
+    text = " ".join(["Senior Staff Platform Engineer"] * 5000)
+    start = time.perf_counter()
+    assert extractor.extract(text) == "n-a"
+    assert time.perf_counter() - start < 0.5
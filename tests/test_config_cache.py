@@ -0,0 +1,49 @@
+import asyncio
+import json
+import os
+from jobber.config_cache import ConfigCache
+
+
+def _write(path, data, mtime_ns):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_unchanged_file_is_parsed_once(tmp_path):
+    path = tmp_path / "selectors.json"
+    _write(path, {"default": {"title": ["h1"]}}, 1_000_000_000)
+    parses = []
+
+    def parse(text):
+        parses.append(text)
+        return json.loads(text)
+
+    cache = ConfigCache()
+    first = asyncio.run(cache.get_async(path, parse))
+    second = asyncio.run(cache.get_async(str(path), parse))
+    assert first == second == {"default": {"title": ["h1"]}}
+    assert len(parses) == 1
+    assert cache.stats == {"hits": 1, "misses": 1, "reloads": 0}
+
+
+def test_edited_file_is_reloaded(tmp_path):
+    path = tmp_path / "profiles.json"
+    _write(path, {"headless": True}, 1_000_000_000)
+    cache = ConfigCache()
+    assert asyncio.run(cache.get_async(path, json.loads)) == {"headless": True}
+
+    _write(path, {"headless": False}, 2_000_000_000)
+    assert asyncio.run(cache.get_async(path, json.loads)) == {"headless": False}
+    assert cache.stats["reloads"] == 1
+
+
+def test_callers_get_their_own_copy(tmp_path):
+    path = tmp_path / "resume.json"
+    _write(path, {"work_experience": [{"bullets": ["a"]}]}, 1_000_000_000)
+    cache = ConfigCache()
+    resume = asyncio.run(cache.get_async(path, json.loads))
+    resume["work_experience"][0]["bullets"].append("tailored")
+
+    assert asyncio.run(cache.get_async(path, json.loads)) == {"work_experience": [{"bullets": ["a"]}]}
+    shared = asyncio.run(cache.get_async(path, json.loads, copy_value=None))
+    assert shared is asyncio.run(cache.get_async(path, json.loads, copy_value=None))
@@ -0,0 +1,146 @@
+import asyncio
+import http.client
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+from jobber.daemon import JobberDaemon
+from jobber import daemon_client
+from jobber.daemon_client import DaemonClient, DaemonError, load_daemon_token
+
+TOKEN = "test-token"
+
+
+class FakeTailor:
+    def __init__(self):
+        self.f_handler = SimpleNamespace(output_dir=Path("outputs"))
+        self.llm_client = SimpleNamespace(metrics=lambda: {"requests": 0})
+        self.scraper = SimpleNamespace(static_fetcher=SimpleNamespace(close=lambda: asyncio.sleep(0)))
+        self.resume_pdf_file_name = "Applicant_Resume.pdf"
+        self.most_recent_output_dir = None
+        self.most_recent_fit = None
+        self.duplicate_of = None
+        self.fit_to_page = False
+        self.write_html = True
+        self.clones = 0
+        self.requests = []
+
+    def clone(self):
+        self.clones += 1
+        return self
+
+    async def generate_tailored_resume_async(self, url, force_refresh=False):
+        self.requests.append((url, self.fit_to_page))
+        await asyncio.sleep(0.01)
+        if "broken" in url:
+            return False
+        self.most_recent_output_dir = url.rsplit("/", 1)[-1]
+        return True
+
+
+def test_daemon_tailors_requests_from_the_thin_client():
+    async def run():
+        tailor = FakeTailor()
+        daemon = JobberDaemon(tailor, "127.0.0.1", 0, TOKEN)
+        serving = asyncio.create_task(daemon.serve_async())
+        await daemon.wait_listening_async()
+        client = DaemonClient("127.0.0.1", daemon.port, timeout=5, token=TOKEN)
+
+        done = await asyncio.to_thread(client.tailor, "https://jobs.example.com/job-1", fit_page=True)
+        failed = await asyncio.to_thread(client.tailor, "https://jobs.example.com/broken")
+        status = await asyncio.to_thread(client.status)
+        with pytest.raises(DaemonError):
+            await asyncio.to_thread(client.request, "GET", "/nope")
+        await asyncio.to_thread(client.shutdown)
+        await asyncio.wait_for(serving, 5)
+        return tailor, done, failed, status
+
+    tailor, done, failed, status = asyncio.run(run())
+    assert done["status"] == "done"
+    assert done["result"]["output_dir"] == str(Path("outputs") / "job-1")
+    assert tailor.requests == [("https://jobs.example.com/job-1", True), ("https://jobs.example.com/broken", False)]
+    assert tailor.clones == 2
+    assert failed["status"] == "failed" and "result" not in failed
+    assert status["most_recent_output_dir"] == "job-1"
+    assert [job["status"] for job in status["jobs"]["finished"]] == ["failed", "done"]
+
+
+def test_client_reports_a_missing_daemon():
+    assert not DaemonClient("127.0.0.1", 1, timeout=1).is_running()
+
+
+def raw_request(port, headers, body=b'{"url": "https://jobs.example.com/job-1"}'):
+    """:return: status of a POST /tailor sent with exactly these headers (plus Host and Content-Length)"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request("POST", "/tailor", body=body, headers=headers)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_daemon_refuses_requests_a_web_page_could_send():
+    async def run():
+        tailor = FakeTailor()
+        daemon = JobberDaemon(tailor, "127.0.0.1", 0, TOKEN)
+        serving = asyncio.create_task(daemon.serve_async())
+        await daemon.wait_listening_async()
+        json_headers = {"Content-Type": "application/json", "X-Jobber-Token": TOKEN}
+        statuses = [
+            # A form or no-cors fetch can only send text/plain, form or multipart bodies
+            await asyncio.to_thread(raw_request, daemon.port, {"Content-Type": "text/plain", "X-Jobber-Token": TOKEN}),
+            await asyncio.to_thread(raw_request, daemon.port, {**json_headers, "Origin": "https://evil.example"}),
+            # DNS rebinding keeps the attacker's host name in the Host header
+            await asyncio.to_thread(raw_request, daemon.port, {**json_headers, "Host": f"evil.example:{daemon.port}"}),
+            await asyncio.to_thread(raw_request, daemon.port, {"Content-Type": "application/json"}),
+            await asyncio.to_thread(raw_request, daemon.port, {**json_headers, "X-Jobber-Token": "guess"}),
+        ]
+        await asyncio.to_thread(DaemonClient("127.0.0.1", daemon.port, timeout=5, token=TOKEN).shutdown)
+        await asyncio.wait_for(serving, 5)
+        return tailor, statuses
+
+    tailor, statuses = asyncio.run(run())
+    assert [status for status, _ in statuses] == [415, 403, 403, 401, 401]
+    assert all("error" in answer for _, answer in statuses)
+    assert tailor.requests == []
+
+
+def test_token_is_created_once_per_install(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon_client, "TOKEN_PATH", tmp_path / "daemon_token")
+    assert load_daemon_token() is None
+    token = load_daemon_token(create=True)
+    assert len(token) >= 32
+    assert load_daemon_token(create=True) == load_daemon_token() == token
+    if sys.platform != "win32":
+        assert (tmp_path / "daemon_token").stat().st_mode & 0o077 == 0
+
+
+def test_daemon_bounds_request_size_and_read_time():
+    async def send_raw(port, data):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(data)
+        await writer.drain()
+        answer = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return int(answer.split(b" ", 2)[1])
+
+    async def run():
+        daemon = JobberDaemon(FakeTailor(), "127.0.0.1", 0, TOKEN)
+        daemon.READ_TIMEOUT_SECONDS = 0.2
+        serving = asyncio.create_task(daemon.serve_async())
+        await daemon.wait_listening_async()
+        head = f"POST /tailor HTTP/1.1\r\nHost: 127.0.0.1:{daemon.port}\r\nContent-Type: application/json\r\nX-Jobber-Token: {TOKEN}\r\n"
+        statuses = [
+            # The oversized body is refused from its Content-Length, before anything is read or allocated
+            await send_raw(daemon.port, (head + f"Content-Length: {daemon.MAX_BODY_BYTES + 1}\r\n\r\n").encode()),
+            # A client that stops sending halfway is answered and disconnected
+            await send_raw(daemon.port, (head + "Content-Length: 100\r\n\r\n{").encode()),
+            await send_raw(daemon.port, head.encode()),
+        ]
+        await asyncio.to_thread(DaemonClient("127.0.0.1", daemon.port, timeout=5, token=TOKEN).shutdown)
+        await asyncio.wait_for(serving, 5)
+        return statuses
+
+    assert asyncio.run(run()) == [413, 408, 408]
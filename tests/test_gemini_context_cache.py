@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from google.genai import errors, types
+from jobber.gemini_context_cache import ResumeContextCache
+
+
+class FakePager:
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+class FakeCaches:
+    def __init__(self, fail_create=False, rate_limited=False):
+        self.created = []
+        self.updated = []
+        self.fail_create = fail_create
+        self.rate_limited = rate_limited
+
+    async def list(self):
+        return FakePager()
+
+    async def create(self, model, config):
+        if self.rate_limited:
+            raise errors.ClientError(429, {"error": {"message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}})
+        if self.fail_create:
+            raise errors.ClientError(400, {"error": {"message": "Cached content is too small"}})
+        cached = types.CachedContent(
+            name=f"cachedContents/{len(self.created)}",
+            display_name=config.display_name,
+            model=f"models/{model}",
+            expire_time=datetime.now(timezone.utc) + timedelta(seconds=60),
+        )
+        self.created.append(cached)
+        return cached
+
+    async def update(self, name, config):
+        self.updated.append(name)
+        return types.CachedContent(name=name, expire_time=datetime.now(timezone.utc) + timedelta(hours=1))
+
+
+class FakeClient:
+    def __init__(self, **kwargs):
+        self.caches = FakeCaches(**kwargs)
+
+
+def get_name(context_cache, client, instructions, payload):
+    return asyncio.run(context_cache.get_cache_name_async(client, instructions, payload))
+
+
+def test_cache_is_created_once_and_refreshed_near_expiry():
+    client = FakeClient()
+    context_cache = ResumeContextCache("gemini-2.5-flash", refresh_margin_seconds=300)
+    name = get_name(context_cache, client, "instructions", {"skills": ["python"]})
+    # The fake cache expires in 60s which is inside the refresh margin, so the next lookup extends it
+    assert get_name(context_cache, client, "instructions", {"skills": ["python"]}) == name
+    assert len(client.caches.created) == 1
+    assert client.caches.updated == [name]
+    assert get_name(context_cache, client, "instructions", {"skills": ["sql"]}) != name
+
+
+def test_rejected_cache_falls_back_without_retrying():
+    client = FakeClient(fail_create=True)
+    context_cache = ResumeContextCache("gemini-2.5-flash")
+    assert get_name(context_cache, client, "instructions", {"skills": []}) is None
+    client.caches.fail_create = False
+    assert get_name(context_cache, client, "instructions", {"skills": []}) is None
+    assert client.caches.created == []
+
+
+def test_rate_limited_cache_is_retried_on_the_next_call():
+    client = FakeClient(rate_limited=True)
+    context_cache = ResumeContextCache("gemini-2.5-flash")
+    assert get_name(context_cache, client, "instructions", {"skills": []}) is None
+    client.caches.rate_limited = False
+    assert get_name(context_cache, client, "instructions", {"skills": []}) is not None
+    assert len(client.caches.created) == 1
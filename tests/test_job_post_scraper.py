@@ -0,0 +1,148 @@
+import asyncio
+import json
+import shutil
+import subprocess
+from pathlib import Path
+import pytest
+from jobber.job_post_scraper import EXTRACT_FIELDS_SCRIPT, JobPostScraper
+from jobber.posting_cache import PostingCache
+from jobber.selector_registry import SelectorRegistry
+
+
+def run_extract_script(elements, fields):
+    """Runs EXTRACT_FIELDS_SCRIPT in node against a document holding {selector: text content}"""
+    program = (
+        f"const elements = {json.dumps(elements)};\n"
+        "const document = {querySelector(selector) {\n"
+        "    if (selector.includes('[[')) throw new SyntaxError('invalid selector');\n"
+        "    return selector in elements ? {textContent: elements[selector]} : null;\n"
+        "}};\n"
+        f"console.log(JSON.stringify(({EXTRACT_FIELDS_SCRIPT})({json.dumps(fields)})));\n"
+    )
+    return json.loads(subprocess.run(["node", "-e", program], capture_output=True, text=True, check=True).stdout)
+
+
+class FakeFrame:
+    """Answers EXTRACT_FIELDS_SCRIPT like the browser would, elements can show up after some evaluations"""
+    def __init__(self, url, elements=None, appear_after=None):
+        self.url = url
+        self.elements = elements or {}
+        self.appear_after = appear_after or {}  # selector -> evaluations before it is in the DOM
+        self.requests = []  # fields asked for in each evaluation
+
+    async def evaluate(self, script, fields):
+        assert script == EXTRACT_FIELDS_SCRIPT
+        self.requests.append(sorted(fields))
+        results = {}
+        for field, selectors in fields.items():
+            results[field] = None
+            for selector in selectors:
+                text = self.elements.get(selector, "").strip()
+                if text and len(self.requests) > self.appear_after.get(selector, 0):
+                    results[field] = {"selector": selector, "text": text}
+                    break
+        return results
+
+
+class FakePage:
+    def __init__(self, *frames):
+        self.frames = list(frames)
+        self.main_frame = self.frames[0]
+
+
+def extract(page, selectors, timeout=1.0):
+    return asyncio.run(JobPostScraper()._extract_all_job_data(page, selectors, timeout=timeout, poll_interval=0.01))
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the extraction script")
+def test_extract_script_takes_the_first_selector_with_text():
+    elements = {".title": "   ", "h1": "Backend Engineer", "h2": "Other", ".desc": "Build APIs\n"}
+    fields = {"job_title": ["[[bad", ".title", "h1", "h2"], "job_desc": [".missing", ".desc"], "job_loc": [".loc"]}
+
+    assert run_extract_script(elements, fields) == {
+        "job_title": {"selector": "h1", "text": "Backend Engineer"},
+        "job_desc": {"selector": ".desc", "text": "Build APIs"},
+        "job_loc": None,
+    }
+
+
+def test_selectors_are_tried_in_priority_order():
+    page = FakePage(FakeFrame("main", {".title": "Staff Engineer", "h1": "Acme Careers", ".desc": "Build APIs"}))
+    job_data = extract(page, {"job_title": ["", ".title", "h1"], "job_desc": [".desc"]})
+
+    assert job_data == {"job_title": "Staff Engineer", "job_desc": "Build APIs"}
+
+
+def test_main_frame_beats_iframes():
+    main = FakeFrame("main", {".desc": "Main description"})
+    iframe = FakeFrame("iframe", {".desc": "Embedded description", ".title": "Embedded title"})
+    job_data = extract(FakePage(main, iframe), {"job_title": [".title"], "job_desc": [".desc"]})
+
+    assert job_data == {"job_title": "Embedded title", "job_desc": "Main description"}
+    # The iframe is only asked for what the main page didn't have
+    assert iframe.requests == [["job_title"]]
+
+
+def test_polls_only_while_the_description_is_missing():
+    frame = FakeFrame("main", {".title": "Engineer", ".desc": "Build APIs"}, appear_after={".desc": 2})
+    job_data = extract(FakePage(frame), {"job_title": [".title"], "job_desc": [".desc"], "job_loc": [".loc"]})
+
+    assert job_data == {"job_title": "Engineer", "job_desc": "Build APIs", "job_loc": "n-a"}
+    # Polling stops once the description matched, without waiting for the location to show up
+    assert frame.requests == [["job_desc", "job_loc", "job_title"], ["job_desc", "job_loc"], ["job_desc", "job_loc"]]
+
+    frame = FakeFrame("main", {".desc": "Build APIs"})
+    assert extract(FakePage(frame), {"job_title": [".title"], "job_desc": [".desc"]})["job_title"] == "n-a"
+    assert len(frame.requests) == 1
+
+
+def test_gives_up_on_a_missing_description_at_the_timeout():
+    frame = FakeFrame("main", {".title": "Engineer"})
+    job_data = extract(FakePage(frame), {"job_title": [".title"], "job_desc": [".desc"]}, timeout=0.05)
+
+    assert job_data == {"job_title": "Engineer", "job_desc": "n-a"}
+    assert 1 < len(frame.requests) < 20
+
+
+class FakeStaticFetcher:
+    def __init__(self, job_data):
+        self.job_data = job_data
+
+    async def fetch_async(self, url, compiled_selectors):
+        return dict(self.job_data)
+
+
+def make_scraper(tmp_path, static_data):
+    config_path = Path(__file__).resolve().parent.parent / "configs" / "job_app_selectors.json"
+    scraper = JobPostScraper()
+    scraper.selector_registry = SelectorRegistry(json.loads(config_path.read_text()))
+    scraper.posting_cache = PostingCache(tmp_path / "postings.sqlite3")
+    scraper.static_fetcher = FakeStaticFetcher(static_data)
+    scraper.scrape_profiles = {}
+    scraper.browser_calls = []
+
+    async def scrape_with_browser(url, selector_list, profile, max_retries, delay):
+        scraper.browser_calls.append(url)
+        return scraper._apply_job_data({"job_title": "Rendered title", "job_loc": "Remote", "job_desc": "Rendered description"})
+    scraper._scrape_with_browser_async = scrape_with_browser
+    return scraper
+
+
+def scrape(scraper, url):
+    return asyncio.run(scraper._scrape_job_posting_async(url, scraper._get_domain_key(url), 1, 0, True))
+
+
+def test_static_html_is_used_only_when_every_configured_field_matched(tmp_path):
+    url = "https://job-boards.greenhouse.io/acme/jobs/1"
+    scraper = make_scraper(tmp_path, {"job_title": "Engineer", "job_loc": "NYC", "job_desc": "Build APIs"})
+    assert scrape(scraper, url) == "static"
+    assert scraper.browser_calls == []
+
+    scraper = make_scraper(tmp_path, {"job_title": "n-a", "job_loc": "NYC", "job_desc": "Build APIs"})
+    assert scrape(scraper, url) == "browser"
+    assert scraper.browser_calls == [url]
+    assert scraper.job_title == "Rendered title"
+
+    # The default domain has no usable location selectors, so a missing location doesn't need the browser
+    scraper = make_scraper(tmp_path, {"job_title": "Engineer", "job_loc": "n-a", "job_desc": "Build APIs"})
+    assert scrape(scraper, "https://careers.example.com/jobs/1") == "static"
@@ -0,0 +1,66 @@
+import asyncio
+from jobber.job_queue import JobQueue
+
+
+def test_jobs_run_one_at_a_time_in_order():
+    async def run():
+        order, active, peak = [], 0, 0
+
+        async def work(n):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            order.append(n)
+            active -= 1
+            return True
+
+        queue = JobQueue(maxsize=10)
+        jobs = [queue.submit(f"job {n}", lambda n=n: work(n)) for n in range(4)]
+        await queue.close()
+        return order, peak, jobs
+
+    order, peak, jobs = asyncio.run(run())
+    assert order == [0, 1, 2, 3]
+    assert peak == 1
+    assert all(job.status == "done" for job in jobs)
+
+
+def test_rejects_duplicates_and_overflow_without_blocking():
+    async def run():
+        statuses = []
+        queue = JobQueue(maxsize=1, on_status=lambda job: statuses.append((job.id, job.status)))
+        release = asyncio.Event()
+        first = queue.submit("first", release.wait, key="a")
+        await asyncio.sleep(0)  # first starts running
+        duplicate = queue.submit("first again", release.wait, key="a")
+        second = queue.submit("second", release.wait, key="b")
+        overflow = queue.submit("third", release.wait, key="c")
+        release.set()
+        await queue.close()
+        return first, duplicate, second, overflow, statuses
+
+    first, duplicate, second, overflow, statuses = asyncio.run(run())
+    assert duplicate is None and overflow is None
+    assert [status for job_id, status in statuses if job_id == first.id] == ["queued", "running", "done"]
+    assert second.status == "done"
+
+
+def test_failures_are_reported_and_later_jobs_still_run():
+    async def run():
+        async def boom():
+            raise RuntimeError("no posting")
+
+        async def fails():
+            return False
+
+        queue = JobQueue()
+        jobs = [queue.submit("boom", boom), queue.submit("fails", fails), queue.submit("ok", lambda: asyncio.sleep(0, "pdf"))]
+        await queue.close()
+        return jobs, queue.status()
+
+    (boom, fails, ok), status = asyncio.run(run())
+    assert (boom.status, boom.error) == ("failed", "RuntimeError: no posting")
+    assert fails.status == "failed"
+    assert (ok.status, ok.result) == ("done", "pdf")
+    assert [job["name"] for job in status["finished"]] == ["ok", "fails", "boom"]
@@ -0,0 +1,59 @@
+import json
+import pytest
+from jobber.json_stream import IncrementalJSONParser, MalformedJSONError, TailoredResumeStreamParser
+
+RESPONSE = json.dumps({
+    "work_experience": {
+        "experience_1": {"title": "Engineer", "responsibilities": ["Built things", "Fixed \"quoted\" things"]},
+        "experience_2": {"title": "Intern", "responsibilities": ["Learned, a lot"]},
+    },
+    "skills": {"coding_languages": ["Python"], "softwares": []},
+    "score": -1.5e3,
+    "remote": True,
+})
+
+
+def feed_in_chunks(parser, text, size):
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+
+
+@pytest.mark.parametrize("size", [1, 7, len(RESPONSE)])
+def test_reports_watched_values_as_they_close(size):
+    seen = []
+    parser = IncrementalJSONParser(lambda path, value: seen.append((path, value)), watch=lambda path: len(path) == 2)
+    feed_in_chunks(parser, "```json\n" + RESPONSE + "\n```", size)
+    assert parser.finish() == json.loads(RESPONSE)
+    assert [path for path, _ in seen] == [
+        ("work_experience", "experience_1"), ("work_experience", "experience_2"), ("skills", "coding_languages"), ("skills", "softwares"),
+    ]
+    assert seen[0][1]["responsibilities"][1] == 'Fixed "quoted" things'
+
+
+def test_first_entry_is_reported_before_the_response_ends():
+    parser = TailoredResumeStreamParser()
+    cutoff = RESPONSE.index('"experience_2"')
+    parser.feed(RESPONSE[:cutoff])
+    assert list(parser.entries) == ["experience_1"]
+    assert parser.first_entry_seconds is not None
+    parser.feed(RESPONSE[cutoff:])
+    assert parser.finish()["skills"]["coding_languages"] == ["Python"]
+
+
+@pytest.mark.parametrize("text", [
+    "Sure! Here is the json",
+    '{"work_experience": {"experience_1": {"title": "Engineer", "responsibilities": []}',
+    '{"work_experience": {"experience_1" "title"',
+    '{"work_experience": {"experience_1": {"title": "Engineer"] ',
+])
+def test_malformed_output_fails_before_the_response_ends(text):
+    parser = TailoredResumeStreamParser()
+    with pytest.raises(MalformedJSONError):
+        parser.feed(text)
+
+
+def test_truncated_response_fails_on_finish():
+    parser = TailoredResumeStreamParser()
+    parser.feed(RESPONSE[:-10])
+    with pytest.raises(MalformedJSONError):
+        parser.finish()
@@ -0,0 +1,27 @@
+from jobber.llm_cache import LLMResponseCache, make_cache_key
+
+
+def test_cache_key_ignores_dict_ordering_but_not_content():
+    a = make_cache_key(model="m", resume={"a": 1, "b": 2}, job_desc="desc")
+    b = make_cache_key(job_desc="desc", resume={"b": 2, "a": 1}, model="m")
+    assert a == b
+    assert a != make_cache_key(model="m", resume={"a": 1, "b": 2}, job_desc="other desc")
+
+
+def test_cache_hit_miss_stats(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3")
+    assert cache.get("missing") is None
+    cache.put("key", {"work_experience": {}})
+    assert cache.get("key") == {"work_experience": {}}
+    assert cache.metrics() == {"hits": 1, "misses": 1, "evictions": 0, "hit_rate": 0.5, "entries": 1}
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", max_entries=2)
+    cache.put("first", {"n": 1})
+    cache.put("second", {"n": 2})
+    cache.get("first")  # "second" is now the least recently used
+    cache.put("third", {"n": 3})
+    assert cache.get("second") is None
+    assert cache.get("first") == {"n": 1}
+    assert cache.stats["evictions"] == 1
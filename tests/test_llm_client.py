@@ -0,0 +1,124 @@
+import asyncio
+import json
+import pytest
+from google.genai import errors, types
+from jobber.llm_client import LLMClient, MalformedJSONError, TokenBucket
+
+
+class FakeModels:
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return types.GenerateContentResponse(
+            usage_metadata=types.GenerateContentResponseUsageMetadata(total_token_count=10)
+        )
+
+
+class FakeStreamingModels:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+        self.chunks_sent = 0
+        self.open_streams = 0
+        self.open_at_call = []  # streams still open whenever a new one was requested
+
+    async def generate_content_stream(self, model, contents, config):
+        self.calls += 1
+        self.open_at_call.append(self.open_streams)
+        self.open_streams += 1
+        text = self.responses.pop(0)
+
+        async def chunks():
+            try:
+                for i in range(0, len(text), 5):
+                    self.chunks_sent += 1
+                    yield types.GenerateContentResponse(
+                        candidates=[types.Candidate(content=types.Content(parts=[types.Part(text=text[i:i + 5])]))]
+                    )
+            finally:
+                self.open_streams -= 1
+        return chunks()
+
+
+class FakeParser:
+    """Rejects anything that isn't an object as soon as the first chunk arrives"""
+    def reset(self):
+        self.text = ""
+
+    def feed(self, chunk):
+        self.text += chunk
+        if not self.text.startswith("{"):
+            raise MalformedJSONError("not an object")
+
+    def finish(self):
+        return json.loads(self.text)
+
+
+class FakeAsyncClient:
+    def __init__(self, failures=()):
+        self.models = FakeModels(failures)
+
+
+def make_client(failures=()):
+    client = LLMClient({"base_delay": 0.001, "max_delay": 0.001, "requests_per_minute": 6000})
+    client._client = FakeAsyncClient(failures)
+    return client
+
+
+VALID_RESPONSE = '{"title": "Engineer"}'
+
+
+def test_retries_rate_limits_and_server_errors():
+    client = make_client([
+        errors.ClientError(429, {"error": {"message": "quota"}}),
+        errors.ServerError(503, {"error": {"message": "overloaded"}}),
+    ])
+    asyncio.run(client.generate_content_async("prompt"))
+    assert client.client.models.calls == 3
+    assert client.metrics()["rate_limited"] == 1
+    assert client.metrics()["retries"] == 2
+
+
+def test_does_not_retry_bad_requests():
+    client = make_client([errors.ClientError(400, {"error": {"message": "bad"}})])
+    with pytest.raises(errors.ClientError):
+        asyncio.run(client.generate_content_async("prompt"))
+    assert client.client.models.calls == 1
+
+
+def test_token_bucket_waits_once_budget_is_spent():
+    async def run():
+        bucket = TokenBucket(per_minute=600)  # refills 10 tokens per second
+        await bucket.acquire(600)
+        start = asyncio.get_running_loop().time()
+        await bucket.acquire(1)
+        return bucket, asyncio.get_running_loop().time() - start
+
+    bucket, waited = asyncio.run(run())
+    assert bucket.waits == 1
+    assert 0.05 <= waited < 1
+
+
+def test_stream_retries_malformed_output_without_reading_the_rest():
+    client = make_client()
+    models = FakeStreamingModels(["I cannot help with that" + " padding" * 100, VALID_RESPONSE])
+    client.client.models = models
+    result, _ = asyncio.run(client.stream_content_async("prompt", FakeParser()))
+    assert result["title"] == "Engineer"
+    assert models.calls == 2
+    assert models.chunks_sent == 1 + -(-len(VALID_RESPONSE) // 5)  # the bad answer was dropped after its first chunk
+    assert models.open_at_call == [0, 0]  # and its stream was closed before the retry
+    assert client.metrics()["malformed"] == 1
+
+
+def test_stream_gives_up_after_max_retries():
+    client = make_client()
+    client.client.models = FakeStreamingModels(["[]"] * 2)
+    with pytest.raises(MalformedJSONError):
+        asyncio.run(client.stream_content_async("prompt", FakeParser(), max_retries=2))
+    assert client.metrics()["malformed"] == 2
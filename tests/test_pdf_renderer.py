@@ -0,0 +1,108 @@
+import asyncio
+import base64
+from contextlib import asynccontextmanager
+from jobber.pdf_renderer import PdfRenderer, MEASURE_SCRIPT, DROP_BULLET_SCRIPT, PAGE_WIDTH_PX
+
+
+class FakeCDPSession:
+    def __init__(self, page):
+        self.page = page
+        self.detached = False
+
+    async def send(self, method, params):
+        assert method == "Page.printToPDF"
+        self.page.printed_scale = params["scale"]
+        return {"data": base64.b64encode(b"%PDF " + self.page.html.encode()).decode()}
+
+    async def detach(self):
+        self.detached = True
+
+
+class FakeContext:
+    async def new_cdp_session(self, page):
+        page.session = FakeCDPSession(page)
+        return page.session
+
+
+class FakePage:
+    """Lays out as a header plus bullets that wrap less as the viewport gets wider"""
+    def __init__(self, bullets=(), bullet_height=60):
+        self.context = FakeContext()
+        self.html = None
+        self.bullets = list(bullets)
+        self.bullet_height = bullet_height
+        self.viewport_size = {"width": 1280, "height": 720}
+
+    async def set_content(self, html, wait_until=None):
+        self.html = html
+
+    async def content(self):
+        return self.html
+
+    async def set_viewport_size(self, size):
+        self.viewport_size = size
+
+    async def evaluate(self, script, arg=None):
+        if script == MEASURE_SCRIPT:
+            return 200 + len(self.bullets) * self.bullet_height * PAGE_WIDTH_PX / self.viewport_size["width"]
+        if script == DROP_BULLET_SCRIPT:
+            return self.bullets.pop() if len(self.bullets) > arg else None
+        return None
+
+
+class FakePool:
+    def __init__(self, page=None):
+        self.page = page or FakePage()
+
+    @asynccontextmanager
+    async def lease(self):
+        yield self.page
+
+
+def test_render_returns_pdf_bytes_without_touching_disk():
+    pool = FakePool()
+    pdf = asyncio.run(PdfRenderer(pool).render_async("<p>resume</p>".encode()))
+    assert pdf == b"%PDF <p>resume</p>"
+    assert pool.page.session.detached
+
+
+def test_render_failure_returns_none():
+    class BrokenPool(FakePool):
+        @asynccontextmanager
+        async def lease(self):
+            raise RuntimeError("browser crashed")
+            yield
+
+    assert asyncio.run(PdfRenderer(BrokenPool()).render_async("<p>resume</p>")) is None
+
+
+def test_fit_leaves_short_resume_alone():
+    pool = FakePool(FakePage(bullets=["a"] * 5))
+    result = asyncio.run(PdfRenderer(pool).render_fit_async("<p>resume</p>"))
+    assert (result.fits, result.scale, result.iterations, result.dropped_bullets) == (True, 1.0, 1, [])
+    assert pool.page.printed_scale == 1.0
+    assert pool.page.viewport_size == {"width": 1280, "height": 720}
+
+
+def test_fit_shrinks_scale_before_dropping_bullets():
+    # 200 + 15 * 60 = 1100px at scale 1, fits once the scale drops a little
+    pool = FakePool(FakePage(bullets=["a"] * 15))
+    result = asyncio.run(PdfRenderer(pool).render_fit_async("<p>resume</p>", precision=0.01))
+    assert result.fits and result.dropped_bullets == []
+    assert 0.85 <= result.scale < 1.0
+    assert pool.page.printed_scale == result.scale
+    assert result.iterations > 2
+
+
+def test_fit_drops_lowest_ranked_bullets_when_scale_is_not_enough():
+    pool = FakePool(FakePage(bullets=[f"bullet {i}" for i in range(20)], bullet_height=70))
+    result = asyncio.run(PdfRenderer(pool).render_fit_async("<p>resume</p>", min_scale=0.9))
+    assert result.fits
+    assert result.dropped_bullets == [f"bullet {i}" for i in range(19, 19 - len(result.dropped_bullets), -1)]
+    assert len(result.dropped_bullets) > 0
+
+
+def test_fit_reports_overflow_when_nothing_left_to_drop():
+    pool = FakePool(FakePage(bullets=["a"] * 30))
+    result = asyncio.run(PdfRenderer(pool).render_fit_async("<p>resume</p>", min_bullets=30))
+    assert not result.fits and result.scale == 0.85 and result.pdf
@@ -0,0 +1,85 @@
+import asyncio
+from jobber.pipeline import Pipeline, Stage
+
+
+def run_all(pipeline, items):
+    async def run():
+        return [job async for job in pipeline.run(items)]
+    return asyncio.run(run())
+
+
+def test_stages_overlap_across_jobs():
+    log = []
+
+    def stage(name, seconds):
+        async def func(job):
+            log.append((name, job.key, "start"))
+            await asyncio.sleep(seconds)
+            log.append((name, job.key, "end"))
+            return True
+        return func
+
+    pipeline = Pipeline([Stage("scrape", stage("scrape", 0.01)), Stage("llm", stage("llm", 0.03))])
+    jobs = run_all(pipeline, [("a", None), ("b", None)])
+
+    assert all(job.success for job in jobs)
+    # b is scraped while a is still in the llm stage
+    assert log.index(("scrape", "b", "end")) < log.index(("llm", "a", "end"))
+    assert set(jobs[0].stage_seconds) == {"scrape", "llm"}
+
+
+def test_full_queue_blocks_earlier_stage():
+    state = {"scraped": 0, "max_ahead": 0, "rendered": 0}
+
+    async def scrape(job):
+        state["scraped"] += 1
+        state["max_ahead"] = max(state["max_ahead"], state["scraped"] - state["rendered"])
+        return True
+
+    async def render(job):
+        await asyncio.sleep(0.01)
+        state["rendered"] += 1
+        return True
+
+    pipeline = Pipeline([Stage("scrape", scrape, workers=1), Stage("render", render, workers=1)], queue_size=1)
+    jobs = run_all(pipeline, [(str(i), None) for i in range(6)])
+
+    assert len(jobs) == 6 and all(job.success for job in jobs)
+    # one being rendered, one waiting in the render queue, one scraped and blocked on the full queue
+    assert state["max_ahead"] <= 3
+
+
+def test_cancel_running_and_queued_jobs():
+    pipeline = Pipeline([Stage("slow", lambda job: asyncio.sleep(10, result=True))])
+
+    async def run():
+        results = []
+        async for job in pipeline.run([("running", None), ("queued", None), ("other", None)]):
+            results.append(job)
+        return results
+
+    async def main():
+        task = asyncio.create_task(run())
+        await asyncio.sleep(0.01)
+        assert pipeline.cancel("running")
+        assert pipeline.cancel("queued")
+        assert not pipeline.cancel("missing")
+        await asyncio.sleep(0.01)
+        pipeline.cancel("other")
+        return await task
+
+    jobs = asyncio.run(main())
+    assert {job.key for job in jobs} == {"running", "queued", "other"}
+    assert all(job.cancelled and not job.success for job in jobs)
+    assert pipeline.jobs == []
+
+
+def test_exceptions_fail_only_that_job():
+    async def stage(job):
+        if job.key == "bad":
+            raise ValueError("boom")
+        return True
+
+    jobs = {job.key: job for job in run_all(Pipeline([Stage("only", stage, workers=2)]), [("good", None), ("bad", None)])}
+    assert jobs["good"].success
+    assert (jobs["bad"].success, jobs["bad"].error, jobs["bad"].stage) == (False, "boom", "only")
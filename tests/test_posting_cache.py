@@ -0,0 +1,32 @@
+import pytest
+from jobber.posting_cache import PostingCache, normalize_url
+
+
+@pytest.fixture
+def posting():
+    return {
+        "job_title": "Software Engineer",
+        "job_location": "New York, NY",
+        "job_description": "Build things",
+        "company_name": "Acme",
+    }
+
+
+def test_normalize_url_drops_tracking_and_keeps_job_ids():
+    a = normalize_url("https://WWW.Greenhouse.io/acme/jobs/123/?utm_source=linkedin&gh_jid=123&source=LinkedIn#apply")
+    b = normalize_url("https://greenhouse.io/acme/jobs/123?gh_jid=123")
+    assert a == b == "https://greenhouse.io/acme/jobs/123?gh_jid=123"
+    assert normalize_url("https://x.com/jobs?currentJobId=1") != normalize_url("https://x.com/jobs?currentJobId=2")
+
+
+def test_cache_round_trip_by_normalized_url(tmp_path, posting):
+    cache = PostingCache(tmp_path / "postings.sqlite3")
+    cache.put("https://www.example.com/job/1/?utm_campaign=x", posting)
+    assert cache.get("https://example.com/job/1") == posting
+    assert cache.get("https://example.com/job/2") is None
+
+
+def test_cache_entries_expire_after_ttl(tmp_path, posting):
+    cache = PostingCache(tmp_path / "postings.sqlite3", ttl=-1)
+    cache.put("https://example.com/job/1", posting)
+    assert cache.get("https://example.com/job/1") is None
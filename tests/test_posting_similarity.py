@@ -0,0 +1,35 @@
+import random
+from jobber.posting_similarity import PostingSimilarityIndex, estimate_similarity, minhash_signature, shingle_hashes
+
+WORDS = "python backend engineer team build scalable services kafka postgres aws remote salary benefits mentor ship".split()
+
+
+def _description(seed: int, words: int = 300) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def test_signature_estimates_jaccard_similarity():
+    original = _description(1)
+    edited = original + " We are an equal opportunity employer. Apply on our careers page!"
+    a, b = shingle_hashes(original), shingle_hashes(edited)
+    jaccard = len(a & b) / len(a | b)
+
+    assert estimate_similarity(minhash_signature(a), minhash_signature(a)) == 1.0
+    assert abs(estimate_similarity(minhash_signature(a), minhash_signature(b)) - jaccard) < 0.1
+    assert estimate_similarity(minhash_signature(a), minhash_signature(shingle_hashes(_description(2)))) < 0.2
+    assert minhash_signature(shingle_hashes("  ...  ")) is None
+
+
+def test_finds_reposts_for_the_same_inputs_only(tmp_path):
+    index = PostingSimilarityIndex(tmp_path / "posting_similarity.sqlite3", threshold=0.8)
+    original = _description(1)
+    index.add(index.signature(original), "resume-v1", "2025-07-01_09-00_acme_backend", url="https://acme.com/jobs/1", company="Acme")
+    index.add(index.signature(_description(2)), "resume-v1", "2025-07-01_09-05_globex_backend")
+
+    repost = "Posted via LinkedIn. " + original.upper() + " Easy apply."
+    match = index.find(index.signature(repost), "resume-v1")
+    assert match["output_dir"] == "2025-07-01_09-00_acme_backend"
+    assert match["similarity"] >= 0.8
+    assert index.find(index.signature(repost), "resume-v2") is None
+    assert index.find(index.signature(_description(3)), "resume-v1") is None
@@ -0,0 +1,41 @@
+from jobber.relevance_ranker import ResumeRelevanceIndex, tokenize
+
+PAYLOAD = {
+    "work_experience": {
+        "experience_1": {"title": "Software Engineer", "responsibilities": [
+            "Built REST APIs in Python with Django",
+            "Tuned PostgreSQL queries for reporting",
+            "Organized the team offsite",
+            "Set up CI pipelines",
+        ]},
+        "experience_2": {"title": "Data Contributor", "responsibilities": [
+            "Recorded voice samples",
+            "Labeled images in Photoshop",
+            "Reviewed generated videos",
+        ]},
+    },
+    "skills": {
+        "coding_languages": ["Java", "Python", "C#", "SQL"],
+        "softwares": ["Unity", "AWS", "Jira"],
+    },
+}
+
+
+def test_tokenize_keeps_tech_names_and_drops_stopwords():
+    assert tokenize("We use C#, Node.js and REST APIs") == ["c#", "node.js", "rest", "api"]
+
+
+def test_shortlist_keeps_the_best_bullets_and_every_role():
+    index = ResumeRelevanceIndex(PAYLOAD)
+    shortlist = index.shortlist("Backend Python engineer building REST APIs, SQL on PostgreSQL, hosted on AWS",
+                                max_bullets=4, min_per_role=1, max_skills_per_category=2)
+
+    assert shortlist.payload["work_experience"]["experience_1"]["responsibilities"][:2] == [
+        "Built REST APIs in Python with Django", "Tuned PostgreSQL queries for reporting",
+    ]
+    assert len(shortlist.payload["work_experience"]["experience_2"]["responsibilities"]) == 1
+    assert shortlist.sent_bullets == 4 and shortlist.total_bullets == 7
+    assert shortlist.payload["skills"] == {"coding_languages": ["Python", "SQL"], "softwares": ["AWS", "Unity"]}
+    # Every score is kept, not only the ones that were sent
+    assert len(shortlist.to_dict()["bullets"]["experience_1"]) == 4
+    assert shortlist.bullet_scores["experience_1"][0][0] > shortlist.bullet_scores["experience_1"][-1][0]
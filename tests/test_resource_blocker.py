@@ -0,0 +1,60 @@
+import asyncio
+from jobber.resource_blocker import ResourceBlocker
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type, navigation=False):
+        self.url = url
+        self.resource_type = resource_type
+        self.navigation = navigation
+
+    def is_navigation_request(self):
+        return self.navigation
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class FakeResponse:
+    def __init__(self, content_length=None):
+        self.headers = {"content-length": content_length} if content_length is not None else {}
+
+
+def route(blocker, url, resource_type, navigation=False):
+    fake_route = FakeRoute(FakeRequest(url, resource_type, navigation))
+    asyncio.run(blocker._handle_route(fake_route))
+    return fake_route.outcome
+
+
+def test_blocks_by_type_and_domain_but_never_navigations():
+    blocker = ResourceBlocker({"blocked_resource_types": ["image", "font"], "blocked_domains": ["facebook.com"]})
+
+    assert route(blocker, "https://boards.greenhouse.io/logo.png", "image") == "aborted"
+    assert route(blocker, "https://boards.greenhouse.io/font.woff2", "font") == "aborted"
+    assert route(blocker, "https://connect.facebook.com/sdk.js", "script") == "aborted"
+    assert route(blocker, "https://facebook.com/tr", "xhr") == "aborted"
+    assert route(blocker, "https://notfacebook.com/app.js", "script") == "continued"
+    assert route(blocker, "https://boards.greenhouse.io/app.js", "script") == "continued"
+    # A posting iframe (or redirect) on a blocked domain still loads
+    assert route(blocker, "https://www.facebook.com/careers/job/1", "document", navigation=True) == "continued"
+
+    assert blocker.stats["blocked_requests"] == 4
+    assert blocker.stats["blocked_by_type"] == {"image": 1, "font": 1, "script": 1, "xhr": 1}
+
+
+def test_counts_loaded_responses():
+    blocker = ResourceBlocker({})
+    for response in (FakeResponse("1024"), FakeResponse(None), FakeResponse("chunked")):
+        blocker._on_response(response)
+
+    assert blocker.stats["loaded_requests"] == 3
+    assert blocker.stats["loaded_bytes"] == 1024
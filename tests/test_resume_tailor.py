@@ -1,6 +1,11 @@
+import asyncio
+from types import SimpleNamespace
 from bs4 import BeautifulSoup
 import pytest
+from jobber.llm_client import DEFAULT_LLM_CONFIG
+from jobber.relevance_ranker import ResumeRelevanceIndex
 from jobber.resume_tailor import ResumeTailor
+from jobber.stage_limits import StageLimits
 
 @pytest.fixture
 def base_resume():
@@ -40,4 +45,86 @@ def test_update_partial_title_match(base_resume):
     result = tailor._update_work_exp(updated)
     assert result is True
     assert base_resume["data"]["work_experience"][0]["responsibilities"] == ["Updated A"]
-    assert base_resume["data"]["work_experience"][1]["responsibilities"] == ["Old task B"]
\ No newline at end of file
+    assert base_resume["data"]["work_experience"][1]["responsibilities"] == ["Old task B"]
+
+def test_clone_with_an_edited_resume_builds_its_own_relevance_index():
+    def resume(bullet):
+        return {"data": {
+            "contact_info": {"name": "Jackie Ling"},
+            "work_experience": {"experience_1": {"title": "Engineer", "responsibilities": [bullet]}},
+            "skills": {"coding_languages": ["Python"], "softwares": ["AWS"]},
+        }}
+    tailor = ResumeTailor(resume("Built REST APIs"), BeautifulSoup("", "html.parser"))
+    tailor.scraper = SimpleNamespace(clone=lambda: tailor.scraper)
+    tailor.resume_index = ResumeRelevanceIndex(tailor._extract_exp_payload())
+
+    assert tailor.clone().resume_index is tailor.resume_index
+    edited = tailor.clone(resume=resume("Tuned PostgreSQL queries"))
+    assert edited.resume_index is not tailor.resume_index
+    assert [bullet for _, _, bullet in edited.resume_index.bullets] == ["Tuned PostgreSQL queries"]
+    assert edited.clone().resume_index is edited.resume_index
+    # Concurrent jobs run on clones, so they all have to share one set of stage limits
+    tailor.limits = StageLimits(max_renders=1)
+    assert tailor.clone().limits is tailor.limits
+    assert tailor.clone(resume=resume("Set up CI")).limits is tailor.limits
+
+
+class FakeLLMClient:
+    def __init__(self, **config):
+        self.config = {**DEFAULT_LLM_CONFIG, "stream": False, **config}
+        self.model = "fake-model"
+        self.client = None
+        self.calls = []
+
+    async def generate_content_async(self, contents, config=None, max_retries=None, base_delay=None):
+        self.calls.append({"contents": contents, "config": config, "max_retries": max_retries, "base_delay": base_delay})
+        return SimpleNamespace(text='{"work_experience": {}}', usage_metadata=None)
+
+    def metrics(self):
+        return {}
+
+
+def make_tailor(**llm_config):
+    resume = {"data": {
+        "contact_info": {"name": "Jackie Ling"},
+        "work_experience": {"experience_1": {"title": "Engineer", "responsibilities": ["Built REST APIs", "Tuned SQL"]}},
+        "skills": {"coding_languages": ["Python"], "softwares": ["AWS"]},
+    }}
+    tailor = ResumeTailor(resume, BeautifulSoup("", "html.parser"))
+    tailor.llm_client = FakeLLMClient(**llm_config)
+    return tailor
+
+
+def test_llm_retries_come_from_the_llm_config():
+    tailor = make_tailor()
+    assert asyncio.run(tailor._get_tailored_work_exp_async("Python backend role")) == {"work_experience": {}}
+    # None lets LLMClient apply max_retries / base_delay from llm_config.json
+    assert (tailor.llm_client.calls[0]["max_retries"], tailor.llm_client.calls[0]["base_delay"]) == (None, None)
+
+
+class FakeContextCache:
+    def __init__(self):
+        self.payloads = []
+
+    async def get_cache_name_async(self, client, instructions, resume_payload):
+        self.payloads.append(resume_payload)
+        return "cachedContents/resume"
+
+
+def test_context_cache_serves_the_full_resume_unless_prerank_is_turned_on():
+    tailor = make_tailor()
+    tailor.context_cache = FakeContextCache()
+    asyncio.run(tailor._get_tailored_work_exp_async("Python backend role"))
+    # By default the whole resume lives in the server side cache and only the posting is sent
+    assert tailor.most_recent_shortlist is None
+    assert tailor.context_cache.payloads == [tailor._extract_exp_payload()]
+    assert tailor.llm_client.calls[0]["config"].cached_content == "cachedContents/resume"
+    assert "Built REST APIs" not in tailor.llm_client.calls[0]["contents"]
+
+    tailor = make_tailor(prerank_bullets=1, prerank_min_per_role=1)
+    tailor.context_cache = FakeContextCache()
+    asyncio.run(tailor._get_tailored_work_exp_async("Python backend role", num_bullets=1))
+    # A shortlist is different for every posting, so it is sent inline
+    assert tailor.most_recent_shortlist is not None
+    assert tailor.context_cache.payloads == []
+    assert tailor.llm_client.calls[0]["config"] is None
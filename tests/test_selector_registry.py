@@ -0,0 +1,31 @@
+import json
+from pathlib import Path
+import pytest
+from jobber.selector_registry import SelectorRegistry
+
+
+@pytest.fixture
+def registry():
+    config_path = Path(__file__).resolve().parent.parent / "configs" / "job_app_selectors.json"
+    return SelectorRegistry(json.loads(config_path.read_text()))
+
+
+def test_resolve_uses_hostname_suffix(registry):
+    assert registry.resolve("https://mjhlifesciences.wd1.myworkdayjobs.com/Careers/job/123") == "myworkdayjobs.com"
+    assert registry.resolve("https://job-boards.greenhouse.io/addepar1/jobs/7927017002") == "greenhouse.io"
+    assert registry.resolve("https://www.linkedin.com/jobs/view/1") == "linkedin.com"
+
+
+def test_resolve_ignores_domains_outside_the_hostname(registry):
+    assert registry.resolve("https://careers.example.com/job?redirect=adp.com") == "default"
+    assert registry.resolve("https://notadp.com/job") == "default"
+
+
+def test_empty_and_invalid_selectors_are_dropped(registry):
+    linkedin = registry.get("linkedin.com")
+    assert linkedin["needs_js"] is True
+    assert "" not in linkedin["job_title"]
+    assert "div.[aria-label='Job description']" not in registry.get("nyc.gov")["job_desc"]
+    # oraclecloud.com only has empty selectors so it falls back to the default ones
+    assert registry.get("oraclecloud.com")["job_desc"] == registry.get("default")["job_desc"]
+    assert len(registry.get_compiled("greenhouse.io")["job_title"]) == 2
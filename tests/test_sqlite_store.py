@@ -0,0 +1,18 @@
+import pytest
+from jobber.sqlite_store import connect
+
+
+def test_wal_persists_and_failed_blocks_roll_back(tmp_path):
+    db_path = tmp_path / "store.sqlite3"
+    with connect(db_path, wal=True) as conn:
+        conn.execute("CREATE TABLE items (name TEXT)")
+    with pytest.raises(RuntimeError):
+        with connect(db_path) as conn:
+            conn.execute("INSERT INTO items VALUES ('lost')")
+            raise RuntimeError("boom")
+    with connect(db_path) as conn:
+        conn.execute("INSERT INTO items VALUES ('kept')")
+
+    with connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("SELECT name FROM items").fetchall() == [("kept",)]
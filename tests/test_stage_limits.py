@@ -0,0 +1,23 @@
+import asyncio
+import pytest
+from jobber.stage_limits import StageLimits
+
+
+def test_limits_cap_concurrent_stages_and_none_is_unbounded():
+    limits = StageLimits(max_renders=1)
+    in_flight, peak = {"render": 0, "llm": 0}, {"render": 0, "llm": 0}
+
+    async def stage(name, limiter):
+        async with limiter:
+            in_flight[name] += 1
+            peak[name] = max(peak[name], in_flight[name])
+            await asyncio.sleep(0.01)
+            in_flight[name] -= 1
+
+    async def run():
+        await asyncio.gather(*[stage("render", limits.render) for _ in range(3)], *[stage("llm", limits.llm) for _ in range(3)])
+
+    asyncio.run(run())
+    assert peak == {"render": 1, "llm": 3}
+    with pytest.raises(ValueError):
+        StageLimits(max_scrapes=0)
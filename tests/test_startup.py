@@ -0,0 +1,22 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "src" / "jobber"
+
+
+def modules_loaded_by(module: str, candidates: list[str]) -> list[str]:
+    code = f"import sys, json; import {module}; print(json.dumps([m for m in {candidates!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=SOURCE_DIR, check=True)
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize("module", ["jobber_cli", "daemon_client"])
+def test_thin_clients_skip_heavy_dependencies(module):
+    assert modules_loaded_by(module, ["google.genai", "playwright", "httpx", "bs4", "aiofiles"]) == []
+
+
+def test_tailor_loads_llm_and_browser_dependencies_on_first_use():
+    assert modules_loaded_by("resume_tailor", ["google.genai", "playwright", "httpx", "bs4"]) == []
@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+import pytest
+from jobber.selector_registry import SelectorRegistry
+from jobber.static_fetcher import StaticPostingFetcher
+
+ROOT = Path(__file__).resolve().parent.parent
+POSTINGS_DIR = ROOT / "benchmarks" / "fixtures" / "postings"
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return SelectorRegistry(json.loads((ROOT / "configs" / "job_app_selectors.json").read_text()))
+
+
+def extract(registry, domain_key):
+    html = (POSTINGS_DIR / f"{domain_key}.html").read_text(encoding="utf-8")
+    return StaticPostingFetcher().extract_fields(html, registry.get_compiled(domain_key))
+
+
+def test_extracts_every_field_from_server_rendered_postings(registry):
+    job_data = extract(registry, "greenhouse.io")
+
+    assert job_data["job_title"] == "Backend Engineer, Payments Platform"
+    assert job_data["job_loc"] == "New York, NY"
+    assert job_data["job_desc"].startswith("About the Role We are hiring a Backend Engineer")
+    assert "\n" not in job_data["job_desc"]
+
+
+@pytest.mark.parametrize("domain_key", ["adp.com", "greenhouse.io", "jobvite.com", "nyc.gov"])
+def test_static_domains_match_all_configured_fields(registry, domain_key):
+    job_data = extract(registry, domain_key)
+    assert [field for field, text in job_data.items() if text == "n-a"] == []
+
+
+def test_first_selector_with_text_wins_and_missing_fields_are_na(registry):
+    compiled = registry.get_compiled("greenhouse.io")
+    html = (
+        "<div class='section-header section-header--large font-primary'> </div>"
+        "<h1 class='section-header section-header--large font-primary'>Fallback title</h1>"
+        "<div class='job__description'>Build APIs</div>"
+    )
+    assert StaticPostingFetcher().extract_fields(html, compiled) == {
+        "job_title": "Fallback title", "job_loc": "n-a", "job_desc": "Build APIs",
+    }
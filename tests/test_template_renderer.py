@@ -0,0 +1,61 @@
+import pytest
+from bs4 import BeautifulSoup
+from jobber.template_renderer import CompiledTemplate
+
+TEMPLATE = """<html><body>
+<section id="work-experience"><h3>Experience</h3></section>
+<section id="technical_skills"><h3>Technical Skills</h3></section>
+</body></html>"""
+
+
+def make_resume(bullet="Built things"):
+    return {"data": {
+        "work_experience": {"experience_1": {
+            "title": "Engineer", "company": "Acme & Co", "start": "2020", "end": "2022",
+            "location": "Remote", "responsibilities": [bullet],
+        }},
+        "skills": {"coding_languages": ["Python", "C++"], "softwares": [], "soft_skills": ["Talking"]},
+    }}
+
+
+def test_render_fills_slots_and_escapes_text():
+    template = CompiledTemplate.compile(BeautifulSoup(TEMPLATE, "html.parser"))
+    soup = BeautifulSoup(template.render_resume(make_resume("Used <script> tags")), "html.parser")
+
+    exp = soup.find(id="work-experience")
+    assert exp.h3.string == "Experience"
+    assert exp.select_one("td.company").string == "Acme & Co"
+    assert exp.select_one("td.date").string == "2020 - 2022"
+    assert [li.string for li in exp.select("ul.exp-bullets li")] == ["Used <script> tags"]
+
+    rows = [[td.string for td in tr.find_all("td")] for tr in soup.find(id="technical_skills").find_all("tr")]
+    assert rows == [["Coding Languages:", "Python, C++"], ["Softwares:", "None"]]
+
+
+def test_repeated_renders_do_not_accumulate():
+    parsed = BeautifulSoup(TEMPLATE, "html.parser")
+    template = CompiledTemplate.compile(parsed)
+    first = template.render_resume(make_resume("first"))
+    second = template.render_resume(make_resume("second"))
+
+    assert second == first.replace("first", "second")
+    assert second.count('class="experience"') == 1
+    assert str(parsed) == str(BeautifulSoup(TEMPLATE, "html.parser"))  # the parsed template is left untouched
+
+
+def test_missing_section_fails_at_compile_time():
+    with pytest.raises(ValueError):
+        CompiledTemplate.compile(BeautifulSoup("<html><body></body></html>", "html.parser"))
+
+
+def test_local_assets_are_inlined(tmp_path):
+    (tmp_path / "style.css").write_text("body { color: red; }")
+    (tmp_path / "logo.png").write_bytes(b"png")
+    html = TEMPLATE.replace("<body>", '<head><link rel="stylesheet" href="style.css">'
+                            '<link rel="stylesheet" href="https://example.com/remote.css"></head><body><img src="logo.png">')
+    template = CompiledTemplate.compile(BeautifulSoup(html, "html.parser"), asset_dir=tmp_path)
+    soup = BeautifulSoup(template.render_resume(make_resume()), "html.parser")
+
+    assert soup.style.string == "body { color: red; }"
+    assert soup.link["href"] == "https://example.com/remote.css"
+    assert soup.img["src"] == "data:image/png;base64,cG5n"
@@ -0,0 +1,52 @@
+import asyncio
+import json
+import pytest
+from jobber.tracing import Tracer, JsonLinesSink
+
+
+def test_spans_nest_across_awaits_and_go_to_sink(tmp_path):
+    tracer = Tracer()
+    tracer.add_sink(JsonLinesSink(tmp_path / "spans.jsonl"))
+
+    @tracer.traced("llm_call", model="m")
+    async def call():
+        await asyncio.sleep(0)
+        return "ok"
+
+    async def scrape():
+        with tracer.span("scrape", domain="adp.com") as span:
+            assert await call() == "ok"
+            span.tag(cache_hit=False)
+
+    asyncio.run(scrape())
+    tracer.close()
+
+    records = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+    child, parent = records
+    assert (child["name"], child["tags"]) == ("llm_call", {"model": "m"})
+    assert (parent["name"], parent["tags"]) == ("scrape", {"domain": "adp.com", "cache_hit": False})
+    assert child["parent_id"] == parent["id"] and parent["parent_id"] is None
+
+
+def test_errors_are_recorded_and_reraised():
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.span("render"):
+            raise ValueError("bad template")
+    assert tracer.summary()["render"]["count"] == 1
+
+
+def test_summary_percentiles():
+    tracer = Tracer()
+    for i in range(1, 101):
+        tracer.record_duration("pdf", i / 1000)  # 1ms..100ms
+    assert tracer.summary()["pdf"] == {"count": 100, "p50_ms": 50.0, "p95_ms": 95.0, "max_ms": 100.0}
+    assert "pdf" in tracer.format_summary()
+
+
+def test_summary_only_keeps_the_latest_window():
+    tracer = Tracer(window=10)
+    for i in range(1, 101):
+        tracer.record_duration("pdf", i / 1000)
+    assert len(tracer.durations["pdf"]) == 10
+    assert tracer.summary()["pdf"] == {"count": 100, "p50_ms": 95.0, "p95_ms": 100.0, "max_ms": 100.0}